@@ -0,0 +1,928 @@
+"""Native Structurizr DSL emitter.
+
+Builds an in-memory DSL tree straight from a SystemLandscape, applies the exporter's
+normalizations (variable naming, element tags, styles, name filters, include fixups)
+as transforms on that tree, and writes the document once.
+
+The output mirrors what the former pystructurizr dump + string post-processing chain
+produced, without re-splitting and re-scanning the whole document for every step.
+"""
+
+from __future__ import annotations
+
+import keyword
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Type, TypeVar
+
+from architecture_diagrams.c4 import ElementBase, SystemLandscape
+from architecture_diagrams.c4.slugs import sort_slug
+from architecture_diagrams.c4.system_landscape import normalize_name
+from architecture_diagrams.c4.views import (
+    ComponentView,
+    ContainerView,
+    SystemContextView,
+    SystemLandscapeView,
+)
+
+# Tags Structurizr assigns by element type; never emitted as custom tags
+_BUILTIN_TAGS = ("Element", "Person", "Software System", "Container", "Component")
+
+# Default element styles (tag, attributes) emitted first, in this order
+_DEFAULT_ELEMENT_STYLES: list[tuple[str, dict[str, str]]] = [
+    ("Element", {"shape": "RoundedBox"}),
+    ("Software System", {"background": "#1168bd", "color": "#ffffff"}),
+    ("Container", {"background": "#438dd5", "color": "#ffffff"}),
+    ("Component", {"background": "#85bbf0", "color": "#000000"}),
+    ("Person", {"background": "#08427b", "color": "#ffffff", "shape": "Person"}),
+    ("Infrastructure Node", {"background": "#ffffff"}),
+    ("database", {"shape": "Cylinder"}),
+]
+
+# Styles every workspace should carry; added when not already present by tag
+_BASELINE_REQUIRED_STYLES: list[tuple[str, dict[str, str]]] = [
+    ("Container", {"shape": "RoundedBox", "description": "true"}),
+    ("Person", {"shape": "Person"}),
+    ("external", {"background": "#808080"}),
+    ("storage", {"shape": "Cylinder"}),
+    ("library", {"shape": "Folder"}),
+    # Overlay/delta emphasis
+    ("proposed", {"background": "#e0f7fa", "color": "#004d40"}),
+    ("deprecated", {"background": "#ffebee", "color": "#b71c1c"}),
+]
+
+_SUFFIX_RE = re.compile(r"^(.*)_([0-9]+)$")
+
+
+# --- DSL tree ---
+@dataclass(eq=False)
+class DslElement:
+    kind: str  # Person | SoftwareSystem | Container | Component
+    var: str
+    name: str
+    description: str = ""
+    technology: str = ""
+    tags: List[str] = field(default_factory=list)
+    source: Optional[object] = field(default=None, repr=False)  # originating model element
+    parent: Optional["DslElement"] = field(default=None, repr=False)
+    children: List["DslElement"] = field(default_factory=list, repr=False)
+    relationships: List["DslRelationship"] = field(default_factory=list, repr=False)
+
+
+@dataclass(eq=False)
+class DslRelationship:
+    source: DslElement
+    destination: DslElement
+    description: str = ""
+    technology: str = ""
+
+
+@dataclass(eq=False)
+class DslView:
+    kind: str  # systemLandscape | systemContext | container | component
+    view: object = field(repr=False)
+    subject: Optional[DslElement] = None
+    description: str = ""
+    wildcard: bool = True
+    includes: List[DslElement] = field(default_factory=list)
+    # Lines injected by name-based filters (exclude x / include a->b); None when unfiltered
+    filter_lines: Optional[List[str]] = None
+
+
+@dataclass(eq=False)
+class DslStyle:
+    scope: str  # element | relationship
+    tag: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(eq=False)
+class DslWorkspace:
+    name: str
+    elements: List[DslElement] = field(default_factory=list)
+    views: List[DslView] = field(default_factory=list)
+    styles: List[DslStyle] = field(default_factory=list)
+    name_comment: bool = False
+
+    def iter_declarations(self) -> Iterator[DslElement]:
+        """Yield declared elements in document order (parents before children)."""
+        stack = list(reversed(self.elements))
+        while stack:
+            el = stack.pop()
+            yield el
+            stack.extend(reversed(el.children))
+
+
+class _Identifiers:
+    """Variable name allocator matching pystructurizr's identifier scheme.
+
+    Counters are per export, so the same model always yields the same names
+    regardless of what else ran in the process.
+    """
+
+    def __init__(self) -> None:
+        self.counter: Dict[str, int] = {}
+
+    def make(self, name: str) -> str:
+        ident = re.sub("[^0-9a-zA-Z_]", "_", (name or "").lower()).lstrip("_") or "_"
+        if ident[0].isdigit():
+            ident = "_" + ident
+        if keyword.iskeyword(ident):
+            ident = "_" + ident
+        if ident in self.counter:
+            self.counter[ident] += 1
+            return f"{ident}_{self.counter[ident]}"
+        self.counter[ident] = 1
+        return ident
+
+
+class DeclarationIndex:
+    """Declaration lookups shared by every export transform.
+
+    Built once per export from the tree and the ``element_mapping`` (model id -> DSL element)
+    produced while constructing it; nothing is re-parsed from text. Variable names are read
+    from the elements themselves, so renames by earlier transforms are always reflected.
+    """
+
+    _PREFERRED_KINDS = ("SoftwareSystem", "Container", "Component", "Person")
+
+    def __init__(self, ws: DslWorkspace, element_mapping: Dict[str, object]) -> None:
+        self.element_mapping = element_mapping
+        self.declarations: List[DslElement] = []
+        self.parent_system: Dict[int, Optional[DslElement]] = {}
+        self.parent_container: Dict[int, Optional[DslElement]] = {}
+        self._by_name: Dict[Optional[str], List[DslElement]] = {}
+        self._by_system_and_name: Dict[tuple[Optional[str], Optional[str]], DslElement] = {}
+        for el in ws.iter_declarations():
+            self.declarations.append(el)
+            ps = _parent_of_kind(el, "SoftwareSystem")
+            self.parent_system[id(el)] = ps
+            self.parent_container[id(el)] = _parent_of_kind(el, "Container")
+            n = normalize_name(el.name)
+            self._by_name.setdefault(n, []).append(el)
+            if ps is not None:
+                # First declaration wins for System/Name lookups
+                self._by_system_and_name.setdefault((normalize_name(ps.name), n), el)
+
+    def element_for(self, element_id: str) -> Optional[DslElement]:
+        el = self.element_mapping.get(element_id)
+        return el if isinstance(el, DslElement) else None
+
+    def resolve_name(self, name: Optional[str]) -> Optional[str]:
+        """Map a display name ('Name' or 'System/Name') to a variable.
+
+        Empty names resolve to the wildcard '*'; unknown names to None. Single names prefer
+        SoftwareSystem, then Container, Component and Person, ties broken by variable name.
+        """
+        if not name:
+            return "*"
+        if "/" in name:
+            sys_name, inner_name = name.split("/", 1)
+            found = self._by_system_and_name.get(
+                (normalize_name(sys_name), normalize_name(inner_name))
+            )
+            return found.var if found is not None else None
+        candidates = self._by_name.get(normalize_name(name))
+        if not candidates:
+            return None
+        return min(candidates, key=lambda el: (self._PREFERRED_KINDS.index(el.kind), el.var)).var
+
+
+# --- Public API ---
+def emit_dsl(model: SystemLandscape) -> str:
+    """Render a SystemLandscape to normalized Structurizr DSL."""
+    ws = build_dsl_tree(model)
+    return "\n".join(_iter_lines(ws))
+
+
+def write_dsl(model: SystemLandscape, fp: TextIO) -> None:
+    """Write ``emit_dsl(model)`` to a text stream line by line, without building the string."""
+    _write_lines(_iter_lines(build_dsl_tree(model)), fp)
+
+
+def build_dsl_tree(model: SystemLandscape, *, views: bool = True) -> DslWorkspace:
+    """Build the DSL tree for a model and apply all normalization transforms.
+
+    With views=False the tree holds no views (``model.views`` is ignored); the element
+    and relationship part of the document is the same either way.
+    """
+    ws, element_mapping, _ = _build_tree(model, views=views)
+    index = DeclarationIndex(ws, element_mapping)
+    _canonicalize_variable_suffixes(index)
+    _apply_element_tags(index)
+    _apply_styles(ws, model)
+    ws.name_comment = not _mentions(ws, model.name)
+    _apply_name_filters(ws, index)
+    _fix_view_includes(ws, index)
+    return ws
+
+
+@dataclass
+class ViewFragment:
+    """The rendered lines of one view, independent of the model's other views."""
+
+    lines: List[str]
+    smart: bool = False  # smart landscape views follow every standard view
+    mentions_name: bool = False  # unannotated lines contain the workspace name
+
+
+def render_view_fragments(model: SystemLandscape) -> List[ViewFragment]:
+    """Render each of ``model.views`` on its own, in ``model.views`` order.
+
+    Views the emitter skips (e.g. an unresolvable subject) yield no fragment. Views never
+    consume identifiers, so fragments rendered from separate copies of the same model
+    (each with its own subset of views) can be merged with ``emit_dsl_fragments``.
+    """
+    ws = build_dsl_tree(model)
+    order = {id(v): i for i, v in enumerate(model.views)}
+    fragments = []
+    for dview in sorted(ws.views, key=lambda d: order[id(d.view)]):
+        fragments.append(
+            ViewFragment(
+                lines=list(_view_lines(dview, True)),
+                smart=isinstance(dview.view, SystemLandscapeView)
+                and bool(getattr(dview.view, "include_all", False)),
+                mentions_name=any(model.name in line for line in _view_lines(dview, False)),
+            )
+        )
+    return fragments
+
+
+def emit_dsl_fragments(model: SystemLandscape, fragments: Sequence[ViewFragment]) -> str:
+    """Render a model around pre-rendered views; ``model.views`` is ignored.
+
+    ``fragments`` are in view declaration order (as from ``render_view_fragments``); the
+    result equals ``emit_dsl`` of the model holding those views.
+    """
+    ws = build_dsl_tree(model, views=False)
+    ws.name_comment = ws.name_comment and not any(f.mentions_name for f in fragments)
+    # Same order as _add_views: standard views first, then smart landscape views
+    ordered = [f for f in fragments if not f.smart] + [f for f in fragments if f.smart]
+    return "\n".join(_iter_lines(ws, view_lines=[line for f in ordered for line in f.lines]))
+
+
+# --- Tree construction ---
+def _build_tree(
+    model: SystemLandscape, views: bool = True
+) -> tuple[DslWorkspace, Dict[str, object], Dict[str, object]]:
+    ws = DslWorkspace(name=model.name)
+    idents = _Identifiers()
+    # The workspace model consumes an identifier for its own name (pystructurizr parity)
+    idents.make(model.name)
+
+    element_mapping: Dict[str, object] = {}
+    id_to_model: Dict[str, object] = {}
+    # De-duplication registries by display name (and hierarchy for nested types)
+    seen_persons: Dict[str, DslElement] = {}
+    seen_systems: Dict[str, DslElement] = {}
+    seen_containers: Dict[tuple[str, str], DslElement] = {}
+    seen_components: Dict[tuple[str, str, str], DslElement] = {}
+
+    for person in model.people.values():
+        p = seen_persons.get(person.name)
+        if p is None:
+            p = DslElement(
+                "Person",
+                idents.make(person.name),
+                person.name,
+                person.description or "",
+                source=person,
+            )
+            seen_persons[person.name] = p
+            ws.elements.append(p)
+        element_mapping[person.id] = p
+        id_to_model[person.id] = person
+
+    for system in model.software_systems.values():
+        ss = seen_systems.get(system.name)
+        if ss is None:
+            ss = DslElement(
+                "SoftwareSystem",
+                idents.make(system.name),
+                system.name,
+                system.description or "",
+                source=system,
+            )
+            seen_systems[system.name] = ss
+            ws.elements.append(ss)
+        element_mapping[system.id] = ss
+        id_to_model[system.id] = system
+        for container in system.containers:
+            c_key = (system.name, container.name)
+            dc = seen_containers.get(c_key)
+            if dc is None:
+                dc = DslElement(
+                    "Container",
+                    idents.make(container.name),
+                    container.name,
+                    container.description or "",
+                    container.technology or "",
+                    source=container,
+                    parent=ss,
+                )
+                seen_containers[c_key] = dc
+                ss.children.append(dc)
+            element_mapping[container.id] = dc
+            id_to_model[container.id] = container
+            for component in container.components:
+                comp_key = (system.name, container.name, component.name)
+                comp = seen_components.get(comp_key)
+                if comp is None:
+                    comp = DslElement(
+                        "Component",
+                        idents.make(component.name),
+                        component.name,
+                        component.description or "",
+                        component.technology or "",
+                        source=component,
+                        parent=dc,
+                    )
+                    seen_components[comp_key] = comp
+                    dc.children.append(comp)
+                element_mapping[component.id] = comp
+                id_to_model[component.id] = component
+
+    _add_relationships(model, element_mapping, id_to_model)
+    if views:
+        _add_views(ws, model, element_mapping, id_to_model)
+    return ws, element_mapping, id_to_model
+
+
+_Enclosing = TypeVar("_Enclosing", bound=ElementBase)
+
+
+def _enclosing(obj: object, cls: Type[_Enclosing]) -> Optional[_Enclosing]:
+    """Nearest ancestor of ``obj`` (following ``parent``, excluding ``obj``) that is a ``cls``."""
+    cur = getattr(obj, "parent", None)
+    while cur is not None:
+        if isinstance(cur, cls):
+            return cur
+        cur = getattr(cur, "parent", None)
+    return None
+
+
+def _add_relationships(
+    model: SystemLandscape, element_mapping: Dict[str, object], id_to_model: Dict[str, object]
+) -> None:
+    from architecture_diagrams.c4 import SoftwareSystem as MSystem
+
+    # Relationships (respect any relationship restrictions) plus aggregated system-level
+    # edges so system landscape views show cross-system connectivity.
+    sys_level_edges: set[tuple[int, int]] = set()
+    for rel in model.get_effective_relationships():
+        src = element_mapping.get(rel.source.id)
+        dst = element_mapping.get(rel.destination.id)
+        if isinstance(src, DslElement) and isinstance(dst, DslElement):
+            src.relationships.append(
+                DslRelationship(src, dst, rel.description or "", rel.technology or "")
+            )
+        src_model = id_to_model.get(rel.source.id)
+        dst_model = id_to_model.get(rel.destination.id)
+        ps = _enclosing(src_model, MSystem)
+        pd = _enclosing(dst_model, MSystem)
+        if ps is None or pd is None or ps.id == pd.id:
+            continue
+        d_src_sys = element_mapping.get(ps.id)
+        d_dst_sys = element_mapping.get(pd.id)
+        if not isinstance(d_src_sys, DslElement) or not isinstance(d_dst_sys, DslElement):
+            continue
+        key = (id(d_src_sys), id(d_dst_sys))
+        if key not in sys_level_edges:
+            d_src_sys.relationships.append(DslRelationship(d_src_sys, d_dst_sys))
+            sys_level_edges.add(key)
+
+
+def _add_views(
+    ws: DslWorkspace,
+    model: SystemLandscape,
+    element_mapping: Dict[str, object],
+    id_to_model: Dict[str, object],
+) -> None:
+    # Standard (non-smart) views first, preserving declaration order
+    for view in model.views:
+        subj: Optional[DslElement] = None
+        if isinstance(view, SystemLandscapeView) and not getattr(view, "include_all", False):
+            kind = "systemLandscape"
+        elif isinstance(view, SystemContextView):
+            kind = "systemContext"
+        elif isinstance(view, ContainerView):
+            kind = "container"
+        elif isinstance(view, ComponentView):
+            kind = "component"
+        else:
+            continue
+        if kind != "systemLandscape":
+            # Resolve the subject (map container/component to the expected parent type)
+            resolved = resolve_view_subject(view, id_to_model, element_mapping)
+            if not isinstance(resolved, DslElement):
+                continue
+            subj = resolved
+        dview = DslView(kind, view, subject=subj, description=view.description or view.name)
+        for element in normalized_include_elements(view, id_to_model, element_mapping):
+            if isinstance(element, DslElement):
+                dview.includes.append(element)
+        ws.views.append(dview)
+
+    # Smart system landscape views: include * unless explicit elements were selected
+    for view in model.views:
+        if not (isinstance(view, SystemLandscapeView) and getattr(view, "include_all", False)):
+            continue
+        elements_for_view = [
+            el
+            for el in (element_mapping.get(eid) for eid in sorted(view.include))
+            if isinstance(el, DslElement)
+        ]
+        # Deterministic ordering: slug sort
+        elements_for_view.sort(key=lambda el: sort_slug(el.name))
+        ws.views.append(
+            DslView(
+                "systemLandscape",
+                view,
+                description=view.description or view.name,
+                wildcard=not elements_for_view,
+                includes=elements_for_view,
+            )
+        )
+
+
+def normalized_include_elements(
+    view: object, id_to_model: Dict[str, object], element_mapping: Dict[str, object]
+) -> Iterable[object]:
+    """Yield DSL elements to include, normalizing per view type rules.
+
+    - SystemContextView: allow Person and SoftwareSystem; map Container/Component to parent SoftwareSystem.
+    - ContainerView: allow Person, SoftwareSystem, and Containers within the subject software system; map external Container/Component to parent SoftwareSystem.
+    - ComponentView: allow Person, SoftwareSystem, Containers (external), and Components within the subject container; map external Component to its parent Container.
+    """
+    from architecture_diagrams.c4 import (
+        Component as MComponent,
+        ComponentView as MComponentView,
+        Container as MContainer,
+        ContainerView as MContainerView,
+        Person as MPerson,
+        SoftwareSystem as MSystem,
+        SystemContextView as MSystemContextView,
+    )
+
+    include_ids = sorted(getattr(view, "include", set()))
+
+    if isinstance(view, MSystemContextView):
+        for eid in include_ids:
+            m = id_to_model.get(eid)
+            if m is None:
+                continue
+            if isinstance(m, (MPerson, MSystem)):
+                el = element_mapping.get(eid)
+                if el is not None:
+                    yield el
+            elif isinstance(m, (MContainer, MComponent)):
+                ps = _enclosing(m, MSystem)
+                if ps is not None:
+                    el = element_mapping.get(ps.id)
+                    if el is not None:
+                        yield el
+        return
+
+    if isinstance(view, MContainerView):
+        subject_system = getattr(view, "software_system", None)
+        subj_id = getattr(subject_system, "id", None)
+        for eid in include_ids:
+            m = id_to_model.get(eid)
+            if m is None:
+                continue
+            if isinstance(m, MPerson):
+                el = element_mapping.get(eid)
+                if el is not None:
+                    yield el
+            elif isinstance(m, MSystem):
+                el = element_mapping.get(eid)
+                if el is not None:
+                    yield el
+            elif isinstance(m, MContainer):
+                # Only include containers within the subject system; otherwise include the parent system
+                ps = _enclosing(m, MSystem)
+                if ps is not None and ps.id == subj_id:
+                    el = element_mapping.get(eid)
+                    if el is not None:
+                        yield el
+                else:
+                    if ps is not None:
+                        el = element_mapping.get(ps.id)
+                        if el is not None:
+                            yield el
+            elif isinstance(m, MComponent):
+                # Components are not directly included in container view; include parent system instead
+                ps = _enclosing(m, MSystem)
+                if ps is not None:
+                    el = element_mapping.get(ps.id)
+                    if el is not None:
+                        yield el
+        return
+
+    if isinstance(view, MComponentView):
+        subject_container = getattr(view, "container", None)
+        subj_id = getattr(subject_container, "id", None)
+        for eid in include_ids:
+            m = id_to_model.get(eid)
+            if m is None:
+                continue
+            if isinstance(m, (MPerson, MSystem)):
+                el = element_mapping.get(eid)
+                if el is not None:
+                    yield el
+            elif isinstance(m, MContainer):
+                # External containers allowed
+                el = element_mapping.get(eid)
+                if el is not None:
+                    yield el
+            elif isinstance(m, MComponent):
+                # Only include components within the subject container
+                pc = _enclosing(m, MContainer)
+                if pc is not None and pc.id == subj_id:
+                    el = element_mapping.get(eid)
+                    if el is not None:
+                        yield el
+        return
+
+    # Default: yield as-is
+    for eid in include_ids:
+        el = element_mapping.get(eid)
+        if el is not None:
+            yield el
+
+
+def resolve_view_subject(
+    view: object, id_to_model: Dict[str, object], element_mapping: Dict[str, object]
+) -> Optional[object]:
+    """Return the correct subject element for the view header.
+
+    - SystemContextView expects a SoftwareSystem
+    - ContainerView expects a SoftwareSystem (subject system)
+    - ComponentView expects a Container
+    """
+    from architecture_diagrams.c4 import (
+        Component as MComponent,
+        ComponentView as MComponentView,
+        Container as MContainer,
+        ContainerView as MContainerView,
+        SoftwareSystem as MSystem,
+        SystemContextView as MSystemContextView,
+    )
+
+    if isinstance(view, (MSystemContextView, MContainerView)):
+        subj = getattr(view, "software_system", None)
+        if subj is None:
+            return None
+        m = id_to_model.get(getattr(subj, "id", ""))
+        if m is None:
+            return None
+        if isinstance(m, MSystem):
+            return element_mapping.get(getattr(subj, "id", ""))
+        if isinstance(m, (MContainer, MComponent)):
+            ps = _enclosing(m, MSystem)
+            if ps is None:
+                return None
+            return element_mapping.get(ps.id)
+        return None
+
+    if isinstance(view, MComponentView):
+        subj = getattr(view, "container", None)
+        if subj is None:
+            return None
+        m = id_to_model.get(getattr(subj, "id", ""))
+        if m is None:
+            return None
+        if isinstance(m, MContainer):
+            return element_mapping.get(getattr(subj, "id", ""))
+        if isinstance(m, MComponent):
+            pc = _enclosing(m, MContainer)
+            if pc is None:
+                return None
+            return element_mapping.get(pc.id)
+        return None
+
+    return None
+
+
+# --- Transforms ---
+def _canonicalize_variable_suffixes(index: DeclarationIndex) -> None:
+    """Rename variables like foo_2 -> foo when safe to do so.
+
+    Safety rules:
+    - Only consider renaming when there is exactly ONE declaration sharing the same base name.
+      If multiple declarations share a base (e.g., smart_auth_3 and smart_auth_4), skip that base.
+    - Never override an existing declared base name.
+    References follow automatically since relationships and views point at tree nodes.
+    """
+    declared: set[str] = set()
+    base_groups: dict[str, list[DslElement]] = {}
+    for el in index.declarations:
+        declared.add(el.var)
+        base_m = _SUFFIX_RE.match(el.var)
+        base = base_m.group(1) if base_m else el.var
+        base_groups.setdefault(base, []).append(el)
+    for base, elements in base_groups.items():
+        if base in declared:
+            continue
+        if len(elements) == 1 and _SUFFIX_RE.match(elements[0].var):
+            elements[0].var = base
+
+
+def _apply_element_tags(index: DeclarationIndex) -> None:
+    """Attach custom model tags to declarations so styles take effect."""
+    for el in index.declarations:
+        raw = getattr(el.source, "tags", None)
+        if not raw:
+            continue
+        tags = {raw} if isinstance(raw, str) else set(raw)
+        el.tags = sorted(t for t in tags if t not in _BUILTIN_TAGS)
+
+
+def _apply_styles(ws: DslWorkspace, model: SystemLandscape) -> None:
+    """Default element styles, baseline-required entries, then model-configured styles."""
+    ws.styles = [DslStyle("element", tag, dict(attrs)) for tag, attrs in _DEFAULT_ELEMENT_STYLES]
+    present = {s.tag for s in ws.styles}
+    attrs: dict[str, str]
+    for tag, attrs in _BASELINE_REQUIRED_STYLES:
+        if tag not in present:
+            ws.styles.append(DslStyle("element", tag, dict(attrs)))
+            present.add(tag)
+    for es in model.styles.element_styles:
+        attrs = {}
+        if es.background:
+            attrs["background"] = es.background
+        if es.color:
+            attrs["color"] = es.color
+        if es.shape:
+            attrs["shape"] = es.shape
+        if getattr(es, "opacity", None) is not None:
+            attrs["opacity"] = str(es.opacity)
+        ws.styles.append(DslStyle("element", es.tag, attrs))
+    for rs in model.styles.relationship_styles:
+        attrs = {}
+        if rs.color:
+            attrs["color"] = rs.color
+        if getattr(rs, "dashed", None) is not None:
+            attrs["dashed"] = str(rs.dashed).lower()
+        if getattr(rs, "thickness", None) is not None:
+            attrs["thickness"] = str(rs.thickness)
+        ws.styles.append(DslStyle("relationship", rs.tag, attrs))
+
+
+class NameFilterPlan:
+    """Name-based view filters compiled once per export.
+
+    Each display name used by any view's relationship filters or element excludes is
+    resolved to a variable once, and each distinct filter (by value) is compiled to its
+    lines once, so emitting a view's filter block costs only that view's output.
+    """
+
+    def __init__(self, index: DeclarationIndex) -> None:
+        self._index = index
+        self._vars: Dict[Optional[str], Optional[str]] = {}
+        self._filters: Dict[tuple[object, ...], List[str]] = {}
+
+    def var(self, name: Optional[str]) -> Optional[str]:
+        try:
+            return self._vars[name]
+        except KeyError:
+            var = self._vars[name] = self._index.resolve_name(name)
+            return var
+
+    def exclude_lines(self, names: Iterable[str]) -> List[str]:
+        lines = []
+        for nm in names:
+            v = self.var(nm)
+            if v and v != "*":
+                lines.append(f"exclude {v}")
+        return lines
+
+    def filter_lines(self, nf: object) -> List[str]:
+        from_name = getattr(nf, "from_name", None)
+        to_name = getattr(nf, "to_name", None)
+        key = (type(nf), from_name, to_name, tuple(getattr(nf, "but_include_names", ())))
+        lines = self._filters.get(key)
+        if lines is None:
+            lines = self._filters[key] = self._compile(nf, from_name, to_name)
+        return lines
+
+    def _compile(self, nf: object, from_name: Optional[str], to_name: Optional[str]) -> List[str]:
+        from architecture_diagrams.orchestrator.specs import (
+            ExcludeRelByName,
+            IncludeRelByName,
+        )  # local import to avoid cycles during tooling
+
+        lines: List[str] = []
+        from_var = self.var(from_name)
+        to_var = self.var(to_name)
+        # Only emit if both sides resolvable (allow wildcard '*')
+        if isinstance(nf, IncludeRelByName):
+            if from_var is not None and to_var is not None:
+                lines.append(f"include {from_var}->{to_var}")
+        elif isinstance(nf, ExcludeRelByName):
+            if from_var is not None and to_var is not None:
+                lines.append(f"exclude {from_var}->{to_var}")
+            for bi in nf.but_include_names:
+                bi_var = self.var(bi)
+                if bi_var is None:
+                    continue
+                if from_name and from_var not in (None, "*"):
+                    lines.append(f"include {from_var}->{bi_var}")
+                elif to_var not in (None, "*"):
+                    lines.append(f"include {bi_var}->{to_var}")
+        return lines
+
+
+def _apply_name_filters(ws: DslWorkspace, index: DeclarationIndex) -> None:
+    """Compute NameRelationshipFilter and element-exclude lines for each view.
+
+    Views declaring any filters get their exclude/include lines emitted just before
+    autoLayout, preceded by a sentinel comment.
+    """
+    filtered = [
+        v
+        for v in ws.views
+        if getattr(v.view, "_name_relationship_filters", None)
+        or getattr(v.view, "_element_excludes_names", None)
+    ]
+    if not filtered:
+        return
+
+    plan = NameFilterPlan(index)
+    for dview in filtered:
+        # Element-level excludes (exclude <element>), then relationship name-based filters
+        lines = plan.exclude_lines(getattr(dview.view, "_element_excludes_names", None) or [])
+        for nf in getattr(dview.view, "_name_relationship_filters", None) or []:
+            lines.extend(plan.filter_lines(nf))
+        dview.filter_lines = lines
+
+
+def _fix_view_includes(ws: DslWorkspace, index: DeclarationIndex) -> None:
+    """Ensure only valid include targets per view type and drop duplicate includes.
+
+    Mapping rules:
+    - systemContext: if include is a Container/Component, map to its parent SoftwareSystem
+    - container: if include is a Container outside the subject, map to its parent SoftwareSystem;
+                 if include is a Component, map to its parent SoftwareSystem
+    - component: if include is a Component outside the subject, map to its parent Container
+    """
+    for dview in ws.views:
+        subj = dview.subject
+        subj_sys: Optional[DslElement] = None
+        if subj is not None:
+            subj_sys = subj if subj.kind == "SoftwareSystem" else index.parent_system[id(subj)]
+        seen: set[int] = set()
+        fixed: list[DslElement] = []
+        for el in dview.includes:
+            target = el
+            parent_sys = index.parent_system[id(el)]
+            parent_cont = index.parent_container[id(el)]
+            if dview.kind == "systemContext":
+                if el.kind in ("Container", "Component") and parent_sys is not None:
+                    target = parent_sys
+            elif dview.kind == "container":
+                if el.kind == "Component" and parent_sys is not None:
+                    target = parent_sys
+                elif el.kind == "Container":
+                    # Keep if same subject system, else map to parent system
+                    if (
+                        parent_sys is not None
+                        and subj_sys is not None
+                        and parent_sys is not subj_sys
+                    ):
+                        target = parent_sys
+            elif dview.kind == "component":
+                if el.kind == "Component" and parent_cont is not None and parent_cont is not subj:
+                    target = parent_cont
+            if id(target) in seen:
+                continue
+            seen.add(id(target))
+            fixed.append(target)
+        dview.includes = fixed
+
+
+def _mentions(ws: DslWorkspace, text: str) -> bool:
+    return any(text in line for line in _iter_lines(ws, annotate=False))
+
+
+def _parent_of_kind(el: DslElement, kind: str) -> Optional[DslElement]:
+    cur = el.parent
+    while cur is not None:
+        if cur.kind == kind:
+            return cur
+        cur = cur.parent
+    return None
+
+
+# --- Writer ---
+def _iter_lines(
+    ws: DslWorkspace, annotate: bool = True, view_lines: Optional[Iterable[str]] = None
+) -> Iterator[str]:
+    """Yield the DSL document line by line.
+
+    With annotate=False the name comment, view header comments and filter lines are
+    skipped; used to check whether the plain document already mentions a string.
+    ``view_lines`` replaces the rendering of ``ws.views`` (pre-rendered fragments).
+    """
+    yield "workspace {"
+    if annotate and ws.name_comment:
+        yield f"  // {ws.name}"
+    yield "  model {"
+    yield "    properties {"
+    yield '      "structurizr.groupSeparator" "/"'
+    yield "    }"
+    for el in ws.elements:
+        yield from _element_lines(el, "    ")
+    first_rel = True
+    for el in ws.elements:
+        for rel in _iter_relationships(el):
+            if first_rel:
+                # Blank separator between declarations and relationships
+                yield ""
+                first_rel = False
+            yield (
+                f'    {rel.source.var} -> {rel.destination.var} "{rel.description}" '
+                f'"{rel.technology}"'
+            )
+    yield "  }"
+    yield "  views {"
+    if view_lines is not None:
+        yield from view_lines
+    for dview in ws.views:
+        yield from _view_lines(dview, annotate)
+    yield "    styles {"
+    for style in ws.styles:
+        yield f'      {style.scope} "{style.tag}" {{'
+        for k, v in style.attributes.items():
+            yield f'        {k} "{v}"'
+        yield "      }"
+    yield "    }"
+    yield "  }"
+    yield "}"
+
+
+def _write_lines(lines: Iterator[str], fp: TextIO) -> None:
+    # Same bytes as "\n".join(lines): no newline after the last line
+    for line in lines:
+        fp.write(line)
+        break
+    for line in lines:
+        fp.write("\n")
+        fp.write(line)
+
+
+def _element_lines(el: DslElement, indent: str) -> Iterator[str]:
+    yield f'{indent}{el.var} = {el.kind} "{el.name}" "{el.description}" {{'
+    if el.technology:
+        yield f'{indent}  technology "{el.technology}"'
+    if el.tags:
+        yield f'{indent}  tags "{", ".join(el.tags)}"'
+    for child in el.children:
+        yield from _element_lines(child, indent + "  ")
+    yield f"{indent}}}"
+
+
+def _iter_relationships(el: DslElement) -> Iterator[DslRelationship]:
+    yield from el.relationships
+    for child in el.children:
+        yield from _iter_relationships(child)
+
+
+def _view_lines(dview: DslView, annotate: bool) -> Iterator[str]:
+    subject = dview.subject.var if dview.subject is not None else ""
+    yield f"    {dview.kind} {subject} {{"
+    if annotate:
+        # Structurizr DSL doesn't render view names by default; surface key/name/project
+        k = getattr(dview.view, "key", "")
+        nm = getattr(dview.view, "name", "")
+        proj = getattr(dview.view, "project", "")
+        meta = f'// View: key="{k}" name="{nm}"' + (f' project="{proj}"' if proj else "")
+        yield f"      {meta}"
+    if dview.description:
+        yield f'      description "{dview.description}"'
+    if dview.wildcard:
+        yield "      include *"
+    for el in dview.includes:
+        yield f"      include {el.var}"
+    if annotate and dview.filter_lines is not None:
+        yield "      //__NAME_FILTERS__"
+        for line in dview.filter_lines:
+            yield f"      {line}"
+    yield "      autoLayout"
+    yield "    }"
+
+
+__all__ = [
+    "emit_dsl",
+    "write_dsl",
+    "emit_dsl_fragments",
+    "render_view_fragments",
+    "ViewFragment",
+    "build_dsl_tree",
+    "DeclarationIndex",
+    "DslWorkspace",
+    "DslElement",
+    "DslView",
+    "normalized_include_elements",
+    "resolve_view_subject",
+]
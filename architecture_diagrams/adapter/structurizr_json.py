@@ -0,0 +1,434 @@
+"""Native Structurizr workspace JSON exporter.
+
+Writes the workspace JSON schema read by Structurizr Lite/cloud/on-premises and the
+Structurizr CLI: people and software systems (with nested containers, components and
+their outgoing relationships), deployment nodes, views referencing elements and
+relationships by id, and element/relationship styles.
+
+Elements, relationships and view contents come from the same normalized DSL tree as
+``emit_dsl`` (deduplicated declarations, aggregated system-level relationships, fixed
+view includes, name filters), so both exports describe the same workspace. Element ids
+are the model ids, suffixed ``-2``, ``-3``... where two declarations share one.
+
+The document is written by a streaming encoder: every array is produced lazily and
+encoded item by item, so a large workspace never exists as one nested dict. The text is
+identical to ``json.dumps(..., indent=2)`` of the equivalent document.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from architecture_diagrams.adapter.dsl_emitter import (
+    DslElement,
+    DslRelationship,
+    DslStyle,
+    DslView,
+    DslWorkspace,
+    build_dsl_tree,
+)
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.c4.views import DeploymentView
+
+# Structurizr's type tags, always listed first on an element
+_TYPE_TAGS = {
+    "Person": "Element,Person",
+    "SoftwareSystem": "Element,Software System",
+    "Container": "Element,Container",
+    "Component": "Element,Component",
+}
+# The model has no per-node environment; every deployment element lives in this one
+DEFAULT_ENVIRONMENT = "Default"
+_AUTO_LAYOUT = {
+    "implementation": "Graphviz",
+    "rankDirection": "TopBottom",
+    "rankSeparation": 300,
+    "nodeSeparation": 300,
+    "edgeSeparation": 0,
+    "vertices": False,
+}
+_VIEW_COLLECTIONS = (
+    ("systemLandscape", "systemLandscapeViews"),
+    ("systemContext", "systemContextViews"),
+    ("container", "containerViews"),
+    ("component", "componentViews"),
+)
+_INT_STYLE_KEYS = {"opacity", "thickness", "fontSize", "width", "height", "strokeWidth"}
+
+
+# --- Public API ---
+def dump_workspace_json(model: Any) -> str:
+    """Render a SystemLandscape as Structurizr workspace JSON."""
+    buf = io.StringIO()
+    write_workspace_json(model, buf)
+    return buf.getvalue()
+
+
+def write_workspace_json(model: Any, fp: TextIO) -> None:
+    """Stream ``dump_workspace_json(model)`` to a text stream."""
+    _encode(_WorkspaceJson(model).document(), fp, 0)
+
+
+# --- Streaming encoder ---
+def _encode(value: Any, fp: TextIO, depth: int) -> None:
+    """Write ``value`` as ``json.dumps(value, indent=2)`` would, nested ``depth`` levels.
+
+    Dicts and lists may hold iterators (encoded as arrays) and ``_Object`` generators
+    of key/value pairs (encoded as objects); neither is materialized.
+    """
+    if isinstance(value, dict):
+        _encode_members(iter(value.items()), fp, depth, "{", "}", keyed=True)
+    elif isinstance(value, _Object):
+        _encode_members(iter(value), fp, depth, "{", "}", keyed=True)
+    elif isinstance(value, (list, tuple, Iterator)):
+        _encode_members(iter(value), fp, depth, "[", "]", keyed=False)
+    else:
+        fp.write(json.dumps(value))
+
+
+def _encode_members(
+    items: Iterator[Any], fp: TextIO, depth: int, open_: str, close: str, keyed: bool
+) -> None:
+    pad = "\n" + "  " * (depth + 1)
+    first = True
+    for item in items:
+        fp.write(open_ + pad if first else "," + pad)
+        first = False
+        if keyed:
+            key, item = item
+            fp.write(json.dumps(key) + ": ")
+        _encode(item, fp, depth + 1)
+    fp.write(open_ + close if first else "\n" + "  " * depth + close)
+
+
+class _Object:
+    """A JSON object whose members are produced lazily as (key, value) pairs."""
+
+    def __init__(self, members: Iterable[Tuple[str, Any]]) -> None:
+        self._members = members
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self._members)
+
+
+# --- Document ---
+class _Ids:
+    """Unique string ids, preferring each object's own model id."""
+
+    def __init__(self) -> None:
+        self._taken: Set[str] = set()
+        self._by_obj: Dict[int, str] = {}
+
+    def assign(self, obj: object, preferred: str) -> str:
+        candidate, n = preferred, 1
+        while candidate in self._taken:
+            n += 1
+            candidate = f"{preferred}-{n}"
+        self._taken.add(candidate)
+        self._by_obj[id(obj)] = candidate
+        return candidate
+
+    def __getitem__(self, obj: object) -> str:
+        return self._by_obj[id(obj)]
+
+
+class _WorkspaceJson:
+    """Id assignment and view resolution for one export; the document itself is lazy."""
+
+    def __init__(self, model: SystemLandscape) -> None:
+        self.model = model
+        self.ws: DslWorkspace = build_dsl_tree(model)
+        self.ids = _Ids()
+        self.by_var: Dict[str, DslElement] = {}
+        self.relationships: List[DslRelationship] = []
+        self.neighbours: Dict[int, List[DslElement]] = {}
+        # Relationships by endpoint var, for the view name filters (``a->b``, ``a->*``)
+        self.rels_from: Dict[str, List[DslRelationship]] = {}
+        self.rels_to: Dict[str, List[DslRelationship]] = {}
+        self.by_source: Dict[int, str] = {}  # id(model element) -> JSON id
+        for el in self.ws.iter_declarations():
+            self.by_source[id(el.source)] = self.ids.assign(
+                el, getattr(el.source, "id", "") or el.var
+            )
+            self.by_var[el.var] = el
+        for el in self.ws.iter_declarations():
+            for rel in el.relationships:
+                self.ids.assign(rel, f"{self.ids[rel.source]}->{self.ids[rel.destination]}")
+                self.relationships.append(rel)
+                self.neighbours.setdefault(id(rel.source), []).append(rel.destination)
+                self.neighbours.setdefault(id(rel.destination), []).append(rel.source)
+                self.rels_from.setdefault(rel.source.var, []).append(rel)
+                self.rels_to.setdefault(rel.destination.var, []).append(rel)
+        self.deployment_elements: List[object] = []
+        for node in model.deployment_nodes.values():
+            self._assign_deployment_ids(node)
+
+    def _assign_deployment_ids(self, node: Any) -> None:
+        self.ids.assign(node, node.id)
+        self.deployment_elements.append(node)
+        for child in node.infrastructure_nodes:
+            self.ids.assign(child, child.id)
+            self.deployment_elements.append(child)
+        for inst in (*node.software_system_instances, *node.container_instances):
+            self.ids.assign(inst, f"{node.id}/{inst.id}")
+            self.deployment_elements.append(inst)
+        for child in node.children:
+            self._assign_deployment_ids(child)
+
+    def document(self) -> _Object:
+        return _Object(self._document_members())
+
+    def _document_members(self) -> Iterator[Tuple[str, Any]]:
+        yield "name", self.model.name
+        yield "description", ""
+        yield "model", _Object(self._model_members())
+        yield "views", _Object(self._views_members())
+
+    # Model
+    def _model_members(self) -> Iterator[Tuple[str, Any]]:
+        yield "properties", {"structurizr.groupSeparator": "/"}
+        yield "people", (self._element(el) for el in self.ws.elements if el.kind == "Person")
+        yield "softwareSystems", (
+            self._element(el) for el in self.ws.elements if el.kind == "SoftwareSystem"
+        )
+        if self.model.deployment_nodes:
+            yield "deploymentNodes", (
+                self._deployment_node(n) for n in self.model.deployment_nodes.values()
+            )
+
+    def _element(self, el: DslElement) -> _Object:
+        return _Object(self._element_members(el))
+
+    def _element_members(self, el: DslElement) -> Iterator[Tuple[str, Any]]:
+        yield "id", self.ids[el]
+        yield "tags", ",".join([_TYPE_TAGS[el.kind], *el.tags])
+        yield "name", el.name
+        yield "description", el.description
+        if el.kind in ("Container", "Component"):
+            yield "technology", el.technology
+        if el.relationships:
+            yield "relationships", (self._relationship(rel) for rel in el.relationships)
+        if el.kind == "SoftwareSystem":
+            yield "containers", (self._element(c) for c in el.children)
+        elif el.kind == "Container" and el.children:
+            yield "components", (self._element(c) for c in el.children)
+
+    def _relationship(self, rel: DslRelationship) -> Dict[str, Any]:
+        return {
+            "id": self.ids[rel],
+            "tags": "Relationship",
+            "sourceId": self.ids[rel.source],
+            "destinationId": self.ids[rel.destination],
+            "description": rel.description,
+            "technology": rel.technology,
+        }
+
+    def _deployment_node(self, node: Any) -> _Object:
+        return _Object(self._deployment_node_members(node))
+
+    def _deployment_node_members(self, node: Any) -> Iterator[Tuple[str, Any]]:
+        yield "id", self.ids[node]
+        yield "tags", _tags("Element,Deployment Node", node.tags)
+        yield "name", node.name
+        yield "description", node.description or ""
+        yield "technology", node.technology or ""
+        yield "environment", DEFAULT_ENVIRONMENT
+        yield "instances", "1"
+        if node.children:
+            yield "children", (self._deployment_node(c) for c in node.children)
+        if node.infrastructure_nodes:
+            yield "infrastructureNodes", (
+                {
+                    "id": self.ids[inf],
+                    "tags": _tags("Element,Infrastructure Node", inf.tags),
+                    "name": inf.name,
+                    "description": inf.description or "",
+                    "technology": inf.technology or "",
+                    "environment": DEFAULT_ENVIRONMENT,
+                }
+                for inf in node.infrastructure_nodes
+            )
+        if node.software_system_instances:
+            yield "softwareSystemInstances", (
+                {
+                    "id": self.ids[inst],
+                    "tags": f"Software System Instance,{inst.instance_tag}",
+                    "softwareSystemId": self._model_id(inst.software_system),
+                    "environment": DEFAULT_ENVIRONMENT,
+                    "instanceId": i,
+                }
+                for i, inst in enumerate(node.software_system_instances, 1)
+            )
+        if node.container_instances:
+            yield "containerInstances", (
+                {
+                    "id": self.ids[inst],
+                    "tags": f"Container Instance,{inst.instance_tag}",
+                    "containerId": self._model_id(inst.container),
+                    "environment": DEFAULT_ENVIRONMENT,
+                    "instanceId": i,
+                }
+                for i, inst in enumerate(node.container_instances, 1)
+            )
+
+    def _model_id(self, element: Any) -> str:
+        return self.by_source.get(id(element)) or str(element.id)
+
+    # Views
+    def _views_members(self) -> Iterator[Tuple[str, Any]]:
+        for kind, collection in _VIEW_COLLECTIONS:
+            views = [v for v in self.ws.views if v.kind == kind]
+            if views:
+                yield collection, (self._view(v) for v in views)
+        deployment = [v for v in self.model.views if isinstance(v, DeploymentView)]
+        if deployment:
+            yield "deploymentViews", (self._deployment_view(v) for v in deployment)
+        yield "configuration", {
+            "styles": {
+                "elements": (_style(s) for s in self.ws.styles if s.scope == "element"),
+                "relationships": (_style(s) for s in self.ws.styles if s.scope == "relationship"),
+            }
+        }
+
+    def _view(self, dview: DslView) -> Dict[str, Any]:
+        elements, relationships = self.view_contents(dview)
+        data: Dict[str, Any] = {"key": dview.view.key}  # type: ignore[attr-defined]
+        if dview.subject is not None:
+            scope = "containerId" if dview.kind == "component" else "softwareSystemId"
+            data[scope] = self.ids[dview.subject]
+        data["title"] = dview.view.name  # type: ignore[attr-defined]
+        data["description"] = dview.description
+        data["elements"] = [{"id": self.ids[el]} for el in elements]
+        data["relationships"] = [{"id": self.ids[rel]} for rel in relationships]
+        data["automaticLayout"] = _AUTO_LAYOUT
+        return data
+
+    def _deployment_view(self, view: DeploymentView) -> Dict[str, Any]:
+        return {
+            "key": view.key,
+            "title": view.name,
+            "description": view.description or view.name,
+            "environment": view.environment or DEFAULT_ENVIRONMENT,
+            "elements": [{"id": self.ids[el]} for el in self.deployment_elements],
+            "relationships": [],
+            "automaticLayout": _AUTO_LAYOUT,
+        }
+
+    def view_contents(self, dview: DslView) -> Tuple[List[DslElement], List[DslRelationship]]:
+        """The elements and relationships a view shows, as Structurizr would resolve them.
+
+        ``include *`` expands per view type (landscape: all people and systems; otherwise
+        the subject's children, or the subject itself for context views, plus the people,
+        systems and, in component views, containers connected to them or to anything
+        nested in them, lifted to the nearest enclosing element of such a kind).
+        Relationships are those between the view's elements, then the view's name filter
+        lines (``exclude x``, ``include a->b``, ``exclude a->b``) are applied in order.
+        """
+        chosen: Dict[int, DslElement] = {}
+        if dview.subject is not None and dview.kind == "systemContext":
+            chosen[id(dview.subject)] = dview.subject
+        if dview.wildcard:
+            for el in self._wildcard(dview):
+                chosen.setdefault(id(el), el)
+        for el in dview.includes:
+            chosen.setdefault(id(el), el)
+        lines = dview.filter_lines or []
+        for line in lines:
+            verb, _, target = line.partition(" ")
+            if verb == "exclude" and "->" not in target:
+                excluded = self.by_var.get(target)
+                if excluded is not None:
+                    chosen.pop(id(excluded), None)
+        rels: Dict[int, DslRelationship] = {
+            id(rel): rel
+            for rel in self.relationships
+            if id(rel.source) in chosen and id(rel.destination) in chosen
+        }
+        for line in lines:
+            verb, _, target = line.partition(" ")
+            if "->" not in target:
+                continue
+            src, dst = target.split("->", 1)
+            for rel in self._matching(src, dst):
+                if verb == "include":
+                    rels.setdefault(id(rel), rel)
+                    chosen.setdefault(id(rel.source), rel.source)
+                    chosen.setdefault(id(rel.destination), rel.destination)
+                else:
+                    rels.pop(id(rel), None)
+        return list(chosen.values()), list(rels.values())
+
+    def _matching(self, src: str, dst: str) -> Iterator[DslRelationship]:
+        """Relationships matching a filter line's ``src->dst`` (either side may be ``*``)."""
+        if src != "*":
+            candidates = self.rels_from.get(src, [])
+        elif dst != "*":
+            candidates = self.rels_to.get(dst, [])
+        else:
+            candidates = self.relationships
+        return (rel for rel in candidates if _matches(rel.destination, dst))
+
+    def _wildcard(self, dview: DslView) -> Iterator[DslElement]:
+        if dview.kind == "systemLandscape":
+            yield from self.ws.elements
+            return
+        subject = dview.subject
+        if subject is None:
+            return
+        scope = [subject] if dview.kind == "systemContext" else list(subject.children)
+        reachable = {"Person", "SoftwareSystem"}
+        if dview.kind == "component":
+            reachable.add("Container")
+        yield from scope
+        inside = {id(el) for el in scope}
+        for el in _subtree(scope):
+            for other in self.neighbours.get(id(el), ()):
+                # Relationships of nested elements imply ones between their ancestors
+                target: Optional[DslElement] = other
+                while target is not None and target.kind not in reachable:
+                    target = target.parent
+                if target is None or id(target) in inside or _encloses(target, subject):
+                    continue
+                yield target
+
+
+def _subtree(elements: Iterable[DslElement]) -> Iterator[DslElement]:
+    stack = list(elements)
+    while stack:
+        el = stack.pop()
+        yield el
+        stack.extend(el.children)
+
+
+def _encloses(el: DslElement, other: DslElement) -> bool:
+    cur: Optional[DslElement] = other
+    while cur is not None:
+        if cur is el:
+            return True
+        cur = cur.parent
+    return False
+
+
+def _matches(el: DslElement, var: str) -> bool:
+    return var == "*" or el.var == var
+
+
+def _tags(type_tags: str, tags: Optional[Iterable[str]]) -> str:
+    return ",".join([type_tags, *sorted(tags or ())])
+
+
+def _style(style: DslStyle) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"tag": style.tag}
+    for key, value in style.attributes.items():
+        if value in ("true", "false"):
+            data[key] = value == "true"
+        elif key in _INT_STYLE_KEYS and value.lstrip("-").isdigit():
+            data[key] = int(value)
+        else:
+            data[key] = value
+    return data
+
+
+__all__ = ["DEFAULT_ENVIRONMENT", "dump_workspace_json", "write_workspace_json"]
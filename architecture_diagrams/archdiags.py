@@ -1,28 +1,98 @@
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Tuple
+
 import click
 
-from architecture_diagrams.cli import generate as generate_cmd
-from architecture_diagrams.cli.dump import dump
-from architecture_diagrams.cli.list_modules import list_modules
-from architecture_diagrams.cli.list_views import list_views
+
+class LazyGroup(click.Group):
+    """Click group that imports a subcommand's module only when that command runs.
+
+    ``lazy_commands`` maps command name -> ("module:attribute", summary). The summary (the
+    first paragraph of the command's docstring; a test keeps them in sync) is shown by
+    ``--help`` without importing anything. Commands listed in ``optional`` report "No such
+    command" when their module cannot be imported (e.g. a missing optional dependency).
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: Dict[str, Tuple[str, str]],
+        optional: Tuple[str, ...] = (),
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands
+        self.optional = optional
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.commands or cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+        target, _ = self.lazy_commands[cmd_name]
+        module_name, attr = target.split(":")
+        try:
+            command = getattr(import_module(module_name), attr)
+        except ImportError:
+            if cmd_name in self.optional:
+                return None
+            raise
+        self.add_command(command, cmd_name)
+        return command  # type: ignore[no-any-return]
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        # Same truncation as click.Group.format_commands
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            # Unloaded commands are summarised by a placeholder carrying their summary
+            command = self.commands.get(name) or click.Command(
+                name, help=self.lazy_commands[name][1]
+            )
+            if not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
 
 # Create the CLI group explicitly to keep type checkers happy
-cli = click.Group(help="Architecture diagram CLI (C4 -> Structurizr DSL)")
-
-# Core commands
-cli.add_command(dump)
-cli.add_command(generate_cmd.generate)
-cli.add_command(list_views)
-cli.add_command(list_modules)
-
-# Lazily import optional commands that pull heavy or optional deps (e.g., docker)
-try:
-    from architecture_diagrams.cli.lite import lite as lite_cmd  # type: ignore
-except Exception:
-    lite_cmd = None  # type: ignore[assignment]
-
-# Only register 'lite' if its optional dependency is available
-if lite_cmd is not None:
-    cli.add_command(lite_cmd)
+cli = LazyGroup(
+    help="Architecture diagram CLI (C4 -> Structurizr DSL)",
+    lazy_commands={
+        "cache": (
+            "architecture_diagrams.cli.cache:cache",
+            "Inspect and bound the build output cache (--enable-cache).",
+        ),
+        "dump": (
+            "architecture_diagrams.cli.dump:dump",
+            "Dumps the architecture diagram DSL using the orchestrator.",
+        ),
+        "generate": (
+            "architecture_diagrams.cli.generate:generate",
+            "Generate a workspace.dsl from composed models and independent views.",
+        ),
+        "list-modules": (
+            "architecture_diagrams.cli.list_modules:list_modules",
+            "List available module keys inferred from view subjects (SYSTEM_KEY).",
+        ),
+        "list-views": (
+            "architecture_diagrams.cli.list_views:list_views",
+            "List discovered views and their tags.",
+        ),
+        # Optional: only available when its dependencies (e.g. requests) are installed
+        "lite": ("architecture_diagrams.cli.lite:lite", "Niceties around Structurizr lite"),
+        "serve": (
+            "architecture_diagrams.cli.serve:serve",
+            "Keep composed models warm; generate and list-views use the daemon while it runs.",
+        ),
+    },
+    optional=("lite",),
+)
 
 if __name__ == "__main__":
     cli()
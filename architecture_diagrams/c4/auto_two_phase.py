@@ -28,10 +28,11 @@ This lets us delete explicit register_* boilerplate across modules.
 
 from __future__ import annotations
 
+from contextvars import ContextVar
 from enum import Enum
 from importlib import import_module
 from types import ModuleType
-from typing import List, Optional, Sequence, Union
+from typing import Any, Callable, List, Optional, Sequence, Union
 
 from . import SoftwareSystem, SystemLandscape
 
@@ -53,6 +54,20 @@ class Phase(
             raise ValueError("phase must be one of {'define','link','all'}") from e
 
 
+# Optional wrapper around every define_*/link_* call: runner(module_name, function_name, call).
+# Incremental composition installs one to record what each phase contributes to the model.
+PhaseRunner = Callable[[str, str, Callable[[], Any]], Any]
+phase_runner: ContextVar[Optional[PhaseRunner]] = ContextVar("phase_runner", default=None)
+
+
+def _run_phase(module: ModuleType, function_name: str, model: SystemLandscape) -> Any:
+    fn = getattr(module, function_name)
+    runner = phase_runner.get()
+    if runner is None:
+        return fn(model)
+    return runner(module.__name__, function_name, lambda: fn(model))
+
+
 def _infer_system_key(module: ModuleType, name: str) -> str:
     return getattr(module, "SYSTEM_KEY", name.replace("_", "-"))
 
@@ -96,13 +111,12 @@ def auto_register(
     # TODO: Check link_function availability? Maybe put all of this into a method
 
     link_function = getattr(module, link_function_name, None)
-    define_function = getattr(module, define_function_name)
 
     system_key = _infer_system_key(module, name)
 
     defined = None
     if phase_enum in {Phase.DEFINE, Phase.ALL}:
-        defined = define_function(model)
+        defined = _run_phase(module, define_function_name, model)
     if phase_enum in {Phase.LINK, Phase.ALL} and link_function is not None:
         if defined is None:
             existing = next(
@@ -111,7 +125,7 @@ def auto_register(
             if existing is None:
                 raise ValueError(f"Cannot link {system_key} before it is defined")
             defined = existing
-        link_function(model)
+        _run_phase(module, link_function_name, model)
     if defined is None:
         raise RuntimeError("auto_register produced no system; check module functions")
     return defined
@@ -130,4 +144,4 @@ def auto_register_all(
     return results
 
 
-__all__ = ["auto_register", "auto_register_all", "Phase"]
+__all__ = ["auto_register", "auto_register_all", "Phase", "phase_runner"]
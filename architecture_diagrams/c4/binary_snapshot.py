@@ -0,0 +1,652 @@
+"""Compact binary snapshots of a SystemLandscape.
+
+A snapshot is a single little-endian file: a header with section offsets, then
+
+- a string table (``u32`` end offsets + one UTF-8 blob) holding every name, description,
+  technology, id and tag; index 0 is ``""`` and ``NONE`` stands for ``None``;
+- a tag-set table (``u32`` end offsets + ``u32`` string indexes), one entry per distinct
+  tag set;
+- fixed-width element records in pre-order (people, then each software system followed
+  by its containers and components, then deployment nodes and their contents). Records
+  reference their parent by index and store where their subtree ends, so a top-level
+  element and everything under it is one contiguous run;
+- fixed-width relationship records referencing elements by index;
+- a view table plus the ``u32`` string indexes of the views' includes;
+- a small JSON section for the rest (name, groups, styles, relationship restriction).
+
+``ModelSnapshot`` reads a snapshot from bytes or an ``mmap`` without decoding it up front:
+records are unpacked on access and elements are materialized one top-level subtree at a
+time, so opening a large snapshot costs next to nothing. ``to_landscape()`` (or ``load``)
+rebuilds the complete SystemLandscape in one pass, without running any builders.
+
+Views keep their key, name, description, subject, includes, ``include_all``, environment
+and project label. Filter objects that ``ViewSpec.build`` attaches to views are not part
+of the format; snapshots are meant to be taken before views are built.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .model import (
+    Component,
+    Container,
+    ContainerInstance,
+    DeploymentNode,
+    ElementBase,
+    InfrastructureNode,
+    Person,
+    Relationship,
+    SoftwareSystem,
+    SoftwareSystemInstance,
+    intern_tags,
+)
+from .styles import ElementStyle, RelationshipStyle, Styles
+from .system_landscape import SystemLandscape
+from .views import (
+    ComponentView,
+    ContainerView,
+    DeploymentView,
+    SystemContextView,
+    SystemLandscapeView,
+    ViewType,
+)
+
+MAGIC = b"ADMS"
+FORMAT_VERSION = 1
+NONE = 0xFFFFFFFF  # string index standing for None
+
+# Element kinds, in record order within a subtree
+KINDS = (
+    Person,
+    SoftwareSystem,
+    Container,
+    Component,
+    DeploymentNode,
+    InfrastructureNode,
+    SoftwareSystemInstance,
+    ContainerInstance,
+)
+_KIND_INDEX = {cls: i for i, cls in enumerate(KINDS)}
+_VIEW_KINDS = (
+    SystemLandscapeView,
+    SystemContextView,
+    ContainerView,
+    ComponentView,
+    DeploymentView,
+)
+_VIEW_TYPES = (
+    ViewType.SYSTEM_LANDSCAPE,
+    ViewType.SYSTEM_CONTEXT,
+    ViewType.CONTAINER,
+    ViewType.COMPONENT,
+    ViewType.DEPLOYMENT,
+)
+
+_SECTIONS = (
+    "string_offsets",
+    "strings",
+    "tagset_offsets",
+    "tagsets",
+    "elements",
+    "relationships",
+    "views",
+    "view_includes",
+    "meta",
+)
+_HEADER = struct.Struct("<4sHH" + "QQ" * len(_SECTIONS))
+_FLAG_COMPACT = 1
+# kind, id, name, description, technology, tags, parent, subtree end, ref, instance tag
+_ELEMENT = struct.Struct("<B3xIIIIIiIiI")
+# source, destination, description, technology, tags
+_RELATIONSHIP = struct.Struct("<IIIII")
+# kind, include_all, key, name, description, subject, environment, project, includes
+_VIEW = struct.Struct("<BB2xIIIiIIII")
+_U32 = struct.Struct("<I")
+# u32 arrays are read in place where the host layout matches the file's
+_NATIVE_U32 = sys.byteorder == "little" and struct.calcsize("I") == 4
+
+
+class ElementRecord(NamedTuple):
+    kind: int
+    id: int
+    name: int
+    description: int
+    technology: int
+    tags: int
+    parent: int  # element index, -1 for top-level elements
+    end: int  # index after the last element of this subtree
+    ref: int  # instances: index of the software system / container, else -1
+    instance_tag: int
+
+
+class RelationshipRecord(NamedTuple):
+    source: int
+    destination: int
+    description: int
+    technology: int
+    tags: int
+
+
+class ViewRecord(NamedTuple):
+    kind: int
+    include_all: int
+    key: int
+    name: int
+    description: int
+    subject: int  # element index, -1 if none
+    environment: int
+    project: int
+    include_start: int
+    include_count: int
+
+
+# --- Writing ---
+class _Tables:
+    def __init__(self) -> None:
+        self.strings: Dict[str, int] = {"": 0}
+        self.tagsets: Dict[FrozenSet[str], int] = {}
+        self.tagset_items: List[int] = []
+        self.tagset_ends: List[int] = []
+
+    def string(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        found = self.strings.get(value)
+        if found is None:
+            found = self.strings[value] = len(self.strings)
+        return found
+
+    def tags(self, tags: Optional[AbstractSet[str]]) -> int:
+        key = frozenset(tags or ())
+        found = self.tagsets.get(key)
+        if found is None:
+            found = self.tagsets[key] = len(self.tagsets)
+            self.tagset_items.extend(self.string(t) for t in sorted(key))
+            self.tagset_ends.append(len(self.tagset_items))
+        return found
+
+
+def _preorder(model: SystemLandscape) -> Iterator[Tuple[ElementBase, Optional[ElementBase]]]:
+    """(element, the element holding it) in record order."""
+    for person in model.people.values():
+        yield person, None
+    for system in model.software_systems.values():
+        yield system, None
+        for container in system.containers:
+            yield container, system
+            for component in container.components:
+                yield component, container
+
+    def node_tree(
+        node: DeploymentNode, holder: Optional[DeploymentNode]
+    ) -> Iterator[Tuple[ElementBase, Optional[ElementBase]]]:
+        yield node, holder
+        for leaf in (
+            *node.infrastructure_nodes,
+            *node.software_system_instances,
+            *node.container_instances,
+        ):
+            yield leaf, node
+        for child in node.children:
+            yield from node_tree(child, node)
+
+    for node in model.deployment_nodes.values():
+        yield from node_tree(node, None)
+
+
+def dumps(model: SystemLandscape) -> bytes:
+    """Serialize a model; raises ValueError if it references elements outside the model."""
+    tables = _Tables()
+    tree = list(_preorder(model))
+    index = {id(el): i for i, (el, _) in enumerate(tree)}
+
+    def ref(obj: Any, what: str) -> int:
+        try:
+            return index[id(obj)]
+        except KeyError:
+            raise ValueError(
+                f"{what} references {getattr(obj, 'name', obj)!r}, which is not in the model"
+            ) from None
+
+    # Subtree ends, computed bottom-up over the pre-order
+    parents = [index[id(holder)] if holder is not None else -1 for _, holder in tree]
+    ends = list(range(1, len(tree) + 1))
+    for i in range(len(tree) - 1, -1, -1):
+        if parents[i] >= 0:
+            ends[parents[i]] = max(ends[parents[i]], ends[i])
+
+    element_data = bytearray()
+    for i, (el, _) in enumerate(tree):
+        target = getattr(el, "software_system", None) or getattr(el, "container", None)
+        element_data += _ELEMENT.pack(
+            _KIND_INDEX[type(el)],
+            tables.string(el.id),
+            tables.string(el.name),
+            tables.string(el.description or ""),
+            tables.string(el.technology),
+            tables.tags(el.tags),
+            parents[i],
+            ends[i],
+            ref(target, el.name) if target is not None else -1,
+            tables.string(getattr(el, "instance_tag", None)),
+        )
+
+    rel_data = bytearray()
+    for rel in model.relationships:
+        rel_data += _RELATIONSHIP.pack(
+            ref(rel.source, "A relationship"),
+            ref(rel.destination, "A relationship"),
+            tables.string(rel.description),
+            tables.string(rel.technology),
+            tables.tags(rel.tags),
+        )
+
+    view_data = bytearray()
+    includes: List[int] = []
+    for view in model.views:
+        subject = getattr(view, "software_system", None) or getattr(view, "container", None)
+        start = len(includes)
+        includes.extend(tables.string(eid) for eid in sorted(view.include))
+        view_data += _VIEW.pack(
+            _VIEW_KINDS.index(type(view)),
+            int(bool(getattr(view, "include_all", False))),
+            tables.string(view.key),
+            tables.string(view.name),
+            tables.string(view.description or ""),
+            ref(subject, f"View {view.key!r}") if subject is not None else -1,
+            tables.string(getattr(view, "environment", None)),
+            tables.string(getattr(view, "project", None)),
+            start,
+            len(includes) - start,
+        )
+
+    pairs = model._allowed_relationship_pairs
+    meta = {
+        "name": model.name,
+        "description": model.description,
+        "groups": {g: [ref(s, f"Group {g!r}") for s in lst] for g, lst in model.groups.items()},
+        "styles": asdict(model.styles),
+        "allowed_relationship_pairs": sorted(pairs) if pairs is not None else None,
+    }
+
+    blob = bytearray()
+    string_ends: List[int] = []
+    for value in tables.strings:
+        blob += value.encode("utf-8")
+        string_ends.append(len(blob))
+    sections = [
+        _u32_array(string_ends),
+        bytes(blob),
+        _u32_array(tables.tagset_ends),
+        _u32_array(tables.tagset_items),
+        bytes(element_data),
+        bytes(rel_data),
+        bytes(view_data),
+        _u32_array(includes),
+        json.dumps(meta, sort_keys=True).encode("utf-8"),
+    ]
+    layout: List[int] = []
+    offset = _HEADER.size
+    for data in sections:
+        layout += [offset, len(data)]
+        offset += len(data)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _FLAG_COMPACT if model.compact else 0, *layout)
+    return header + b"".join(sections)
+
+
+def dump(model: SystemLandscape, path: Union[str, Path]) -> None:
+    """Write ``dumps(model)`` to path atomically."""
+    path = Path(path)
+    data = dumps(model)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".snapshot-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _u32_array(values: List[int]) -> bytes:
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def _u32_view(section: memoryview) -> Sequence[int]:
+    """A ``u32`` section as integers: cast in place, or decoded on big-endian hosts."""
+    if _NATIVE_U32:
+        return section.cast("I")
+    return [value for (value,) in _U32.iter_unpack(section)]
+
+
+# --- Reading ---
+class ModelSnapshot:
+    """Read access to a binary snapshot held in bytes or a read-only mmap.
+
+    Strings are decoded and element objects built on first access only. ``element(i)``
+    materializes the top-level element enclosing ``i`` with its whole subtree (so a
+    system always comes with all of its containers), and returns the same object on
+    later calls.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        self._buffer = data
+        self._data = memoryview(data)
+        fields = _HEADER.unpack_from(self._data, 0)
+        magic, version, flags = fields[:3]
+        if magic != MAGIC:
+            raise ValueError("not a model snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+        self.compact = bool(flags & _FLAG_COMPACT)
+        self._sections: Dict[str, memoryview] = {}
+        for i, name in enumerate(_SECTIONS):
+            offset, length = fields[3 + 2 * i], fields[4 + 2 * i]
+            self._sections[name] = self._data[offset : offset + length]
+        self._string_ends = _u32_view(self._sections["string_offsets"])
+        self._tagset_ends = _u32_view(self._sections["tagset_offsets"])
+        self._tagset_items = _u32_view(self._sections["tagsets"])
+        self._includes = _u32_view(self._sections["view_includes"])
+        self._strings: List[Optional[str]] = [None] * len(self._string_ends)
+        self._tagsets: Dict[int, FrozenSet[str]] = {}
+        self._objects: Dict[int, ElementBase] = {}
+        # Landscape owning the top-level elements built from here (see LazySystemLandscape)
+        self.owner: Optional[SystemLandscape] = None
+        self._meta: Optional[Dict[str, Any]] = None
+        self.element_count = len(self._sections["elements"]) // _ELEMENT.size
+        self.relationship_count = len(self._sections["relationships"]) // _RELATIONSHIP.size
+        self.view_count = len(self._sections["views"]) // _VIEW.size
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "ModelSnapshot":
+        """Map a snapshot file read-only; call ``close()`` (or use ``with``) when done."""
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    def close(self) -> None:
+        """Release the mapping; materialized objects stay valid."""
+        for view in (
+            self._string_ends,
+            self._tagset_ends,
+            self._tagset_items,
+            self._includes,
+            *self._sections.values(),
+            self._data,
+        ):
+            if isinstance(view, memoryview):
+                view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "ModelSnapshot":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # Raw access
+    def string(self, index: int) -> Optional[str]:
+        if index == NONE:
+            return None
+        found = self._strings[index]
+        if found is None:
+            start = self._string_ends[index - 1] if index else 0
+            blob = self._sections["strings"]
+            found = self._strings[index] = str(blob[start : self._string_ends[index]], "utf-8")
+        return found
+
+    def tags(self, index: int) -> FrozenSet[str]:
+        found = self._tagsets.get(index)
+        if found is None:
+            start = self._tagset_ends[index - 1] if index else 0
+            names = (
+                self.string(i) or "" for i in self._tagset_items[start : self._tagset_ends[index]]
+            )
+            found = self._tagsets[index] = intern_tags(names)
+        return found
+
+    def record(self, index: int) -> ElementRecord:
+        return ElementRecord(
+            *_ELEMENT.unpack_from(self._sections["elements"], index * _ELEMENT.size)
+        )
+
+    def relationship_record(self, index: int) -> RelationshipRecord:
+        return RelationshipRecord(
+            *_RELATIONSHIP.unpack_from(self._sections["relationships"], index * _RELATIONSHIP.size)
+        )
+
+    def view_record(self, index: int) -> ViewRecord:
+        return ViewRecord(*_VIEW.unpack_from(self._sections["views"], index * _VIEW.size))
+
+    def iter_element_rows(self) -> Iterator[Tuple[int, ...]]:
+        """Element records as plain tuples (``ElementRecord`` field order), for bulk scans."""
+        return _ELEMENT.iter_unpack(self._sections["elements"])
+
+    @property
+    def materialized_count(self) -> int:
+        """How many element objects have been built so far."""
+        return len(self._objects)
+
+    def iter_records(self) -> Iterator[ElementRecord]:
+        for fields in _ELEMENT.iter_unpack(self._sections["elements"]):
+            yield ElementRecord(*fields)
+
+    def roots(self) -> Iterator[int]:
+        """Indexes of the top-level elements (people, systems, deployment nodes)."""
+        i = 0
+        while i < self.element_count:
+            yield i
+            i = self.record(i).end
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = json.loads(str(self._sections["meta"], "utf-8"))
+        return self._meta
+
+    # Materialization
+    def element(self, index: int) -> ElementBase:
+        found = self._objects.get(index)
+        if found is None:
+            root = index
+            while True:
+                parent = self.record(root).parent
+                if parent < 0:
+                    break
+                root = parent
+            end = self.record(root).end
+            size = _ELEMENT.size
+            records = _ELEMENT.iter_unpack(self._sections["elements"][root * size : end * size])
+            for i, fields in enumerate(records, root):
+                self._objects[i] = self._build(*fields)
+            self._objects[root]._owner = self.owner
+            found = self._objects[index]
+        return found
+
+    def _build(
+        self,
+        kind: int,
+        id_: int,
+        name: int,
+        description: int,
+        technology: int,
+        tags: int,
+        parent: int,
+        end: int,
+        ref: int,
+        instance_tag: int,
+    ) -> ElementBase:
+        cls = KINDS[kind]
+        string = self.string
+        tag_set: AbstractSet[str] = self.tags(tags)
+        if not self.compact:
+            tag_set = set(tag_set)
+        holder = self._objects[parent] if parent >= 0 else None
+        args = (
+            string(name) or "",
+            string(description) or "",
+            string(technology),
+            tag_set,
+            holder,
+            self.compact,
+        )
+        el: ElementBase
+        if cls is SoftwareSystemInstance or cls is ContainerInstance:
+            target = "software_system" if cls is SoftwareSystemInstance else "container"
+            el = cls(*args, instance_tag=string(instance_tag) or "Instance")
+            setattr(el, target, self.element(ref))
+        else:
+            el = cls(*args)
+        el.id = string(id_) or ""
+        if cls is Container:
+            holder._containers[el.name] = el  # type: ignore[union-attr]
+        elif cls is Component:
+            holder._components[el.name] = el  # type: ignore[union-attr]
+        elif holder is not None:
+            _DEPLOYMENT_SLOTS[cls](holder).append(el)
+        return el
+
+    def to_landscape(self) -> SystemLandscape:
+        """Materialize every element and rebuild the complete model."""
+        meta = self.meta
+        model = SystemLandscape(meta["name"], meta["description"], compact=self.compact)
+        for root in self.roots():
+            el = self.element(root)
+            if isinstance(el, Person):
+                model.people[el.id] = el
+                model._index_name(el, model._people_by_name, model._people_by_norm_name)
+            elif isinstance(el, SoftwareSystem):
+                model.software_systems[el.id] = el
+                model._index_name(el, model._systems_by_name, model._systems_by_norm_name)
+                for c in el.containers:
+                    model._containers_index[(el.name, c.name)] = c
+            else:
+                model.deployment_nodes[el.id] = el  # type: ignore[assignment]
+            model._all_ids.add(el.id)
+            el._owner = model
+
+        model.relationships = self.relationships()
+        self.restore_extras(model)
+        return model
+
+    def relationships(self, records: Optional[Iterable[int]] = None) -> List[Relationship]:
+        """Materialize the relationships (all, or those at the given record indexes)."""
+        rel_data = self._sections["relationships"]
+        if records is None:
+            rows: Iterable[Tuple[int, ...]] = _RELATIONSHIP.iter_unpack(rel_data)
+        else:
+            rows = (_RELATIONSHIP.unpack_from(rel_data, i * _RELATIONSHIP.size) for i in records)
+        return [
+            Relationship(
+                source=self.element(src),
+                destination=self.element(dst),
+                description=self.string(desc) or "",
+                technology=self.string(tech),
+                tags=set(self.tags(tags)),
+            )
+            for src, dst, desc, tech, tags in rows
+        ]
+
+    def iter_relationship_records(self) -> Iterator[RelationshipRecord]:
+        for fields in _RELATIONSHIP.iter_unpack(self._sections["relationships"]):
+            yield RelationshipRecord(*fields)
+
+    def restore_extras(self, model: SystemLandscape) -> None:
+        """Add the views, groups, styles and relationship restriction to ``model``."""
+        meta = self.meta
+        for i in range(self.view_count):
+            model.views.append(self._view(self.view_record(i)))
+        for group, members in meta["groups"].items():
+            model.groups[group] = [self.element(i) for i in members]  # type: ignore[misc]
+        styles = meta["styles"]
+        model.styles = Styles(
+            element_styles=[ElementStyle(**s) for s in styles["element_styles"]],
+            relationship_styles=[RelationshipStyle(**s) for s in styles["relationship_styles"]],
+            themes=list(styles["themes"]),
+        )
+        pairs = meta["allowed_relationship_pairs"]
+        if pairs is not None:
+            model.restrict_relationships_to({(s, d) for s, d in pairs})
+
+    def _view(self, rec: ViewRecord) -> Any:
+        cls = _VIEW_KINDS[rec.kind]
+        kwargs: Dict[str, Any] = {
+            "key": self.string(rec.key) or "",
+            "name": self.string(rec.name) or "",
+            "view_type": _VIEW_TYPES[rec.kind],
+            "include": {
+                self.string(i) or ""
+                for i in self._includes[rec.include_start : rec.include_start + rec.include_count]
+            },
+            "description": self.string(rec.description) or "",
+        }
+        if cls is SystemLandscapeView:
+            kwargs["include_all"] = bool(rec.include_all)
+        elif cls is ComponentView:
+            kwargs["container"] = self.element(rec.subject) if rec.subject >= 0 else None
+        elif cls is DeploymentView:
+            kwargs["environment"] = self.string(rec.environment) or ""
+        else:
+            kwargs["software_system"] = self.element(rec.subject) if rec.subject >= 0 else None
+        view: Any = cls(**kwargs)
+        project = self.string(rec.project)
+        if project is not None:
+            view.project = project
+        return view
+
+
+_DEPLOYMENT_SLOTS = {
+    DeploymentNode: lambda n: n.children,
+    InfrastructureNode: lambda n: n.infrastructure_nodes,
+    SoftwareSystemInstance: lambda n: n.software_system_instances,
+    ContainerInstance: lambda n: n.container_instances,
+}
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> SystemLandscape:
+    """Rebuild a model from ``dumps`` output."""
+    return ModelSnapshot(data).to_landscape()
+
+
+def load(path: Union[str, Path]) -> SystemLandscape:
+    """Rebuild a model from a snapshot file, reading it through mmap."""
+    with ModelSnapshot.open(path) as snapshot:
+        return snapshot.to_landscape()
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "ElementRecord",
+    "ModelSnapshot",
+    "RelationshipRecord",
+    "ViewRecord",
+    "dump",
+    "dumps",
+    "load",
+    "loads",
+]
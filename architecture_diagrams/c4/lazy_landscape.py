@@ -0,0 +1,515 @@
+"""SystemLandscape backed by a binary snapshot, materializing elements on demand.
+
+``LazySystemLandscape`` behaves like a SystemLandscape loaded from the snapshot, but
+its element stores (``people``, ``software_systems``, ``deployment_nodes``) hold record
+indexes until an element is read. Reading one materializes that top-level element with
+its whole subtree (see ``ModelSnapshot.element``). Name lookups, ``"System/Container"``
+lookups and membership tests go through ``ColumnStore`` indexes built from the snapshot's
+columns, so they only build the elements they return. Relationships are loaded on first
+use, and ``len(model.relationships)`` needs no loading at all.
+
+``prune_to_ids`` drops unneeded elements by id without materializing them, which is what
+makes a narrow ``--modules``/``--prune-to-views`` export over a huge model cheap: only the
+kept systems and the relationships between kept elements are ever built.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .binary_snapshot import KINDS, ModelSnapshot, RelationshipRecord
+from .model import (
+    Container,
+    DeploymentNode,
+    ElementBase,
+    Person,
+    SoftwareSystem,
+)
+from .relationship_store import RelationshipStore
+from .system_landscape import SystemLandscape, normalize_name
+
+_E = TypeVar("_E", bound=ElementBase)
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_PERSON, _SYSTEM, _NODE = (KINDS.index(cls) for cls in (Person, SoftwareSystem, DeploymentNode))
+
+
+class ColumnStore:
+    """Element columns of a snapshot with name, parent and tag indexes.
+
+    Columns are compact ``array``s filled in one pass over the records; indexes are
+    built on first use and only decode the strings they need.
+    """
+
+    def __init__(self, snapshot: ModelSnapshot) -> None:
+        self.snapshot = snapshot
+        self.kind = array("B")
+        self.id = array("I")
+        self.name = array("I")
+        self.tags = array("I")
+        self.parent = array("i")
+        self.end = array("I")
+        for kind, id_, name, _, _, tags, parent, end, _, _ in snapshot.iter_element_rows():
+            self.kind.append(kind)
+            self.id.append(id_)
+            self.name.append(name)
+            self.tags.append(tags)
+            self.parent.append(parent)
+            self.end.append(end)
+        self.roots: List[int] = []
+        i = 0
+        while i < len(self.end):
+            self.roots.append(i)
+            i = self.end[i]
+        self._names: Dict[Tuple[int, bool], Dict[str, List[int]]] = {}
+        self._tags: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def id_of(self, index: int) -> str:
+        return self.snapshot.string(self.id[index]) or ""
+
+    def name_of(self, index: int) -> str:
+        return self.snapshot.string(self.name[index]) or ""
+
+    def roots_of(self, kind: int) -> List[int]:
+        return [i for i in self.roots if self.kind[i] == kind]
+
+    def named(self, kind: int, name: str, *, normalized: bool = False) -> List[int]:
+        """Top-level elements of ``kind`` with this display (or normalized) name."""
+        index = self._names.get((kind, normalized))
+        if index is None:
+            index = self._names[(kind, normalized)] = {}
+            for i in self.roots_of(kind):
+                key = self.name_of(i)
+                index.setdefault(normalize_name(key) if normalized else key, []).append(i)
+        return index.get(name, [])
+
+    def children(self, index: int) -> Iterator[int]:
+        """Direct children, in declaration order."""
+        i = index + 1
+        while i < self.end[index]:
+            yield i
+            i = self.end[i]
+
+    def subtree(self, index: int) -> range:
+        return range(index, self.end[index])
+
+    def with_tag(self, tag: str) -> List[int]:
+        """Indexes of the elements carrying ``tag``, in record order."""
+        if self._tags is None:
+            by_set: Dict[int, List[int]] = {}
+            for i, tagset in enumerate(self.tags):
+                by_set.setdefault(tagset, []).append(i)
+            self._tags = {}
+            for tagset, members in by_set.items():
+                for t in self.snapshot.tags(tagset):
+                    self._tags.setdefault(t, []).extend(members)
+            for members in self._tags.values():
+                members.sort()
+        return self._tags.get(tag, [])
+
+
+class _LazyElements(MutableMapping[str, _E], Generic[_E]):
+    """An element dict (id -> element) whose values are materialized when first read."""
+
+    def __init__(self, snapshot: ModelSnapshot, slots: Iterable[Tuple[str, int]]) -> None:
+        self._snapshot = snapshot
+        self._slots: Dict[str, int] = dict(slots)  # id -> record index; -1 once assigned
+        self._objects: Dict[str, _E] = {}
+
+    def __getitem__(self, key: str) -> _E:
+        found = self._objects.get(key)
+        if found is None:
+            found = self._objects[key] = self._snapshot.element(self._slots[key])  # type: ignore[assignment]
+        return found  # type: ignore[return-value]
+
+    def __setitem__(self, key: str, value: _E) -> None:
+        self._slots[key] = -1
+        self._objects[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._slots[key]
+        self._objects.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def holds(self, key: str, index: int) -> bool:
+        """Whether ``key`` still maps to the element at record ``index``."""
+        return self._slots.get(key) == index
+
+    def built(self) -> Iterable[_E]:
+        """Entries read (or assigned) so far."""
+        return self._objects.values()
+
+    def record_index(self, key: str) -> Optional[int]:
+        """The record behind an entry that has not been read yet, else None."""
+        if key in self._objects:
+            return None
+        return self._slots[key]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (list(self.items()),))
+
+
+class _LazyIndex(Dict[_K, _V]):
+    """A dict whose missing keys are resolved once from the column indexes.
+
+    ``clear()`` forgets the columns too, so rebuilding an index from the stores (as
+    ``reindex_names`` does) leaves only what was rebuilt.
+    """
+
+    def __init__(self, resolve: Callable[[_K], Optional[_V]]) -> None:
+        super().__init__()
+        self._resolve: Optional[Callable[[_K], Optional[_V]]] = resolve
+        self._seen: Set[_K] = set()
+
+    def _load(self, key: _K) -> None:
+        if self._resolve is None or key in self._seen:
+            return
+        self._seen.add(key)
+        if not super().__contains__(key):
+            value = self._resolve(key)
+            if value is not None:
+                super().__setitem__(key, value)
+
+    def __getitem__(self, key: _K) -> _V:
+        self._load(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        self._load(key)  # type: ignore[arg-type]
+        return super().__contains__(key)
+
+    def __delitem__(self, key: _K) -> None:
+        self._load(key)
+        super().__delitem__(key)
+
+    def get(self, key: _K, default: Any = None) -> Any:
+        self._load(key)
+        return super().get(key, default)
+
+    def setdefault(self, key: _K, default: Any = None) -> Any:
+        self._load(key)
+        return super().setdefault(key, default)
+
+    def pop(self, key: _K, *default: Any) -> Any:
+        self._load(key)
+        return super().pop(key, *default)
+
+    def clear(self) -> None:
+        super().clear()
+        self._resolve = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (list(self.items()),))
+
+
+class _PendingRelationships(RelationshipStore):
+    """A relationship store filled from the snapshot on first use.
+
+    The store's internal indexes do not exist until then; touching any of them loads the
+    relationships. ``len`` is answered from the record count alone.
+    """
+
+    def __init__(self, snapshot: ModelSnapshot, records: Optional[Sequence[int]] = None) -> None:
+        # RelationshipStore.__init__ is deferred to the first real use
+        self._snapshot = snapshot
+        self._pending: Optional[Sequence[int]] = (
+            records if records is not None else range(snapshot.relationship_count)
+        )
+
+    @property
+    def pending(self) -> Optional[Sequence[int]]:
+        """Record indexes still to be loaded, or None once the store is filled."""
+        return self.__dict__.get("_pending")
+
+    def __getattr__(self, name: str) -> Any:
+        pending = self.pending
+        if pending is None or not name.startswith("_") or name.startswith("__"):
+            raise AttributeError(name)
+        self._pending = None
+        records = None if pending == range(self._snapshot.relationship_count) else pending
+        self._reset(self._snapshot.relationships(records))
+        return getattr(self, name)
+
+    def __len__(self) -> int:
+        pending = self.pending
+        return len(pending) if pending is not None else super().__len__()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (RelationshipStore, (list(self),))
+
+
+class LazySystemLandscape(SystemLandscape):
+    """A SystemLandscape over a ``ModelSnapshot`` that builds elements only when read.
+
+    Everything the snapshot holds is available through the usual SystemLandscape API.
+    Pickling (and so ``copy``) produces a plain, fully materialized SystemLandscape.
+    """
+
+    def __init__(self, snapshot: ModelSnapshot) -> None:
+        meta = snapshot.meta
+        super().__init__(meta["name"], meta["description"], compact=snapshot.compact)
+        self.store = ColumnStore(snapshot)
+        store = self.store
+
+        def slots(kind: int) -> List[Tuple[str, int]]:
+            return [(store.id_of(i), i) for i in store.roots_of(kind)]
+
+        self.people = _LazyElements(snapshot, slots(_PERSON))  # type: ignore[assignment]
+        self.software_systems = _LazyElements(snapshot, slots(_SYSTEM))  # type: ignore[assignment]
+        self.deployment_nodes = _LazyElements(snapshot, slots(_NODE))  # type: ignore[assignment]
+        self._all_ids.update(store.id_of(i) for i in store.roots)
+        self._people_by_name = _LazyIndex(self._named(_PERSON, False))
+        self._people_by_norm_name = _LazyIndex(self._named(_PERSON, True))
+        self._systems_by_name = _LazyIndex(self._named(_SYSTEM, False))
+        self._systems_by_norm_name = _LazyIndex(self._named(_SYSTEM, True))
+        self._containers_index = _LazyIndex(self._container_named)
+        self._relationships = _PendingRelationships(snapshot)
+        self._relationship_identity = {
+            self._identity(rec) for rec in snapshot.iter_relationship_records()
+        }
+        snapshot.restore_extras(self)
+        self._revision = 0
+        # Tag queries read the snapshot's tag column; the index only holds built elements
+        # tagged since (they report to this model as the snapshot's owner)
+        snapshot.owner = self
+        self._tag_index = {}
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "LazySystemLandscape":
+        """Map a binary snapshot file; call ``close()`` (or use ``with``) when done."""
+        return cls(ModelSnapshot.open(path))
+
+    def close(self) -> None:
+        """Release the snapshot. Elements already built stay valid; nothing more can be read."""
+        self.store.snapshot.close()
+
+    def __enter__(self) -> "LazySystemLandscape":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ----- Index resolution -----
+    def _named(self, kind: int, normalized: bool) -> Callable[[str], Optional[List[Any]]]:
+        elements: Any = self.people if kind == _PERSON else self.software_systems
+        store = self.store
+
+        def resolve(name: str) -> Optional[List[Any]]:
+            # Only records still held by the store: pruned elements are never built
+            found = store.named(kind, name, normalized=normalized)
+            return [
+                store.snapshot.element(i) for i in found if elements.holds(store.id_of(i), i)
+            ] or None
+
+        return resolve
+
+    def _container_named(self, key: Tuple[str, str]) -> Optional[Container]:
+        system = self.find_system(key[0])
+        return None if system is None else system._containers.get(key[1])
+
+    # ----- Queries answered from the columns -----
+    def __iter__(self) -> Iterator[str]:
+        systems: Any = self.software_systems
+        for key in systems:
+            index = systems.record_index(key)
+            yield systems[key].name if index is None else self.store.name_of(index)
+
+    def _tag_bucket(self, tag: str) -> Collection[ElementBase]:
+        found: Dict[int, ElementBase] = {}
+        store = self.store
+        stores: Dict[int, Any] = {
+            _PERSON: self.people,
+            _SYSTEM: self.software_systems,
+            _NODE: self.deployment_nodes,
+        }
+        for i in store.with_tag(tag):
+            root = i
+            while store.parent[root] >= 0:
+                root = store.parent[root]
+            # Elements of dropped roots are never built
+            if stores[store.kind[root]].holds(store.id_of(root), root):
+                el = store.snapshot.element(i)
+                found[id(el)] = el
+        found.update((self._tag_index or {}).get(tag, {}))  # tagged since the snapshot was opened
+        return found.values()
+
+    def _build_tag_index(self) -> None:
+        # Only built elements: the rest are still answered from the tag column
+        self._tag_index = {}
+        stores: Tuple[Any, ...] = (self.people, self.software_systems, self.deployment_nodes)
+        for elements in stores:
+            for root in elements.built():
+                root._owner = self
+                for el in _walk(root):
+                    self._index_tags(el)
+
+    @property
+    def materialized_count(self) -> int:
+        """How many element objects have been built from the snapshot so far."""
+        return self.store.snapshot.materialized_count
+
+    # ----- Pruning -----
+    def prune_to_ids(self, keep_ids: Iterable[str]) -> None:
+        """Drop what ``_prune_model_to_views`` would drop, reading only kept elements.
+
+        Elements whose id (or a descendant's id) is in ``keep_ids`` stay, as do the
+        components of kept containers and every deployment node; people, systems and
+        containers that are not kept are removed, with the relationships touching any
+        element that is not kept.
+        """
+        keep = set(keep_ids)
+        store = self.store
+        stores: List[Any] = [self.people, self.software_systems, self.deployment_nodes]
+        for elements in stores:
+            for key in elements:
+                index = elements.record_index(key)
+                if index is None:
+                    for el in _walk(elements[key]):
+                        if el.id in keep:
+                            keep.update(a.id for a in _ancestors(el))
+                    continue
+                for i in store.subtree(index):
+                    if store.id_of(i) in keep:
+                        p = store.parent[i]
+                        while p >= 0:
+                            keep.add(store.id_of(p))
+                            p = store.parent[p]
+
+        people, systems = stores[0], stores[1]
+        for key in list(systems):
+            index = systems.record_index(key)
+            if index is not None and store.id_of(index) not in keep:
+                del systems[key]  # never read, so not in any resolved index either
+                self._revision += 1
+                continue
+            if index is not None and all(store.id_of(c) in keep for c in store.children(index)):
+                continue
+            system = systems[key]
+            if system.id not in keep:
+                self.remove_software_system(system)
+                continue
+            for c in system.containers:
+                if c.id not in keep:
+                    del system._containers[c.name]
+        for key in list(people):
+            index = people.record_index(key)
+            if index is None:
+                if people[key].id not in keep:
+                    self.remove_person(people[key])
+            elif store.id_of(index) not in keep:
+                del people[key]
+                self._revision += 1
+
+        rels = self._relationships
+        pending = rels.pending if isinstance(rels, _PendingRelationships) else None
+        if pending is not None:
+            snapshot = store.snapshot
+            kept = []
+            identity = set()
+            for n in pending:
+                rec = snapshot.relationship_record(n)
+                if store.id_of(rec.source) in keep and store.id_of(rec.destination) in keep:
+                    kept.append(n)
+                    identity.add(self._identity(rec))
+            self._relationships = _PendingRelationships(snapshot, kept)
+            self._relationship_identity = identity
+            self._revision += 1
+        else:
+            dropped = {
+                id(el): el for r in rels for el in (r.source, r.destination) if el.id not in keep
+            }
+            self.remove_relationships_touching(dropped.values())
+
+    def _identity(self, rec: RelationshipRecord) -> Tuple[str, str, str, Optional[str]]:
+        string = self.store.snapshot.string
+        return (
+            self.store.name_of(rec.source),
+            self.store.name_of(rec.destination),
+            string(rec.description) or "",
+            string(rec.technology),
+        )
+
+    # ----- Materialization -----
+    def materialize(self) -> SystemLandscape:
+        """A plain SystemLandscape holding every element of this model.
+
+        The elements are shared, not copied; the returned model now tracks their tags.
+        """
+        return _plain_landscape(self._plain_state())
+
+    def _plain_state(self) -> Dict[str, Any]:
+        state = self.__getstate__()
+        del state["store"]
+        for key in ("people", "software_systems", "deployment_nodes"):
+            state[key] = dict(state[key].items())
+        state["_relationships"] = RelationshipStore(self._relationships)
+        state["_containers_index"] = {
+            (s.name, c.name): c for s in state["software_systems"].values() for c in s.containers
+        }
+        return state
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_plain_landscape, (self._plain_state(),))
+
+
+def _plain_landscape(state: Dict[str, Any]) -> SystemLandscape:
+    model = SystemLandscape.__new__(SystemLandscape)
+    model.__setstate__(state)
+    for index in (
+        "_people_by_name",
+        "_people_by_norm_name",
+        "_systems_by_name",
+        "_systems_by_norm_name",
+    ):
+        setattr(model, index, {})
+    model.reindex_names()
+    return model
+
+
+def _walk(element: Any) -> Iterator[Any]:
+    yield element
+    for attr in ("containers", "components", "children", "infrastructure_nodes"):
+        for child in getattr(element, attr, ()):
+            yield from _walk(child)
+    yield from getattr(element, "software_system_instances", ())
+    yield from getattr(element, "container_instances", ())
+
+
+def _ancestors(element: Any) -> Iterator[Any]:
+    cur = getattr(element, "parent", None)
+    while cur is not None:
+        yield cur
+        cur = getattr(cur, "parent", None)
+
+
+__all__ = ["ColumnStore", "LazySystemLandscape"]
@@ -1,24 +1,72 @@
 from __future__ import annotations
 
-from collections import OrderedDict
+import sys
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional, Set
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from slugify import slugify
+from .slugs import element_id
 
+if TYPE_CHECKING:
+    from .system_landscape import SystemLandscape
 
-@dataclass
+# Shared intern table for compact elements: equal tag sets map to one frozenset of
+# interned strings, so thousands of elements tagged {"svc"} hold a single object.
+_TAG_SETS: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+
+def intern_tags(tags: Iterable[str]) -> FrozenSet[str]:
+    """Return the shared frozenset for a tag collection."""
+    key = frozenset(sys.intern(t) for t in tags)
+    return _TAG_SETS.setdefault(key, key)
+
+
+@dataclass(slots=True)
 class ElementBase:
+    """Base for all C4 elements.
+
+    Elements are slotted (no per-instance ``__dict__``). With ``compact=True`` the tag
+    set is an interned, shared frozenset; change tags through ``add_tags`` or by
+    assigning ``tags`` rather than mutating the set in place. ``add_tags`` and the nested
+    ``add_*`` helpers report new tags to the landscape owning the top-level element, so
+    its tag queries stay current; after assigning ``tags`` call ``reindex_tags``.
+    """
+
     name: str
     description: str = ""
     technology: Optional[str] = None
-    tags: Set[str] = field(default_factory=set)
+    tags: AbstractSet[str] = field(default_factory=set)
     parent: Optional["ElementBase"] = field(default=None, repr=False)
+    compact: bool = field(default=False, repr=False, compare=False)
     id: str = field(init=False)
+    # Landscape holding this (top-level) element; not part of the element's state
+    _owner: Optional["SystemLandscape"] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        slug = slugify(self.name or "", lowercase=True)
-        self.id = slug or "item"
+        self.id = element_id(self.name)
+        if self.compact:
+            self.tags = intern_tags(self.tags)
+
+    def add_tags(self, tags: Optional[Iterable[str] | str]) -> None:
+        """Merge tags into this element (works for both mutable and interned tag sets)."""
+        new = self._normalize_tags(tags)
+        if not new:
+            return
+        if isinstance(self.tags, set):
+            self.tags.update(new)
+        else:
+            self.tags = intern_tags(set(self.tags) | new)
+        self._tags_changed()
 
     def full_tags(self) -> List[str]:
         return sorted(self.tags)
@@ -31,6 +79,20 @@ class ElementBase:
         # X << Y means Y -> X (source is other, destination is self)
         return (other, self)
 
+    def _tags_changed(self) -> None:
+        """Report this element's tags to the landscape owning its top-level element."""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        if root._owner is not None:
+            root._owner._track_tags(self)
+
+    # Copies and pickles leave the owner behind; their landscape adopts them again
+    def __getstate__(self) -> Any:
+        state: Tuple[None, Dict[str, Any]] = object.__getstate__(self)  # type: ignore[assignment]
+        state[1]["_owner"] = None
+        return state
+
     def _normalize_tags(self, tags: Optional[Iterable[str] | str]) -> Set[str]:
         if tags is None:
             return set()
@@ -42,16 +104,15 @@ class ElementBase:
             return set()
 
 
-@dataclass
+@dataclass(slots=True)
 class Person(ElementBase):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class SoftwareSystem(ElementBase):
-    _containers: "OrderedDict[str, Container]" = field(
-        default_factory=OrderedDict, repr=False, init=False
-    )
+    # Plain dicts keep insertion order and are smaller than OrderedDict
+    _containers: Dict[str, "Container"] = field(default_factory=dict, repr=False, init=False)
 
     @property
     def containers(self) -> List["Container"]:
@@ -72,13 +133,19 @@ class SoftwareSystem(ElementBase):
                 existing.description = description
             if technology and not existing.technology:
                 existing.technology = technology
-            if tag_set:
-                existing.tags.update(tag_set)
+            existing.add_tags(tag_set)
             return existing
         container = Container(
-            name=name, description=description, technology=technology, tags=tag_set, parent=self
+            name=name,
+            description=description,
+            technology=technology,
+            tags=tag_set,
+            parent=self,
+            compact=self.compact,
         )
         self._containers[name] = container
+        if tag_set:
+            container._tags_changed()
         return container
 
     # Operator sugar: system + Container(...) attaches/adopts container (idempotent by name)
@@ -103,12 +170,10 @@ class SoftwareSystem(ElementBase):
         return found
 
 
-@dataclass
+@dataclass(slots=True)
 class Container(ElementBase):
     # Components stored in an OrderedDict keyed by name
-    _components: "OrderedDict[str, Component]" = field(
-        default_factory=OrderedDict, repr=False, init=False
-    )
+    _components: Dict[str, "Component"] = field(default_factory=dict, repr=False, init=False)
 
     @property
     def components(self) -> List["Component"]:
@@ -129,23 +194,29 @@ class Container(ElementBase):
                 existing.description = description
             if technology and not existing.technology:
                 existing.technology = technology
-            if tag_set:
-                existing.tags.update(tag_set)
+            existing.add_tags(tag_set)
             return existing
         comp = Component(
-            name=name, description=description, technology=technology, tags=tag_set, parent=self
+            name=name,
+            description=description,
+            technology=technology,
+            tags=tag_set,
+            parent=self,
+            compact=self.compact,
         )
         self._components[name] = comp
+        if tag_set:
+            comp._tags_changed()
         return comp
 
 
-@dataclass
+@dataclass(slots=True)
 class Component(ElementBase):
     pass
 
 
 # Deployment / Infrastructure
-@dataclass
+@dataclass(slots=True)
 class DeploymentNode(ElementBase):
     children: List["DeploymentNode"] = field(default_factory=list, repr=False)
     infrastructure_nodes: List["InfrastructureNode"] = field(default_factory=list, repr=False)
@@ -167,8 +238,11 @@ class DeploymentNode(ElementBase):
             technology=technology,
             tags=self._normalize_tags(tags),
             parent=self,
+            compact=self.compact,
         )
         self.children.append(node)
+        if node.tags:
+            node._tags_changed()
         return node
 
     def add_infrastructure_node(
@@ -184,8 +258,11 @@ class DeploymentNode(ElementBase):
             technology=technology,
             tags=self._normalize_tags(tags),
             parent=self,
+            compact=self.compact,
         )
         self.infrastructure_nodes.append(infra)
+        if infra.tags:
+            infra._tags_changed()
         return infra
 
     def add_software_system_instance(
@@ -197,10 +274,13 @@ class DeploymentNode(ElementBase):
             technology=software_system.technology,
             tags=set(software_system.tags),
             parent=self,
+            compact=self.compact,
             software_system=software_system,
             instance_tag=instance_tag,
         )
         self.software_system_instances.append(inst)
+        if inst.tags:
+            inst._tags_changed()
         return inst
 
     def add_container_instance(
@@ -212,31 +292,34 @@ class DeploymentNode(ElementBase):
             technology=container.technology,
             tags=set(container.tags),
             parent=self,
+            compact=self.compact,
             container=container,
             instance_tag=instance_tag,
         )
         self.container_instances.append(inst)
+        if inst.tags:
+            inst._tags_changed()
         return inst
 
 
-@dataclass
+@dataclass(slots=True)
 class InfrastructureNode(ElementBase):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class SoftwareSystemInstance(ElementBase):
     software_system: "SoftwareSystem" = field(default=None, repr=False)  # type: ignore[assignment]
     instance_tag: str = "Instance"
 
 
-@dataclass
+@dataclass(slots=True)
 class ContainerInstance(ElementBase):
     container: "Container" = field(default=None, repr=False)  # type: ignore[assignment]
     instance_tag: str = "Instance"
 
 
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     source: ElementBase
     destination: ElementBase
@@ -0,0 +1,243 @@
+"""Adjacency-indexed relationship storage for SystemLandscape.
+
+``RelationshipStore`` behaves like the plain ``list`` of relationships it replaces
+(iteration, ``len``, indexing, ``append``) while also indexing every relationship
+by source, by destination, by (source name, destination name) and by the pair of
+enclosing software systems. Neighbour queries therefore cost time proportional to
+an element's degree instead of the total number of edges.
+
+Elements are keyed by object identity: container ids are only unique within their
+system, so two containers may share an id.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, overload
+
+from .model import ElementBase, Relationship, SoftwareSystem
+
+_Bucket = Dict[int, Relationship]  # insertion sequence -> relationship
+
+
+def enclosing_system(element: ElementBase) -> Optional[SoftwareSystem]:
+    """Return the software system an element lives in (a system encloses itself)."""
+    cur: Optional[ElementBase] = element
+    while cur is not None:
+        if isinstance(cur, SoftwareSystem):
+            return cur
+        cur = cur.parent
+    return None
+
+
+class RelationshipStore(MutableSequence[Relationship]):
+    """Ordered relationship collection with source/destination/system-pair indexes.
+
+    Relationship endpoints must not be reassigned directly while stored; use
+    ``rewire`` so the indexes follow the change. Index queries report relationships
+    in the order they were stored, even if ``insert`` placed them earlier in the list.
+    """
+
+    def __init__(self, relationships: Iterable[Relationship] = ()) -> None:
+        self._reset(relationships)
+
+    # ----- Queries -----
+    def outgoing(self, element: ElementBase) -> List[Relationship]:
+        """Relationships whose source is ``element``, in insertion order."""
+        return list(self._by_source.get(id(element), {}).values())
+
+    def incoming(self, element: ElementBase) -> List[Relationship]:
+        """Relationships whose destination is ``element``, in insertion order."""
+        return list(self._by_destination.get(id(element), {}).values())
+
+    def between(self, a: ElementBase, b: ElementBase) -> List[Relationship]:
+        """Relationships from ``a`` to ``b``.
+
+        For two software systems this includes edges between any of their nested
+        elements; otherwise only direct ``a -> b`` edges are returned.
+        """
+        if isinstance(a, SoftwareSystem) and isinstance(b, SoftwareSystem):
+            return list(self._by_system_pair.get((id(a), id(b)), {}).values())
+        return [r for r in self._by_source.get(id(a), {}).values() if r.destination is b]
+
+    def with_names(self, pairs: Iterable[Tuple[str, str]]) -> List[Relationship]:
+        """Relationships whose (source name, destination name) is in ``pairs``, in order."""
+        found: _Bucket = {}
+        for pair in pairs:
+            found.update(self._by_name_pair.get(pair, {}))
+        return [found[seq] for seq in sorted(found)]
+
+    @property
+    def next_seq(self) -> int:
+        """Insertion sequence the next stored relationship will get."""
+        return self._next_seq
+
+    def stored_since(self, seq: int) -> List[Relationship]:
+        """Relationships still stored whose insertion sequence is ``seq`` or later, in order."""
+        added = self._next_seq - seq
+        if added <= 0:
+            return []
+        tail = self._items[-added:]
+        if len(tail) == added and all(self._seq_of[id(r)] >= seq for r in tail):
+            return tail  # appended, the common case
+        return sorted(
+            (r for r in self._items if self._seq_of[id(r)] >= seq),
+            key=lambda r: self._seq_of[id(r)],
+        )
+
+    # ----- Bulk updates -----
+    def rewire(self, old: ElementBase, new: ElementBase) -> List[Relationship]:
+        """Point every relationship touching ``old`` at ``new``; return the changed ones."""
+        touched = dict(self._by_source.get(id(old), {}))
+        touched.update(self._by_destination.get(id(old), {}))
+        changed = [touched[seq] for seq in sorted(touched)]
+        for seq in sorted(touched):
+            rel = touched[seq]
+            self._unindex(seq, rel)
+            if rel.source is old:
+                rel.source = new
+            if rel.destination is old:
+                rel.destination = new
+            self._index(seq, rel)
+        return changed
+
+    def discard_touching(self, elements: Iterable[ElementBase]) -> List[Relationship]:
+        """Remove every relationship with an endpoint in ``elements``; return the removed ones."""
+        doomed: _Bucket = {}
+        for element in elements:
+            doomed.update(self._by_source.get(id(element), {}))
+            doomed.update(self._by_destination.get(id(element), {}))
+        if doomed:
+            for rel in doomed.values():
+                self._forget(rel)
+            self._items[:] = [r for r in self._items if id(r) in self._seq_of]
+        return [doomed[seq] for seq in sorted(doomed)]
+
+    # ----- MutableSequence protocol -----
+    def append(self, value: Relationship) -> None:
+        self._remember(value)
+        self._items.append(value)
+
+    def insert(self, index: int, value: Relationship) -> None:
+        self._remember(value)
+        self._items.insert(index, value)
+
+    def remove(self, value: Relationship) -> None:
+        # Membership is by identity (like ``in``), never by equality
+        if id(value) not in self._seq_of:
+            raise ValueError("Relationship is not stored")
+        position = next(i for i, rel in enumerate(self._items) if rel is value)
+        del self._items[position]
+        self._forget(value)
+
+    def pop(self, index: int = -1) -> Relationship:
+        rel = self._items.pop(index)
+        self._forget(rel)
+        return rel
+
+    @overload
+    def __getitem__(self, index: int) -> Relationship: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Relationship]: ...
+    def __getitem__(self, index: Union[int, slice]) -> Union[Relationship, List[Relationship]]:
+        return self._items[index]
+
+    @overload
+    def __setitem__(self, index: int, value: Relationship) -> None: ...
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Relationship]) -> None: ...
+    def __setitem__(self, index, value) -> None:  # type: ignore[no-untyped-def]
+        old = self._items[index] if isinstance(index, slice) else [self._items[index]]
+        new = list(value) if isinstance(index, slice) else [value]
+        replaced = {id(rel) for rel in old}
+        seen: Set[int] = set()
+        for rel in new:
+            if id(rel) in seen or (id(rel) in self._seq_of and id(rel) not in replaced):
+                raise ValueError("Relationship is already stored")
+            seen.add(id(rel))
+        self._items[index] = new if isinstance(index, slice) else new[0]
+        for rel in old:
+            self._forget(rel)
+        for rel in new:
+            self._remember(rel)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        doomed = self._items[index] if isinstance(index, slice) else [self._items[index]]
+        del self._items[index]
+        for rel in doomed:
+            self._forget(rel)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Relationship]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[Relationship]:
+        return reversed(self._items)
+
+    def __contains__(self, value: object) -> bool:
+        return id(value) in self._seq_of
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (RelationshipStore, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"RelationshipStore({list(self._items)!r})"
+
+    # Indexes are keyed by object identity, so copies and pickles rebuild them
+    def __getstate__(self) -> List[Relationship]:
+        return list(self._items)
+
+    def __setstate__(self, state: List[Relationship]) -> None:
+        self._reset(state)
+
+    # ----- Internals -----
+    def _reset(self, relationships: Iterable[Relationship]) -> None:
+        self._items: List[Relationship] = []
+        self._seq_of: Dict[int, int] = {}  # id(relationship) -> insertion sequence
+        self._next_seq = 0
+        self._by_source: Dict[int, _Bucket] = {}
+        self._by_destination: Dict[int, _Bucket] = {}
+        self._by_name_pair: Dict[Tuple[str, str], _Bucket] = {}
+        self._by_system_pair: Dict[Tuple[int, int], _Bucket] = {}
+        for rel in relationships:
+            self.append(rel)
+
+    def _remember(self, rel: Relationship) -> None:
+        if id(rel) in self._seq_of:
+            raise ValueError("Relationship is already stored")
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq_of[id(rel)] = seq
+        self._index(seq, rel)
+
+    def _forget(self, rel: Relationship) -> None:
+        self._unindex(self._seq_of.pop(id(rel)), rel)
+
+    def _keys(self, rel: Relationship) -> Iterator[Tuple[Dict[Any, _Bucket], object]]:
+        yield self._by_source, id(rel.source)
+        yield self._by_destination, id(rel.destination)
+        yield self._by_name_pair, (rel.source.name, rel.destination.name)
+        src_sys = enclosing_system(rel.source)
+        dst_sys = enclosing_system(rel.destination)
+        if src_sys is not None and dst_sys is not None:
+            yield self._by_system_pair, (id(src_sys), id(dst_sys))
+
+    def _index(self, seq: int, rel: Relationship) -> None:
+        for index, key in self._keys(rel):
+            index.setdefault(key, {})[seq] = rel
+
+    def _unindex(self, seq: int, rel: Relationship) -> None:
+        for index, key in self._keys(rel):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket.pop(seq, None)
+            if not bucket:
+                del index[key]
+
+
+__all__ = ["RelationshipStore", "enclosing_system"]
@@ -0,0 +1,59 @@
+"""Shared, bounded slug cache for element names.
+
+python-slugify's Unicode normalisation dominates element construction on large
+models, and the same names recur across overlays, derived projects and
+``replace_container``. Element ids are therefore computed through one LRU so
+repeated builds reuse earlier results. The exporters' sort keys are a plain
+``str.lower``/``replace`` and are not cached, so they never evict ids.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from slugify import slugify
+
+SLUG_CACHE_SIZE = 16384
+
+
+class SlugCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@lru_cache(maxsize=SLUG_CACHE_SIZE)
+def _element_id(name: str) -> str:
+    return slugify(name, lowercase=True) or "item"
+
+
+def element_id(name: str) -> str:
+    """Base id for an element name ('Payments API' -> 'payments-api'; empty -> 'item')."""
+    return _element_id(name or "")
+
+
+def sort_slug(name: str) -> str:
+    """Ordering key for element names used by the exporters."""
+    return (name or "").lower().replace(" ", "_")
+
+
+def slug_cache_info() -> SlugCacheInfo:
+    """Hit/miss counters and size of the element id cache."""
+    info = _element_id.cache_info()
+    return SlugCacheInfo(info.hits, info.misses, SLUG_CACHE_SIZE, info.currsize)
+
+
+def clear_slug_cache() -> None:
+    _element_id.cache_clear()
+
+
+__all__ = [
+    "SLUG_CACHE_SIZE",
+    "SlugCacheInfo",
+    "element_id",
+    "sort_slug",
+    "slug_cache_info",
+    "clear_slug_cache",
+]
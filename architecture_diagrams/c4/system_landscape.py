@@ -6,6 +6,7 @@ from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import (
     Any,
+    Collection,
     Dict,
     Iterable,
     Iterator,
@@ -14,12 +15,22 @@ from typing import (
     Sequence,
     Set,
     Tuple,
+    TypeVar,
     Union,
     cast,
     overload,
 )
 
-from .model import Container, DeploymentNode, ElementBase, Person, Relationship, SoftwareSystem
+from .model import (
+    Component,
+    Container,
+    DeploymentNode,
+    ElementBase,
+    Person,
+    Relationship,
+    SoftwareSystem,
+)
+from .relationship_store import RelationshipStore
 from .styles import Styles
 from .views import (
     ComponentView,
@@ -33,10 +44,18 @@ from .views import (
 # Type aliases for readability
 AllowedPairs = Set[tuple[str, str]]
 RelationshipIdent = tuple[str, str, str, Optional[str]]
+_E = TypeVar("_E", bound=ElementBase)
+NameIndex = Dict[str, List[_E]]
+TagIndex = Dict[str, Dict[int, ElementBase]]
 
 # _SLSystemProxy removed; SystemLandscape.__getitem__ now returns SoftwareSystem directly.
 
 
+def normalize_name(name: str) -> str:
+    """Slug-style name used for lenient matching ('Payments API' == 'payments_api')."""
+    return name.strip().lower().replace("_", "-").replace(" ", "-")
+
+
 class SystemLandscape:
     """Unified architectural model + registry semantics.
 
@@ -45,16 +64,18 @@ class SystemLandscape:
     public API; all callers should use SystemLandscape directly.
     """
 
-    def __init__(self, name: str, description: str = "") -> None:
+    def __init__(self, name: str, description: str = "", *, compact: bool = False) -> None:
         # Core metadata
         self.name = name
         self.description = description
+        # Compact mode: elements share interned tag sets (see ElementBase)
+        self.compact = compact
         # Element stores
         self.people: Dict[str, Person] = {}
         self.software_systems: Dict[str, SoftwareSystem] = {}
         self.groups: Dict[str, List[SoftwareSystem]] = {}
         self.deployment_nodes: Dict[str, DeploymentNode] = {}
-        self.relationships: List[Relationship] = []
+        self._relationships = RelationshipStore()
         self.views: List[
             SystemLandscapeView | SystemContextView | ContainerView | ComponentView | DeploymentView
         ] = []
@@ -66,25 +87,62 @@ class SystemLandscape:
         self._relationship_identity: Set[tuple[str, str, str, Optional[str]]] = set()
         # Registry style container index
         self._containers_index: Dict[tuple[str, str], Container] = {}
+        # Name indexes: display name / normalized name -> elements in registration order
+        self._systems_by_name: NameIndex[SoftwareSystem] = {}
+        self._people_by_name: NameIndex[Person] = {}
+        self._systems_by_norm_name: NameIndex[SoftwareSystem] = {}
+        self._people_by_norm_name: NameIndex[Person] = {}
+        # Tag index: tag -> elements carrying it, keyed by identity (container ids are not
+        # unique). Built on the first query, then kept current by _track_tags; entries are
+        # checked on read
+        self._tag_index: Optional[TagIndex] = None
+        # Bumped by structural changes made through the landscape (see ``revision``)
+        self._revision = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The tag index is keyed by object identity; copies rebuild it when first queried
+        state = dict(self.__dict__)
+        state["_tag_index"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        for store in (self.people, self.software_systems, self.deployment_nodes):
+            for el in store.values():
+                el._owner = self
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped whenever elements or relationships change through the landscape.
+
+        Tags added to elements (``add_tags``, nested ``add_*`` helpers) count too. Adding
+        views does not. Other edits made directly on elements or the element dicts bypass
+        it; callers caching lookups (e.g. ``SelectorCache``) also watch store sizes.
+        """
+        return self._revision
 
     # ----- Element creation helpers -----
     def add_person(self, name: str, description: str = "", **kwargs: Any) -> Person:
         tags = self._normalize_tags(kwargs.get("tags"))
-        p = Person(name=name, description=description, tags=tags)
+        p = Person(name=name, description=description, tags=tags, compact=self.compact)
         self._register(p)
         self.people[p.id] = p
+        self._index_name(p, self._people_by_name, self._people_by_norm_name)
+        if p.tags:
+            self._track_tags(p)
         return p
 
     def add_software_system(
         self, name: str, description: str = "", **kwargs: Any
     ) -> SoftwareSystem:
-        existing = next((s for s in self.software_systems.values() if s.name == name), None)
+        existing = self.find_system(name)
         if existing:
             if description and not existing.description:
                 existing.description = description
             if kwargs.get("technology") and not existing.technology:
                 existing.technology = kwargs.get("technology")
-            existing.tags.update(self._normalize_tags(kwargs.get("tags")))
+            existing.add_tags(kwargs.get("tags"))
+            self._revision += 1
             # Ensure index refreshed
             for c in existing.containers:
                 self._containers_index[(existing.name, c.name)] = c
@@ -94,11 +152,15 @@ class SystemLandscape:
             description=description,
             technology=kwargs.get("technology"),
             tags=self._normalize_tags(kwargs.get("tags")),
+            compact=self.compact,
         )
         self._register(s)
         self.software_systems[s.id] = s
+        self._index_name(s, self._systems_by_name, self._systems_by_norm_name)
         for c in s.containers:
             self._containers_index[(s.name, c.name)] = c
+        if s.tags:
+            self._track_tags(s)
         return s
 
     def assign_group(self, group_name: str, system: SoftwareSystem):
@@ -124,11 +186,28 @@ class SystemLandscape:
             description=description,
             technology=kwargs.get("technology"),
             tags=self._normalize_tags(kwargs.get("tags")),
+            compact=self.compact,
         )
         self._register(node)
         self.deployment_nodes[node.id] = node
+        if node.tags:
+            self._track_tags(node)
         return node
 
+    @property
+    def relationships(self) -> RelationshipStore:
+        """All relationships; a list-like store indexed by source, destination and system pair."""
+        return self._relationships
+
+    @relationships.setter
+    def relationships(self, value: Iterable[Relationship]) -> None:
+        self._relationships = RelationshipStore(value)
+        self._revision += 1
+        self._relationship_identity = {
+            (r.source.name, r.destination.name, r.description, r.technology)
+            for r in self._relationships
+        }
+
     def add_relationship(
         self,
         source: ElementBase,
@@ -139,8 +218,8 @@ class SystemLandscape:
     ) -> Relationship:
         ident = (source.name, destination.name, description, technology)
         if ident in self._relationship_identity:
-            for r in reversed(self.relationships):
-                if (r.source.name, r.destination.name, r.description, r.technology) == ident:
+            for r in reversed(self._relationships.with_names([ident[:2]])):
+                if (r.description, r.technology) == ident[2:]:
                     return r
         rel = Relationship(
             source=source,
@@ -151,8 +230,22 @@ class SystemLandscape:
         )
         self.relationships.append(rel)
         self._relationship_identity.add(ident)
+        self._revision += 1
         return rel
 
+    def remove_relationships_touching(self, elements: Iterable[ElementBase]) -> int:
+        """Remove relationships with an endpoint in ``elements``; return how many were removed."""
+        removed = self._relationships.discard_touching(elements)
+        self._revision += 1
+        for rel in removed:
+            ident = (rel.source.name, rel.destination.name, rel.description, rel.technology)
+            if not any(
+                (r.description, r.technology) == ident[2:]
+                for r in self._relationships.with_names([ident[:2]])
+            ):
+                self._relationship_identity.discard(ident)
+        return len(removed)
+
     # ----- Relationship filtering -----
     def restrict_relationships_to(self, allowed_pairs: AllowedPairs):
         self._allowed_relationship_pairs = {(s, d) for s, d in allowed_pairs}
@@ -176,8 +269,7 @@ class SystemLandscape:
     def get_effective_relationships(self) -> Iterable[Relationship]:  # type: ignore[override]
         if self._allowed_relationship_pairs is None:
             return list(self.relationships)
-        allowed = self._allowed_relationship_pairs
-        return [r for r in self.relationships if (r.source.name, r.destination.name) in allowed]
+        return self._relationships.with_names(self._allowed_relationship_pairs)
 
     def add_container(
         self,
@@ -190,6 +282,7 @@ class SystemLandscape:
         system = self.get_system(system_name)
         c = system.add_container(name, description, technology, tags)
         self._containers_index[(system.name, c.name)] = c
+        self._revision += 1
         return c
 
     # ----- Views -----
@@ -293,6 +386,7 @@ class SystemLandscape:
 
     # ----- ID registration -----
     def _register(self, element: ElementBase):
+        element._owner = self
         base_id = element.id
         if base_id in self._all_ids:
             i = 2
@@ -300,6 +394,7 @@ class SystemLandscape:
                 i += 1
             element.id = f"{base_id}-{i}"
         self._all_ids.add(element.id)
+        self._revision += 1
 
     # ----- Iteration over all elements -----
     def iter_elements(
@@ -349,8 +444,92 @@ class SystemLandscape:
                     yield comp
 
     # ----- Registry-style accessors -----
+    def find_system(self, name: str, *, normalized: bool = False) -> Optional[SoftwareSystem]:
+        """Return the software system with this name, or None.
+
+        With ``normalized=True`` the name is matched slug-style (see ``normalize_name``).
+        """
+        if normalized:
+            return self._lookup(
+                self._systems_by_norm_name, normalize_name(name), self.software_systems
+            )
+        return self._lookup(self._systems_by_name, name, self.software_systems)
+
+    def find_person(self, name: str, *, normalized: bool = False) -> Optional[Person]:
+        """Return the first person registered with this name, or None."""
+        if normalized:
+            return self._lookup(self._people_by_norm_name, normalize_name(name), self.people)
+        return self._lookup(self._people_by_name, name, self.people)
+
+    def remove_software_system(self, system: SoftwareSystem) -> None:
+        """Drop a software system (and its containers) from the stores and indexes."""
+        if self.software_systems.get(system.id) is not system:
+            return
+        del self.software_systems[system.id]
+        self._revision += 1
+        self._unindex_name(system, self._systems_by_name, self._systems_by_norm_name)
+        for c in system.containers:
+            if self._containers_index.get((system.name, c.name)) is c:
+                del self._containers_index[(system.name, c.name)]
+
+    def remove_person(self, person: Person) -> None:
+        """Drop a person from the store and name indexes."""
+        if self.people.get(person.id) is not person:
+            return
+        del self.people[person.id]
+        self._revision += 1
+        self._unindex_name(person, self._people_by_name, self._people_by_norm_name)
+
+    def reindex_names(self) -> None:
+        """Rebuild the name indexes after the element dicts were modified directly."""
+        for index in (
+            self._systems_by_name,
+            self._people_by_name,
+            self._systems_by_norm_name,
+            self._people_by_norm_name,
+        ):
+            index.clear()
+        self._revision += 1
+        for s in self.software_systems.values():
+            self._index_name(s, self._systems_by_name, self._systems_by_norm_name)
+        for p in self.people.values():
+            self._index_name(p, self._people_by_name, self._people_by_norm_name)
+
+    # ----- Tag queries -----
+    def elements_with_tag(self, tag: str) -> List[ElementBase]:
+        """Elements carrying ``tag``, from the tag index (cost follows the number of matches)."""
+        return [el for el in self._tag_bucket(tag) if tag in el.tags and self._holds(el)]
+
+    def elements_with_all(self, tags: Optional[Iterable[str] | str]) -> List[ElementBase]:
+        """Elements carrying every tag in ``tags`` (none for an empty selection)."""
+        wanted = self._normalize_tags(tags)
+        if not wanted:
+            return []
+        smallest = min((self._tag_bucket(t) for t in wanted), key=len)
+        return [el for el in smallest if wanted <= el.tags and self._holds(el)]
+
+    def elements_with_any(self, tags: Optional[Iterable[str] | str]) -> List[ElementBase]:
+        """Elements carrying at least one tag in ``tags``, grouped by tag in sorted order."""
+        seen: Set[int] = set()
+        found: List[ElementBase] = []
+        for tag in sorted(self._normalize_tags(tags)):
+            for el in self.elements_with_tag(tag):
+                if id(el) not in seen:
+                    seen.add(id(el))
+                    found.append(el)
+        return found
+
+    def reindex_tags(self) -> None:
+        """Rebuild the tag index, e.g. after assigning ``tags`` on elements directly.
+
+        Top-level elements put into the element dicts directly are adopted, so their later
+        ``add_tags`` calls are tracked.
+        """
+        self._build_tag_index()
+        self._revision += 1
+
     def get_system(self, name: str) -> SoftwareSystem:  # name-based (not slug) retrieval
-        existing = next((s for s in self.software_systems.values() if s.name == name), None)
+        existing = self.find_system(name)
         if not existing:
             raise ValueError(f"Expected software system '{name}' to be defined before access")
         return existing
@@ -374,7 +553,7 @@ class SystemLandscape:
 
         Mirrors get_system semantics for consistency with previous helper style.
         """
-        existing = next((p for p in self.people.values() if p.name == name), None)
+        existing = self.find_person(name)
         if not existing:
             raise ValueError(f"Expected person '{name}' to be defined before access")
         return existing
@@ -411,7 +590,7 @@ class SystemLandscape:
             parts = key.split("/", 1)
             if len(parts) == 2:
                 return (parts[0], parts[1]) in self._containers_index
-        return any(s.name == key for s in self.software_systems.values())
+        return self.find_system(key) is not None
 
     def __iter__(self) -> Iterator[str]:  # pragma: no cover
         return (s.name for s in self.software_systems.values())
@@ -437,7 +616,7 @@ class SystemLandscape:
             return self.__lshift__(other)
         if isinstance(other, Person):
             # Idempotent person registration by name
-            if not any(p.name == other.name for p in self.people.values()):
+            if self.find_person(other.name) is None:
                 self.add_person(other.name, other.description, tags=other.tags)
             return self
         raise TypeError(
@@ -536,6 +715,7 @@ class SystemLandscape:
         remove_old: bool = True,
     ) -> "SystemLandscape.ReplaceResult":
         system = self.get_system(system_name)
+        self._revision += 1
         before = any(c.name == new_name for c in system.containers)
         new_c = system.add_container(new_name, description, technology, tags=tag_new or [])
         self._containers_index[(system.name, new_c.name)] = new_c
@@ -544,7 +724,7 @@ class SystemLandscape:
         except Exception:
             old_c = None
         if old_c is not None and tag_old:
-            old_c.tags.update(self._normalize_tags(tag_old))
+            old_c.add_tags(tag_old)
         rewired = 0
         if old_c is not None and old_c is not new_c:
             rewired = self._rewire_container_in_relationships(old_c, new_c)
@@ -581,37 +761,94 @@ class SystemLandscape:
         except Exception:
             return set()
 
+    @staticmethod
+    def _index_name(element: _E, by_name: NameIndex[_E], by_norm_name: NameIndex[_E]) -> None:
+        by_name.setdefault(element.name, []).append(element)
+        by_norm_name.setdefault(normalize_name(element.name), []).append(element)
+
+    @staticmethod
+    def _unindex_name(element: _E, by_name: NameIndex[_E], by_norm_name: NameIndex[_E]) -> None:
+        for index, key in ((by_name, element.name), (by_norm_name, normalize_name(element.name))):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket[:] = [e for e in bucket if e is not element]
+            if not bucket:
+                del index[key]
+
+    @staticmethod
+    def _lookup(index: NameIndex[_E], key: str, store: Dict[str, _E]) -> Optional[_E]:
+        # Entries whose element has since left the store (e.g. popped directly) are skipped
+        for element in index.get(key, ()):
+            found = store.get(element.id)
+            if found is element:
+                return found
+        return None
+
+    def _tag_bucket(self, tag: str) -> Collection[ElementBase]:
+        """Indexed elements for ``tag`` (a superset: callers check tags and membership)."""
+        if self._tag_index is None:
+            self._build_tag_index()
+        assert self._tag_index is not None
+        return self._tag_index.get(tag, {}).values()
+
+    def _build_tag_index(self) -> None:
+        self._tag_index = {}
+        for el in self.iter_elements():
+            if el.parent is None:
+                el._owner = self
+            self._index_tags(el)
+
+    def _track_tags(self, element: ElementBase) -> None:
+        """Index ``element``'s tags; elements call this when they or their children gain tags."""
+        self._revision += 1
+        if self._tag_index is not None:
+            self._index_tags(element)
+
+    def _index_tags(self, element: ElementBase) -> None:
+        index = self._tag_index
+        assert index is not None
+        for tag in element.tags:
+            index.setdefault(tag, {})[id(element)] = element
+
+    def _holds(self, element: ElementBase) -> bool:
+        """Whether ``element`` is still reachable from the element stores."""
+        cur = element
+        while cur.parent is not None:
+            parent = cur.parent
+            if isinstance(cur, Container):
+                if cast(SoftwareSystem, parent)._containers.get(cur.name) is not cur:
+                    return False
+            elif isinstance(cur, Component):
+                if cast(Container, parent)._components.get(cur.name) is not cur:
+                    return False
+            cur = parent
+        store: Dict[str, Any]
+        if isinstance(cur, Person):
+            store = self.people
+        elif isinstance(cur, SoftwareSystem):
+            store = self.software_systems
+        else:
+            store = self.deployment_nodes
+        return store.get(cur.id) is cur
+
     def _refresh_container_index_for(self, system: SoftwareSystem) -> None:  # pragma: no cover
         for c in system.containers:
             self._containers_index[(system.name, c.name)] = c
 
     def _rewire_container_in_relationships(self, old_c: Container, new_c: Container) -> int:
         """Rewire relationships from old_c to new_c and update identity set; return count."""
-        updated_identities: list[tuple[RelationshipIdent, RelationshipIdent]] = []
-        rewired = 0
-        for rel in self.relationships:
-            old_ident = (rel.source.name, rel.destination.name, rel.description, rel.technology)
-            changed = False
-            if rel.source is old_c:
-                rel.source = new_c
-                changed = True
-            if rel.destination is old_c:
-                rel.destination = new_c
-                changed = True
-            if changed:
-                rewired += 1
-                new_ident = (
-                    rel.source.name,
-                    rel.destination.name,
-                    rel.description,
-                    rel.technology,
-                )
-                updated_identities.append((old_ident, new_ident))
-        for old_ident, new_ident in updated_identities:
-            if old_ident in self._relationship_identity:
-                self._relationship_identity.discard(old_ident)
-            self._relationship_identity.add(new_ident)
-        return rewired
-
-
-__all__ = ["SystemLandscape"]
+        touched = self._relationships.incoming(old_c) + self._relationships.outgoing(old_c)
+        old_identities = {
+            (r.source.name, r.destination.name, r.description, r.technology) for r in touched
+        }
+        rewired = self._relationships.rewire(old_c, new_c)
+        self._relationship_identity -= old_identities
+        for rel in rewired:
+            self._relationship_identity.add(
+                (rel.source.name, rel.destination.name, rel.description, rel.technology)
+            )
+        return len(rewired)
+
+
+__all__ = ["SystemLandscape", "normalize_name"]
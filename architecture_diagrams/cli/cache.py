@@ -0,0 +1,94 @@
+import time
+from pathlib import Path
+
+import click
+
+from architecture_diagrams.orchestrator.cache import (
+    DEFAULT_MAX_AGE,
+    DEFAULT_MAX_BYTES,
+    CacheManager,
+    parse_age,
+    parse_size,
+)
+
+_cache_dir_option = click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Cache directory (default: .arch_diags_cache at the repository root)",
+)
+
+
+def _manager(cache_dir: str | None) -> CacheManager:
+    return CacheManager(Path(cache_dir) if cache_dir else None)
+
+
+def _human(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _ago(ts: float | None) -> str:
+    if ts is None:
+        return "-"
+    secs = max(0.0, time.time() - ts)
+    for unit, span in (("d", 86400), ("h", 3600), ("m", 60)):
+        if secs >= span:
+            return f"{secs / span:.1f}{unit} ago"
+    return f"{secs:.0f}s ago"
+
+
+@click.group()
+def cache() -> None:
+    """Inspect and bound the build output cache (--enable-cache)."""
+    pass
+
+
+@cache.command()
+@_cache_dir_option
+def stats(cache_dir: str | None) -> None:
+    """Show entry counts, total size and access ages."""
+    manager = _manager(cache_dir)
+    s = manager.stats()
+    click.echo(f"directory:     {manager.cache_dir}")
+    click.echo(f"entries:       {s.entries} ({s.outputs} outputs, {s.snapshots} model snapshots)")
+    click.echo(f"size:          {_human(s.total_bytes)}")
+    click.echo(f"oldest access: {_ago(s.oldest_access)}")
+    click.echo(f"newest access: {_ago(s.newest_access)}")
+
+
+@cache.command()
+@_cache_dir_option
+@click.option(
+    "--max-size",
+    default=None,
+    help=f"Evict least recently used entries above this size, e.g. 500M "
+    f"[default={DEFAULT_MAX_BYTES // 1024**2}M]",
+)
+@click.option(
+    "--max-age",
+    default=None,
+    help=f"Evict entries not used for this long, e.g. 7d, 12h "
+    f"[default={DEFAULT_MAX_AGE / 86400:.0f}d]",
+)
+def prune(cache_dir: str | None, max_size: str | None, max_age: str | None) -> None:
+    """Evict stale and least recently used entries."""
+    try:
+        max_bytes = parse_size(max_size) if max_size else None
+        age = parse_age(max_age) if max_age else None
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    r = _manager(cache_dir).prune(max_bytes=max_bytes, max_age=age)
+    click.echo(f"Removed {r.removed} entries ({_human(r.freed_bytes)})")
+
+
+@cache.command()
+@_cache_dir_option
+def clear(cache_dir: str | None) -> None:
+    """Remove all cached outputs, model snapshots and discovery metadata."""
+    r = _manager(cache_dir).clear()
+    click.echo(f"Removed {r.removed} files ({_human(r.freed_bytes)})")
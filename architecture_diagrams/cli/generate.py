@@ -1,15 +1,23 @@
 import logging
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
 
-from architecture_diagrams.orchestrator.build import build_workspace
+# The build machinery (pystructurizr, exporters, plugins) is imported where it is used,
+# so a running `serve` daemon can answer without paying for it
+from architecture_diagrams.orchestrator.daemon import DaemonError, request
+
+if TYPE_CHECKING:
+    from architecture_diagrams.orchestrator.watch import WatchSession
 
 
 @click.command()
 @click.option(
-    "--output", default="workspace.dsl", help="Output DSL filename [default=workspace.dsl]"
+    "--output",
+    default="workspace.dsl",
+    help="Output DSL filename, or - for stdout [default=workspace.dsl]",
 )
 @click.option(
     "--project", default="banking", help="Project key under projects/* (default: banking)"
@@ -34,7 +42,9 @@ from architecture_diagrams.orchestrator.build import build_workspace
     help="Prune model to elements reachable from selected views",
 )
 @click.option(
-    "--exporter", default="structurizr", help="Exporter to use: structurizr (default) or json"
+    "--exporter",
+    default="structurizr",
+    help="Exporter to use: structurizr (default), structurizr-json or json",
 )
 @click.option(
     "--tagging",
@@ -52,6 +62,45 @@ from architecture_diagrams.orchestrator.build import build_workspace
 @click.option(
     "--enable-cache/--no-cache", default=False, help="Enable output caching based on inputs"
 )
+@click.option(
+    "--model-snapshot",
+    "model_snapshot",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Read the model from this binary snapshot (c4.binary_snapshot) instead of running the model builders",
+)
+@click.option(
+    "--plan",
+    "plan_path",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="TOML batch plan: compose once, write every [[targets]] entry (ignores selection options)",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=int,
+    help="With --plan, build targets in this many worker processes (default: 1)",
+)
+@click.option(
+    "--view-workers",
+    default=None,
+    type=int,
+    help="Build and render the views of Structurizr outputs in this many worker processes (default: 1)",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running and regenerate the output whenever models/, views/ or project.toml change",
+)
+@click.option(
+    "--poll-interval",
+    default=0.2,  # watch.DEFAULT_POLL_INTERVAL, not imported to keep startup light
+    type=float,
+    show_default=True,
+    help="With --watch, seconds between file change checks",
+)
 @click.option(
     "--verbose", is_flag=True, default=False, help="Enable verbose logging for troubleshooting"
 )
@@ -68,6 +117,12 @@ def generate(
     view_generator: str | None,
     view_generator_config: str | None,
     enable_cache: bool,
+    model_snapshot: str | None,
+    plan_path: str | None,
+    workers: int | None,
+    view_workers: int | None,
+    watch: bool,
+    poll_interval: float,
     verbose: bool,
 ) -> None:
     """Generate a workspace.dsl from composed models and independent views."""
@@ -83,6 +138,24 @@ def generate(
     workspace_name = project if project else "banking"
     pp = Path(project_path) if project_path else None
     tag_strategies = [t.strip() for t in tagging.split(",")] if tagging else []
+    snapshot = Path(model_snapshot) if model_snapshot else None
+    if snapshot is not None and tag_strategies:
+        log.error("--tagging applies while composing; a --model-snapshot is already tagged")
+        sys.exit(2)
+    if plan_path:
+        _generate_plan(
+            Path(plan_path),
+            project=project,
+            project_path=pp,
+            tagging=tag_strategies,
+            enable_cache=enable_cache,
+            workers=workers,
+            view_workers=view_workers,
+            model_snapshot=snapshot,
+            verbose=verbose,
+            log=log,
+        )
+        return
     try:
         log.debug(
             "Generating DSL with params: output=%s, project=%s, project_path=%s, views=%s, tags=%s, modules=%s, prune_to_views=%s",
@@ -102,20 +175,67 @@ def generate(
                 vg_cfg = _json.loads(view_generator_config)
             except Exception:
                 log.warning("Invalid JSON passed to --view-generator-config; ignoring")
-        dsl = build_workspace(
-            project=project,
-            project_path=pp,
-            workspace_name=workspace_name,
+        selection: dict[str, Any] = dict(
             select_names=names,
             select_tags=tags,
             select_modules=modules,
             prune_to_views=prune_to_views,
             exporter=exporter,
-            tagging=tag_strategies,
             view_generator=view_generator,
             view_generator_config=vg_cfg,
-            enable_cache=enable_cache,
         )
+        to_stdout = output == "-"
+        if watch:
+            if to_stdout:
+                log.error("--watch needs an output file, not stdout")
+                sys.exit(2)
+            if snapshot is not None:
+                log.error("--watch rebuilds from the model sources; drop --model-snapshot")
+                sys.exit(2)
+            from architecture_diagrams.orchestrator.build import BuildTarget
+            from architecture_diagrams.orchestrator.watch import WatchSession
+
+            session = WatchSession(
+                Path(output),
+                BuildTarget(**selection),
+                project=project,
+                project_path=pp,
+                workspace_name=workspace_name,
+                tagging=tag_strategies,
+                enable_cache=enable_cache,
+                view_workers=view_workers or 1,
+            )
+            _watch(session, poll_interval, log)
+            return
+        # A running `serve` daemon answers from its warm model; otherwise build here
+        dsl = (
+            _daemon_generate(
+                project=project,
+                project_path=str(pp.resolve()) if pp else None,
+                workspace_name=workspace_name,
+                tagging=tag_strategies,
+                enable_cache=enable_cache,
+                view_workers=view_workers or 1,
+                **selection,
+            )
+            if snapshot is None
+            else None
+        )
+        if dsl is None:
+            from architecture_diagrams.orchestrator.build import build_workspace
+
+            dsl = build_workspace(
+                project=project,
+                project_path=pp,
+                workspace_name=workspace_name,
+                tagging=tag_strategies,
+                enable_cache=enable_cache,
+                view_workers=view_workers or 1,
+                # Streamed as it is exported rather than built as one string
+                stream=sys.stdout if to_stdout else None,
+                model_snapshot=snapshot,
+                **selection,
+            )
     except FileNotFoundError as e:
         log.error("Configuration or project files not found: %s", e)
         sys.exit(2)
@@ -126,14 +246,97 @@ def generate(
 
             traceback.print_exc()
         sys.exit(1)
-    out_path = Path(output)
-    # Create parent directory if using a nested output path
-    if out_path.parent and str(out_path.parent) not in ("", "."):
-        out_path.parent.mkdir(parents=True, exist_ok=True)
+    if to_stdout:
+        sys.stdout.write(dsl)  # daemon output; "" when streamed above
+        sys.stdout.flush()
+        return
+    _write_output(Path(output), dsl, log)
+    click.echo(f"Wrote {output} (exporter={exporter})")
+
+
+def _daemon_generate(**params: Any) -> str | None:
+    """The daemon's output (params as for build_workspace), or None when no daemon runs."""
     try:
-        with out_path.open("w") as fh:
-            fh.write(dsl)
+        response = request("generate", params)
+    except DaemonError as e:
+        if e.error_type == "FileNotFoundError":
+            raise FileNotFoundError(str(e)) from e
+        raise
+    return None if response is None else str(response["text"])
+
+
+def _write_output(out_path: Path, text: str, log: logging.Logger) -> None:
+    from architecture_diagrams.orchestrator.watch import write_atomic
+
+    # Atomic replace: readers (e.g. Structurizr Lite) never see a partially written file
+    try:
+        write_atomic(out_path, text)
     except Exception as e:
         log.error("Failed to write output to %s: %s", out_path, e)
         sys.exit(3)
-    click.echo(f"Wrote {output} (exporter={exporter})")
+
+
+def _generate_plan(
+    plan_path: Path,
+    *,
+    project: str | None,
+    project_path: Path | None,
+    tagging: list[str],
+    enable_cache: bool,
+    workers: int | None,
+    view_workers: int | None,
+    model_snapshot: Path | None,
+    verbose: bool,
+    log: logging.Logger,
+) -> None:
+    """Build every target of a batch plan; plan settings override the CLI options."""
+    from architecture_diagrams.orchestrator.build import build_workspaces
+    from architecture_diagrams.orchestrator.plan import load_plan
+
+    try:
+        plan = load_plan(plan_path)
+    except Exception as e:
+        log.error("Invalid plan %s: %s", plan_path, e)
+        sys.exit(2)
+    project = plan.project or project
+    try:
+        outputs = build_workspaces(
+            plan.targets,
+            workspace_name=plan.workspace_name or project or "banking",
+            project=project,
+            project_path=plan.project_path or project_path,
+            tagging=plan.tagging if plan.tagging is not None else tagging,
+            enable_cache=plan.enable_cache if plan.enable_cache is not None else enable_cache,
+            workers=workers or plan.workers or 1,
+            view_workers=view_workers or plan.view_workers or 1,
+            model_snapshot=model_snapshot,
+        )
+    except Exception as e:
+        log.error("Generation failed: %s", e)
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        sys.exit(1)
+    for target, text in zip(plan.targets, outputs, strict=True):
+        assert target.output is not None
+        _write_output(target.output, text, log)
+        click.echo(f"Wrote {target.output} (exporter={target.exporter})")
+
+
+def _watch(session: "WatchSession", poll_interval: float, log: logging.Logger) -> None:
+    """Regenerate on every debounced change until interrupted."""
+
+    def report(elapsed: float, changed: set[Path]) -> None:
+        what = ", ".join(sorted(p.name for p in changed)) if changed else "initial build"
+        click.echo(f"Wrote {session.output} in {elapsed * 1000:.0f} ms ({what})")
+
+    paths = session.watch_paths()
+    if not paths:
+        log.error("Nothing to watch for this project")
+        sys.exit(2)
+    log.info("Watching %s (Ctrl+C to stop)", ", ".join(str(p) for p in paths))
+    try:
+        session.run(interval=poll_interval, on_build=report)
+    except KeyboardInterrupt:
+        click.echo("Stopped watching")
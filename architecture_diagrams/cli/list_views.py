@@ -1,10 +1,17 @@
 import sys
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable
 
 import click
 
+from architecture_diagrams.orchestrator.daemon import DaemonError, request
 from architecture_diagrams.orchestrator.loader import discover_view_specs
 
+if TYPE_CHECKING:
+    from architecture_diagrams.orchestrator.daemon import WarmBuilds
+    from architecture_diagrams.orchestrator.specs import ViewSpec
+
 
 @click.command()
 @click.option(
@@ -21,6 +28,62 @@ def list_views(
     ctx: click.Context, project: str, project_path: str | None, filter_tag: str | None
 ) -> None:
     """List discovered views and their tags."""
+    # Determine if --project was explicitly provided
+    project_explicit = False
+    try:
+        src = ctx.get_parameter_source("project")
+        project_explicit = str(src).lower().endswith("commandline")
+    except Exception:
+        pass
+    params: dict[str, Any] = {
+        "project": project,
+        "project_path": str(Path(project_path).resolve()) if project_path else None,
+        "project_explicit": project_explicit,
+        "filter_tag": filter_tag,
+    }
+    try:
+        response = request("list-views", params)
+    except DaemonError as e:
+        raise click.ClickException(str(e)) from e
+    if response is not None:
+        lines = response["lines"]
+    else:
+        lines = view_lines(**params)
+    for line in lines:
+        click.echo(line)
+
+
+def view_lines(
+    *,
+    project: str,
+    project_path: str | None,
+    project_explicit: bool,
+    filter_tag: str | None,
+) -> list[str]:
+    """One line per discovered view, as printed by ``list-views``."""
+    specs = discover_listed_views(
+        project=project, project_path=project_path, project_explicit=project_explicit
+    )
+    return format_view_lines(specs, filter_tag)
+
+
+def warm_list_views(builds: "WarmBuilds") -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """``list-views`` daemon handler answering from the warm projects' view specs."""
+
+    def handle(params: Dict[str, Any]) -> Dict[str, Any]:
+        p = dict(params)
+        filter_tag = p.pop("filter_tag", None)
+        warm = builds.project(p.get("project"), p.get("project_path"))
+        specs = warm.view_specs(p.get("project_explicit"), partial(discover_listed_views, **p))
+        return {"lines": format_view_lines(specs, filter_tag)}
+
+    return handle
+
+
+def discover_listed_views(
+    *, project: str, project_path: str | None, project_explicit: bool
+) -> list["ViewSpec"]:
+    """The view specs ``list-views`` reports for these options."""
     root = Path(__file__).resolve().parents[2]
     extra_dirs: list[Path] = []
     if project_path:
@@ -43,13 +106,6 @@ def list_views(
         if (pp / "views").exists():
             extra_dirs.append(pp / "views")
         else:
-            # Determine if --project was explicitly provided
-            project_explicit = False
-            try:
-                src = ctx.get_parameter_source("project")
-                project_explicit = str(src).lower().endswith("commandline")
-            except Exception:
-                pass
             # If user explicitly provided --project, prefer that specific project's views under the provided path
             if project_explicit and project and (pp / project / "views").exists():
                 extra_dirs.append(pp / project / "views")
@@ -74,9 +130,12 @@ def list_views(
                 if candidates:
                     extra_dirs.extend(candidates)
     if extra_dirs:
-        specs = discover_view_specs(root, extra_dirs=extra_dirs)
-    else:
-        specs = discover_view_specs(root, project=project)
+        return discover_view_specs(root, extra_dirs=extra_dirs)
+    return discover_view_specs(root, project=project)
+
+
+def format_view_lines(specs: Iterable["ViewSpec"], filter_tag: str | None) -> list[str]:
+    lines: list[str] = []
     for spec in specs:
         if filter_tag and filter_tag not in spec.tags:
             continue
@@ -85,6 +144,7 @@ def list_views(
         smart = " smart" if getattr(spec, "smart", False) else ""
         proj = getattr(spec, "project", None)
         proj_str = f" :: project={proj}" if proj else ""
-        click.echo(
+        lines.append(
             f"{spec.key} [{spec.view_type}{smart}]{subj} :: {spec.name} :: tags={tags}{proj_str}"
         )
+    return lines
@@ -4,7 +4,6 @@ import webbrowser
 from typing import Any, Optional
 
 import click
-import requests
 
 from architecture_diagrams.orchestrator.build import build_workspace_dsl
 
@@ -195,6 +194,8 @@ def wait_for_container_url(url: str, timeout: int = 60, interval: int = 2) -> bo
     :param interval: Time interval between each poll (in seconds).
     :return: True if the URL is reachable, False if timeout occurs.
     """
+    import requests  # only needed here; keeps `lite --help` light
+
     start_time = time.time()
     while time.time() - start_time < timeout:
         try:
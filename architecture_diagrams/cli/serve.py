@@ -0,0 +1,57 @@
+import logging
+import sys
+from pathlib import Path
+
+import click
+
+from architecture_diagrams.cli.list_views import warm_list_views
+from architecture_diagrams.orchestrator.daemon import (
+    BuildDaemon,
+    DaemonError,
+    default_socket_path,
+    request,
+)
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Unix socket to listen on (default: $ARCH_DIAGS_SOCKET or .arch_diags_cache/serve.sock)",
+)
+@click.option("--status", is_flag=True, default=False, help="Report whether a daemon is running")
+@click.option("--stop", is_flag=True, default=False, help="Stop the running daemon")
+@click.option(
+    "--verbose", is_flag=True, default=False, help="Enable verbose logging for troubleshooting"
+)
+def serve(socket_path: str | None, status: bool, stop: bool, verbose: bool) -> None:
+    """Keep composed models warm; generate and list-views use the daemon while it runs."""
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(levelname)s: %(message)s",
+    )
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if status or stop:
+        try:
+            response = request("shutdown" if stop else "ping", socket_path=path, timeout=5.0)
+        except DaemonError as e:
+            raise click.ClickException(str(e)) from e
+        if response is None:
+            click.echo(f"No daemon listening on {path}")
+            sys.exit(1)
+        click.echo("Stopped" if stop else f"Daemon pid {response['pid']} on {path}")
+        return
+
+    try:
+        daemon = BuildDaemon(path)
+        daemon.handlers["list-views"] = warm_list_views(daemon.builds)
+        click.echo(f"Serving on {path} (Ctrl+C to stop)")
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        raise click.ClickException(str(e)) from e
+    click.echo("Stopped")
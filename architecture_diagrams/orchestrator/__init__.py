@@ -2,18 +2,48 @@
 
 This package provides utilities to compose models, discover independent view specs,
 select by names/tags, and build a complete workspace DSL.
+
+Names are imported on first access, so importing a light submodule (e.g. the daemon
+client used by the CLI) does not pull in the exporters and pystructurizr.
 """
 
-from .build import build_workspace_dsl
-from .loader import discover_model_builders, discover_view_specs
-from .select import select_views
-from .specs import Selector, ViewSpec
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .build import build_workspace_dsl
+    from .loader import discover_model_builders, discover_project, discover_view_specs
+    from .select import select_views
+    from .specs import Selector, ViewSpec, tagged
+
+_EXPORTS = {
+    "build_workspace_dsl": ".build",
+    "discover_model_builders": ".loader",
+    "discover_project": ".loader",
+    "discover_view_specs": ".loader",
+    "select_views": ".select",
+    "ViewSpec": ".specs",
+    "Selector": ".specs",
+    "tagged": ".specs",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "build_workspace_dsl",
     "discover_model_builders",
+    "discover_project",
     "discover_view_specs",
     "select_views",
     "ViewSpec",
     "Selector",
+    "tagged",
 ]
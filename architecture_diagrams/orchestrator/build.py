@@ -1,30 +1,58 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
+import logging
+import multiprocessing
+import pickle
 import sys
 import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
 
+from architecture_diagrams.adapter.dsl_emitter import (
+    ViewFragment,
+    emit_dsl_fragments,
+    render_view_fragments,
+)
 from architecture_diagrams.adapter.pystructurizr_export import dump_dsl
-from architecture_diagrams.orchestrator.compose import compose
+from architecture_diagrams.c4.lazy_landscape import LazySystemLandscape
+from architecture_diagrams.c4.system_landscape import SystemLandscape, normalize_name
+from architecture_diagrams.orchestrator.cache import CacheManager
+from architecture_diagrams.orchestrator.compose import ModelBuilder, compose
+from architecture_diagrams.orchestrator.digests import FileDigests
 from architecture_diagrams.orchestrator.loader import (
-    discover_model_builders,
-    discover_overlays,
-    discover_view_specs,
+    BUILDERS,
+    OVERLAYS,
+    VIEWS,
+    DiscoveredModules,
+    Overlay,
+    discover_project,
 )
 from architecture_diagrams.orchestrator.select import select_views
-from architecture_diagrams.orchestrator.specs import ViewSpec
+from architecture_diagrams.orchestrator.snapshot import (
+    load_model_snapshot,
+    model_snapshot_key,
+    save_model_snapshot,
+    snapshot_path,
+)
+from architecture_diagrams.orchestrator.specs import SelectorCache, ViewSpec
 from architecture_diagrams.plugins import (
+    export_to,
     exporters as _ensure_exporters,  # noqa: F401 ensure registration
     get_exporter,  # plugin registry
     tagging as _ensure_tagging,  # noqa: F401
     view_generators as _ensure_view_generators,  # noqa: F401
 )  # noqa: F401 ensure registration
+from architecture_diagrams.plugins.tag_rules import TagRuleEngine, parse_rules
 from architecture_diagrams.plugins.tagging import get_strategy as get_tagging_strategy
 from architecture_diagrams.plugins.view_generators import get_view_generator
 
+log = logging.getLogger("architecture-diagrams.build")
+
 
 def build_workspace_dsl(
     *,
@@ -52,6 +80,33 @@ def build_workspace_dsl(
     )
 
 
+# Alternative builder stage: (builders, workspace_name) -> composed model
+Composer = Callable[[List[ModelBuilder], str], SystemLandscape]
+
+
+@dataclass
+class BuildTarget:
+    """One output of a batch build: a view selection plus export settings."""
+
+    select_names: Optional[Iterable[str]] = None
+    select_tags: Optional[Iterable[str]] = None
+    select_modules: Optional[Iterable[str]] = None
+    prune_to_views: bool = False
+    exporter: str = "structurizr"
+    view_generator: Optional[str] = None
+    view_generator_config: Optional[Dict[str, Any]] = None
+    output: Optional[Path] = None  # where the CLI writes this target; unused by the API
+
+
+@dataclass
+class _BuildContext:
+    """State shared by every target of a batch build."""
+
+    specs: list[ViewSpec]
+    cache: Optional[CacheManager]  # None when caching is disabled
+    view_workers: int = 1
+
+
 def build_workspace(
     *,
     workspace_name: str = "banking",
@@ -69,7 +124,74 @@ def build_workspace(
     view_generator_config: Optional[Dict[str, Any]] = None,
     enable_cache: bool = False,
     cache_dir: Optional[Path] = None,
+    view_workers: int = 1,
+    stream: Optional[TextIO] = None,
+    model_snapshot: Optional[Path] = None,
 ) -> str:
+    """Build one workspace and return it, or write it to ``stream`` and return ""."""
+    target = BuildTarget(
+        select_names=select_names,
+        select_tags=select_tags,
+        select_modules=select_modules,
+        prune_to_views=prune_to_views,
+        exporter=exporter,
+        view_generator=view_generator,
+        view_generator_config=view_generator_config,
+    )
+    return build_workspaces(
+        [target],
+        workspace_name=workspace_name,
+        project=project,
+        project_path=project_path,
+        models_root=models_root,
+        views_root=views_root,
+        tagging=tagging,
+        enable_cache=enable_cache,
+        cache_dir=cache_dir,
+        view_workers=view_workers,
+        streams=[stream],
+        model_snapshot=model_snapshot,
+    )[0]
+
+
+def build_workspaces(
+    targets: Sequence[BuildTarget],
+    *,
+    workspace_name: str = "banking",
+    project: Optional[str] = None,
+    project_path: Optional[Path] = None,
+    models_root: Optional[Path] = None,
+    views_root: Optional[Path] = None,
+    tagging: Optional[Iterable[str]] = None,
+    enable_cache: bool = False,
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    view_workers: int = 1,
+    composer: Optional[Composer] = None,
+    streams: Optional[Sequence[Optional[TextIO]]] = None,
+    model_snapshot: Optional[Path] = None,
+) -> List[str]:
+    """Compose (and tag) the model once, then build and export every target.
+
+    Each target gets its own copy of the composed model, so view building and pruning in
+    one target never leak into another. Outputs are returned in target order and match
+    what ``build_workspace`` produces for the same parameters. With ``workers > 1`` the
+    targets are spread over forked worker processes (where fork is available).
+    ``view_workers > 1`` additionally builds and renders the views of each Structurizr
+    target in forked workers (see ``_export_views_forked``); the output is unchanged.
+    ``composer(builders, workspace_name)`` replaces ``compose`` for the builder stage
+    (e.g. a warm incremental composer in watch mode); it must return a model the build
+    may mutate. Targets with a text stream in ``streams`` are written there as they are
+    exported (see ``plugins.export_to``) and their entry in the result is "".
+    ``model_snapshot`` names a binary model snapshot (``c4.binary_snapshot.dump``) to use
+    instead of composing: builders, overlays and tagging are skipped, only the view modules
+    are imported, and the model is read lazily (see ``LazySystemLandscape``), so a pruned
+    or narrowly selected target only builds the elements it exports. The snapshot already
+    holds the tagged model, so ``tagging`` cannot be combined with it.
+    """
+    if model_snapshot is not None and tagging:
+        raise ValueError("tagging strategies cannot be applied to a model snapshot")
+    streams = list(streams or [None] * len(targets))
     root = Path(__file__).resolve().parents[2]
     external_root: Optional[Path] = None
     extra_model_dirs: list[Path] = []
@@ -156,6 +278,10 @@ def build_workspace(
             except Exception:
                 pass
 
+    # Declarative tagging rules ([[tag_rules]]) from the same manifest as workspace_name
+    rules_root = external_root or (root / "projects" / project if project else None)
+    tag_rules = _manifest_tag_rules(rules_root / "project.toml") if rules_root else None
+
     # Discover from internal repo layout or external project path(s)
     # Resolve inheritance (extends) if present in manifest when using internal project
     base_project: Optional[str] = None
@@ -168,71 +294,272 @@ def build_workspace(
             except Exception:
                 base_project = None
 
-    # Compose base
+    # With caching enabled, targets whose inputs are unchanged are served from the output
+    # cache without composing anything. Otherwise reuse the composed model (after overlays
+    # and tagging) when the model files are unchanged; only view modules then need importing.
+    model: Optional[SystemLandscape] = None
+    snapshot_file: Optional[Path] = None
+    cache: Optional[CacheManager] = None
+    keys: List[Optional[str]] = [None] * len(targets)
+    results: List[Optional[str]] = [None] * len(targets)
+    if enable_cache:
+        cache = CacheManager(cache_dir or (root / ".arch_diags_cache"))
+        digests = FileDigests.in_cache_dir(cache.cache_dir)
+        project_dirs = [root / "projects" / p for p in (project, base_project) if p]
+        inputs = _inputs_digest(
+            digests, project_dirs, extra_model_dirs + extra_view_dirs, model_snapshot
+        )
+        target_keys = [
+            _compute_cache_key(
+                inputs_digest=inputs,
+                code_digest=digests.code_digest(*_plugin_callables(t)),
+                workspace_name=workspace_name,
+                tagging=tagging,
+                tag_rules=_tag_rules_digest(tagging, tag_rules),
+                target=t,
+            )
+            for t in targets
+        ]
+        results = [cache.read_output(k) for k in target_keys]
+        keys = list(target_keys)
+        if all(r is not None for r in results):
+            digests.save()
+            cache.prune()
+            return _deliver(results, streams)
+        if model_snapshot is None:
+            key = model_snapshot_key(
+                [d / "models" for d in project_dirs] + extra_model_dirs,
+                workspace_name=workspace_name,
+                tagging=tagging,
+                tag_rules=_tag_rules_digest(tagging, tag_rules),
+                digests=digests,
+                code_digest=digests.code_digest(*_tagging_callables(tagging)),
+            )
+            snapshot_file = snapshot_path(cache.cache_dir, key)
+            model = load_model_snapshot(snapshot_file)
+            if model is not None:
+                cache.touch(snapshot_file)
+        digests.save()
+    if model_snapshot is not None:
+        model = LazySystemLandscape.open(model_snapshot)
+    model_kinds = {BUILDERS, OVERLAYS} if model is None else set()
+
+    # One discovery pass per project tree: external dirs (if any), the project itself and,
+    # with extends, the base project. Each pass walks its directories once.
+    # With caching enabled, the discovery manifest lives next to the cache entries.
+    manifest_dir = cache.cache_dir if cache is not None else None
+    external = DiscoveredModules()
+    if extra_model_dirs or extra_view_dirs:
+        external = discover_project(
+            root,
+            extra_model_dirs=extra_model_dirs,
+            extra_view_dirs=extra_view_dirs,
+            kinds=model_kinds | {VIEWS},
+            cache_dir=manifest_dir,
+            use_manifest=manifest_dir is not None,
+        )
+    local_kinds = model_kinds & {OVERLAYS}
+    if not extra_model_dirs:
+        local_kinds |= model_kinds & {BUILDERS}
+    if not extra_view_dirs:
+        local_kinds.add(VIEWS)
+    local = discover_project(
+        root,
+        project=project,
+        kinds=local_kinds,
+        cache_dir=manifest_dir,
+        use_manifest=manifest_dir is not None,
+    )
+    base = (
+        discover_project(
+            root,
+            project=base_project,
+            kinds=(model_kinds & {BUILDERS}) | {VIEWS},
+            cache_dir=manifest_dir,
+            use_manifest=manifest_dir is not None,
+        )
+        if base_project
+        else DiscoveredModules()
+    )
+
+    if model is None:
+        model = _compose_model(
+            workspace_name=workspace_name,
+            builders=(
+                base.builders + local.builders
+                if base_project
+                else (external.builders if extra_model_dirs else local.builders)
+            ),
+            overlays=local.overlays + external.overlays,
+            tagging=tagging,
+            tag_rules=tag_rules,
+            composer=composer,
+        )
+        if snapshot_file is not None:
+            save_model_snapshot(snapshot_file, model)
+
+    base_specs = external.view_specs if extra_view_dirs else local.view_specs
+    # If extends is set, merge base project's views as well (base first to allow perceived override by derived)
     if base_project:
-        base_builders = discover_model_builders(root, project=base_project)
-        model = compose(base_builders, name=workspace_name)
-        # Then apply derived project's own builders on top (if any)
-        derived_builders = discover_model_builders(root, project=project)
-        for b in derived_builders:
-            model = b(model)
+        all_specs = _merge_view_inheritance(base.view_specs, base_specs)
     else:
-        if extra_model_dirs:
-            builders = discover_model_builders(root, extra_dirs=extra_model_dirs)
-        else:
-            builders = discover_model_builders(root, project=project)
-        model = compose(builders, name=workspace_name)
+        all_specs = _merge_view_inheritance([], base_specs)
 
-    # Apply overlays if any (internal or external)
-    overlay_dirs = extra_model_dirs if extra_model_dirs else None
-    overlays = discover_overlays(root, project=project, extra_dirs=overlay_dirs)
-    for apply in overlays:
+    ctx = _BuildContext(specs=all_specs, cache=cache, view_workers=view_workers)
+    pending = [i for i, r in enumerate(results) if r is None]
+    try:
+        if len(pending) == 1:
+            (i,) = pending
+            results[i] = _build_target(ctx, model, targets[i], keys[i], streams[i])
+        elif pending:
+            copier: _ModelCopier = (
+                _SnapshotCopier(model_snapshot)
+                if model_snapshot is not None
+                else _ModelCopier(model)
+            )
+            jobs = [(targets[i], keys[i]) for i in pending]
+            if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+                built = _build_targets_forked(ctx, copier, jobs, workers)
+            else:
+                built = [_build_copy(ctx, copier, targets[i], keys[i], streams[i]) for i in pending]
+            for i, out in zip(pending, built, strict=True):
+                results[i] = out
+    finally:
+        _release(model)
+    if cache is not None:
+        # Keep the cache directory within its size and age limits
+        cache.prune()
+    return _deliver(results, streams)
+
+
+def _deliver(results: Sequence[Optional[str]], streams: Sequence[Optional[TextIO]]) -> List[str]:
+    """Write the texts of streamed targets (cache hits, forked builds) to their streams."""
+    out = []
+    for text, stream in zip(results, streams, strict=True):
+        if stream is not None:
+            stream.write(text or "")
+            text = ""
+        out.append(text or "")
+    return out
+
+
+class _ModelCopier:
+    """Hands out independent copies of a composed model (pickle round-trip, else deepcopy)."""
+
+    def __init__(self, model: SystemLandscape) -> None:
+        self._model = model
+        self._data: Optional[bytes]
         try:
-            apply(model)  # type: ignore[misc]
+            self._data = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
         except Exception:
-            # Best-effort: do not fail the whole build if an overlay raises
-            pass
+            self._data = None
 
-    # Apply tagging strategies, if requested
-    if tagging:
-        for name in tagging:
-            strat = get_tagging_strategy(str(name))
-            if strat is not None:
-                try:
-                    strat(model)
-                except Exception:
-                    # Non-fatal; continue with other strategies
-                    pass
+    def copy(self) -> SystemLandscape:
+        if self._data is not None:
+            return pickle.loads(self._data)  # type: ignore[no-any-return]
+        return copy.deepcopy(self._model)
 
-    if extra_view_dirs:
-        base_specs = discover_view_specs(root, extra_dirs=extra_view_dirs)
-    else:
-        base_specs = discover_view_specs(root, project=project)
-    # If extends is set, merge base project's views as well (base first to allow perceived override by derived)
-    if base_project:
-        base_proj_specs = discover_view_specs(root, project=base_project)
-        all_specs = _merge_view_inheritance(base_proj_specs, base_specs)
-    else:
-        all_specs = _merge_view_inheritance([], base_specs)
+
+class _SnapshotCopier(_ModelCopier):
+    """Hands out lazy models over the same binary snapshot, never materializing all of it.
+
+    Each copy maps the file anew; ``_build_copy`` releases it once its target is built.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def copy(self) -> SystemLandscape:
+        return LazySystemLandscape.open(self._path)
+
+
+def _build_copy(
+    ctx: _BuildContext,
+    copier: _ModelCopier,
+    target: BuildTarget,
+    key: Optional[str],
+    stream: Optional[TextIO] = None,
+) -> str:
+    model = copier.copy()
+    try:
+        return _build_target(ctx, model, target, key, stream)
+    finally:
+        _release(model)
+
+
+def _release(model: Optional[SystemLandscape]) -> None:
+    """Unmap a lazy model's snapshot; plain models hold nothing to release."""
+    if isinstance(model, LazySystemLandscape):
+        model.close()
+
+
+# Inherited by forked workers; view specs (which may hold lambdas) are never pickled
+_Job = Tuple[BuildTarget, Optional[str]]
+_FORK_STATE: Optional[Tuple[_BuildContext, _ModelCopier, Sequence[_Job]]] = None
+
+
+def _build_forked_target(index: int) -> str:
+    assert _FORK_STATE is not None
+    ctx, copier, jobs = _FORK_STATE
+    target, key = jobs[index]
+    return _build_copy(ctx, copier, target, key)
+
+
+def _build_targets_forked(
+    ctx: _BuildContext, copier: _ModelCopier, jobs: Sequence[_Job], workers: int
+) -> List[str]:
+    global _FORK_STATE
+    _FORK_STATE = (ctx, copier, jobs)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as pool:
+            return list(pool.map(_build_forked_target, range(len(jobs))))
+    finally:
+        _FORK_STATE = None
+
+
+def _build_target(
+    ctx: _BuildContext,
+    model: SystemLandscape,
+    target: BuildTarget,
+    cache_key: Optional[str],
+    stream: Optional[TextIO] = None,
+) -> str:
+    """Select and build views for one target on model (mutated), then export it.
+
+    With ``stream`` the export is written there and "" is returned; it is streamed
+    straight from the exporter unless the text is also needed for the cache.
+    """
     selected = select_views(
-        all_specs,
-        names=set(select_names or []),
-        tags=set(select_tags or []),
-        modules=set(select_modules or []),
+        ctx.specs,
+        names=set(target.select_names or []),
+        tags=set(target.select_tags or []),
+        modules=set(target.select_modules or []),
     )
+    exp = get_exporter(target.exporter)
+    exporter_fn = exp if exp is not None else dump_dsl
+    if _views_parallelizable(ctx, target, exporter_fn, selected):
+        out = _export_views_forked(model, selected, ctx.view_workers)
+        if ctx.cache is not None and cache_key is not None:
+            ctx.cache.write_output(cache_key, out)
+        return _deliver([out], [stream])[0]
+
+    selectors = SelectorCache()
     for spec in selected:
-        spec.build(model)
+        spec.build(model, selectors)
 
     # Optional: generate derived views via plugin after base views are built
-    if view_generator:
-        gen = get_view_generator(view_generator)
+    if target.view_generator:
+        gen = get_view_generator(target.view_generator)
         if gen is not None:
-            cfg: Dict[str, Any] = dict(view_generator_config or {})
+            cfg: Dict[str, Any] = dict(target.view_generator_config or {})
             try:
                 derived = gen(model, cfg)
                 for spec in derived:
                     try:
-                        spec.build(model)
+                        spec.build(model, selectors)
                     except Exception:
                         # Skip problematic derived specs without failing the build
                         pass
@@ -240,47 +567,158 @@ def build_workspace(
                 # Non-fatal view generation failure
                 pass
 
-    if prune_to_views and selected:
+    _log_selector_cache(selectors)
+    if target.prune_to_views and selected:
         _prune_model_to_views(model)
 
     # Export via selected exporter, with optional caching
-    exp = get_exporter(exporter)
-    exporter_fn = exp if exp is not None else dump_dsl
+    if stream is not None and (ctx.cache is None or cache_key is None):
+        export_to(model, stream, target.exporter)
+        return ""
+    out = exporter_fn(model)
+    if ctx.cache is not None and cache_key is not None:
+        ctx.cache.write_output(cache_key, out)
+    return _deliver([out], [stream])[0]
 
-    if enable_cache:
+
+def _log_selector_cache(selectors: SelectorCache) -> None:
+    info = selectors.info()
+    log.debug("Include selectors: %d resolved from cache, %d resolved", info.hits, info.misses)
+
+
+def _views_parallelizable(
+    ctx: _BuildContext, target: BuildTarget, exporter_fn: Any, selected: Sequence[ViewSpec]
+) -> bool:
+    """Whether a target's views can be built per worker and merged as DSL fragments.
+
+    View generators and pruning need every view on one model, and only the native
+    Structurizr emitter renders views independently.
+    """
+    return (
+        ctx.view_workers > 1
+        and len(selected) > 1
+        and exporter_fn is dump_dsl
+        and not target.view_generator
+        and not target.prune_to_views
+        and "fork" in multiprocessing.get_all_start_methods()
+    )
+
+
+# Inherited by forked view workers: the model to build views on and the selected specs
+_VIEW_FORK_STATE: Optional[Tuple[SystemLandscape, Sequence[ViewSpec]]] = None
+
+
+def _render_forked_views(span: Tuple[int, int]) -> List[ViewFragment]:
+    assert _VIEW_FORK_STATE is not None
+    model, specs = _VIEW_FORK_STATE
+    # The forked model is private to this worker; drop views from an earlier span (and
+    # views present before the build, which the parent renders)
+    del model.views[:]
+    selectors = SelectorCache()
+    for spec in specs[span[0] : span[1]]:
+        spec.build(model, selectors)
+    _log_selector_cache(selectors)
+    return render_view_fragments(model)
+
+
+def _export_views_forked(model: SystemLandscape, specs: Sequence[ViewSpec], workers: int) -> str:
+    """Build and render ``specs`` in contiguous spans across forked workers.
+
+    Building a view only appends to ``model.views``, and views never affect element
+    identifiers, so each worker builds its span on its inherited copy of the model and
+    returns rendered fragments. Merging them in spec order reproduces the serial output.
+    """
+    global _VIEW_FORK_STATE
+    fragments = render_view_fragments(model) if model.views else []
+    n = min(workers, len(specs))
+    bounds = [len(specs) * i // n for i in range(n + 1)]
+    _VIEW_FORK_STATE = (model, specs)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n, mp_context=multiprocessing.get_context("fork")
+        ) as pool:
+            for part in pool.map(_render_forked_views, zip(bounds[:-1], bounds[1:], strict=True)):
+                fragments.extend(part)
+    finally:
+        _VIEW_FORK_STATE = None
+    return emit_dsl_fragments(model, fragments)
+
+
+def _plugin_callables(target: BuildTarget) -> list[Any]:
+    """Exporter and view generator code that shapes a target's output."""
+    fns: list[Any] = [get_exporter(target.exporter) or dump_dsl]
+    if target.view_generator:
+        fns.append(get_view_generator(target.view_generator))
+    return [f for f in fns if f is not None]
+
+
+def _tagging_callables(tagging: Optional[Iterable[str]]) -> list[Any]:
+    return [f for f in (get_tagging_strategy(str(n)) for n in tagging or []) if f is not None]
+
+
+def _manifest_tag_rules(manifest: Path) -> Optional[TagRuleEngine]:
+    """Compiled ``[[tag_rules]]`` of a project manifest, or None when it declares none.
+
+    Unreadable manifests are ignored (as for workspace_name); malformed rules raise.
+    """
+    try:
+        data = tomllib.loads(manifest.read_text())
+    except Exception:
+        return None
+    raw = data.get("tag_rules")
+    if not raw:
+        return None
+    return TagRuleEngine(parse_rules(raw, f"{manifest}: tag_rules"))
+
+
+def _tag_rules_digest(tagging: Optional[Iterable[str]], tag_rules: Optional[TagRuleEngine]) -> str:
+    """Fingerprint of the rule sets applied at composition, for the cache keys.
+
+    Rule engines are data, not code, so the code digest cannot see them change.
+    """
+    engines = [get_tagging_strategy(str(n)) for n in tagging or []] + [tag_rules]
+    return ",".join(e.fingerprint() for e in engines if isinstance(e, TagRuleEngine))
+
+
+def _compose_model(
+    *,
+    workspace_name: str,
+    builders: list[ModelBuilder],
+    overlays: list[Overlay],
+    tagging: Optional[Iterable[str]],
+    tag_rules: Optional[TagRuleEngine] = None,
+    composer: Optional[Composer] = None,
+) -> SystemLandscape:
+    """Run builders, overlays, tagging strategies, then manifest tag rules.
+
+    This is the snapshot-cached stage.
+    """
+    if composer is not None:
+        model = composer(builders, workspace_name)
+    else:
+        model = compose(builders, name=workspace_name)
+
+    # Apply overlays if any (internal or external)
+    for apply in overlays:
         try:
-            cache_root = cache_dir or (root / ".arch_diags_cache")
-            cache_root.mkdir(parents=True, exist_ok=True)
-            key = _compute_cache_key(
-                root=root,
-                project=project,
-                external_model_dirs=extra_model_dirs,
-                external_view_dirs=extra_view_dirs,
-                select_names=select_names,
-                select_tags=select_tags,
-                select_modules=select_modules,
-                exporter=exporter,
-                tagging=tagging,
-                view_generator=view_generator,
-                view_generator_config=view_generator_config,
-            )
-            cache_file = cache_root / f"{key}.out"
-            if cache_file.exists():
+            apply(model)
+        except Exception:
+            # Best-effort: do not fail the whole build if an overlay raises
+            pass
+
+    # Apply tagging strategies, if requested
+    if tagging:
+        for name in tagging:
+            strat = get_tagging_strategy(str(name))
+            if strat is not None:
                 try:
-                    return cache_file.read_text()
+                    strat(model)
                 except Exception:
+                    # Non-fatal; continue with other strategies
                     pass
-            out = exporter_fn(model)
-            try:
-                cache_file.write_text(out)
-            except Exception:
-                pass
-            return out
-        except Exception:
-            # On any cache error, fall back to direct export
-            return exporter_fn(model)
-
-    return exporter_fn(model)
+    if tag_rules is not None:
+        tag_rules(model)
+    return model
 
 
 def _merge_view_inheritance(
@@ -345,10 +783,61 @@ def _prune_model_to_views(model: Any) -> None:
       - All Persons/Systems/Containers/Components explicitly included by views (after subject normalization rules)
       - Required parents for view subjects (e.g., subject system or container parents)
       - Relationship endpoints between kept elements
+
+    Models with a ``prune_to_ids`` method (``LazySystemLandscape``) prune themselves from
+    the collected ids, without building the elements they drop.
     """
     # Local imports avoided; operate on duck-typed model
+    keep_ids = _view_keep_ids(model)
+    prune_to_ids = getattr(model, "prune_to_ids", None)
+    if prune_to_ids is not None:
+        prune_to_ids(keep_ids)
+        return
+
+    # Also keep parents needed for correctness
+    def add_parents(e):
+        p = getattr(e, "parent", None)
+        while p is not None and hasattr(p, "id"):
+            keep_ids.add(p.id)
+            p = getattr(p, "parent", None)
+
+    elements = list(model.iter_elements())
+    for e in elements:
+        if hasattr(e, "id") and e.id in keep_ids:
+            add_parents(e)
+    dropped = [e for e in elements if e.id not in keep_ids]
+
+    # Prune software systems and nested containers/components
+    systems_to_remove = []
+    for sid, system in list(model.software_systems.items()):
+        if system.id not in keep_ids:
+            # Keep system if any nested container/component is kept
+            nested_kept = any(
+                c.id in keep_ids or any(comp.id in keep_ids for comp in c.components)
+                for c in system.containers
+            )
+            if not nested_kept and sid not in keep_ids:
+                systems_to_remove.append(sid)
+        else:
+            # Prune containers
+            new_containers = []
+            for c in system.containers:
+                if c.id in keep_ids or any(comp.id in keep_ids for comp in c.components):
+                    new_containers.append(c)
+            system._containers.clear()
+            for c in new_containers:
+                system._containers[c.name] = c
+    for sid in systems_to_remove:
+        model.remove_software_system(model.software_systems[sid])
 
-    # Collect ids included by views and the view subjects
+    # Prune people and relationships (only edges touching dropped elements are visited)
+    for person in [p for p in model.people.values() if p.id not in keep_ids]:
+        model.remove_person(person)
+    model.remove_relationships_touching(dropped)
+
+
+def _view_keep_ids(model: Any) -> set[str]:
+    """Ids of the elements the views include, their subjects and name-filter endpoints."""
     keep_ids: set[str] = set()
     subject_ids: set[str] = set()
     for v in model.views:
@@ -363,60 +852,29 @@ def _prune_model_to_views(model: Any) -> None:
         name_filters = getattr(v, "_name_relationship_filters", [])
         if name_filters:
 
-            def _norm(s: Optional[str]) -> Optional[str]:
-                if s is None:
-                    return None
-                return s.strip().lower().replace("_", "-").replace(" ", "-")
-
             def _resolve_name_to_id(name: str | None) -> Optional[str]:
                 if not name or name == "*":
                     return None
                 # Support System/Container
                 if "/" in name:
                     sys_name, inner = name.split("/", 1)
-                    # Find system by display name
-                    sys = next(
-                        (
-                            s
-                            for s in model.software_systems.values()
-                            if _norm(getattr(s, "name", None)) == _norm(sys_name)
-                        ),
-                        None,
-                    )
+                    sys = model.find_system(sys_name, normalized=True)
                     if sys is None:
                         return None
                     cont = next(
                         (
                             c
                             for c in getattr(sys, "containers", [])
-                            if _norm(getattr(c, "name", None)) == _norm(inner)
+                            if normalize_name(c.name) == normalize_name(inner)
                         ),
                         None,
                     )
                     return getattr(cont, "id", None)
-                # Try person by name
-                person = next(
-                    (
-                        p
-                        for p in model.people.values()
-                        if _norm(getattr(p, "name", None)) == _norm(name)
-                    ),
-                    None,
-                )
-                if person is not None:
-                    return getattr(person, "id", None)
-                # Try software system by name
-                sys = next(
-                    (
-                        s
-                        for s in model.software_systems.values()
-                        if _norm(getattr(s, "name", None)) == _norm(name)
-                    ),
-                    None,
+                # Try person, then software system, by name
+                found = model.find_person(name, normalized=True) or model.find_system(
+                    name, normalized=True
                 )
-                if sys is not None:
-                    return getattr(sys, "id", None)
-                return None
+                return getattr(found, "id", None)
 
             for nf in name_filters:
                 from_id = _resolve_name_to_id(getattr(nf, "from_name", None))
@@ -430,106 +888,60 @@ def _prune_model_to_views(model: Any) -> None:
                     if bi_id:
                         keep_ids.add(bi_id)
     keep_ids |= subject_ids
+    return keep_ids
 
-    # Also keep parents needed for correctness
-    def add_parents(e):
-        p = getattr(e, "parent", None)
-        while p is not None and hasattr(p, "id"):
-            keep_ids.add(p.id)
-            p = getattr(p, "parent", None)
-
-    for e in list(model.iter_elements()):
-        if hasattr(e, "id") and e.id in keep_ids:
-            add_parents(e)
 
-    # Prune software systems and nested containers/components
-    systems_to_remove = []
-    for sid, system in list(model.software_systems.items()):
-        if system.id not in keep_ids:
-            # Keep system if any nested container/component is kept
-            nested_kept = any(
-                c.id in keep_ids or any(comp.id in keep_ids for comp in c.components)
-                for c in system.containers
-            )
-            if not nested_kept and sid not in keep_ids:
-                systems_to_remove.append(sid)
-        else:
-            # Prune containers
-            new_containers = []
-            for c in system.containers:
-                if c.id in keep_ids or any(comp.id in keep_ids for comp in c.components):
-                    new_containers.append(c)
-            system._containers.clear()
-            for c in new_containers:
-                system._containers[c.name] = c
-    for sid in systems_to_remove:
-        model.software_systems.pop(sid, None)
+def _inputs_digest(
+    digests: FileDigests,
+    project_dirs: list[Path],
+    external_dirs: list[Path],
+    model_snapshot: Optional[Path] = None,
+) -> str:
+    """Content digest of the project trees (models, views, project.toml) and external dirs.
 
-    # Prune people and relationships
-    model.people = {pid: p for pid, p in model.people.items() if p.id in keep_ids}
-    model.relationships = [
-        r
-        for r in model.relationships
-        if hasattr(r.source, "id")
-        and hasattr(r.destination, "id")
-        and r.source.id in keep_ids
-        and r.destination.id in keep_ids
-    ]
+    Trees contribute their paths relative to their own directory, so the same sources
+    checked out elsewhere produce the same digest. A binary model snapshot read instead
+    of the models contributes its content digest.
+    """
+    h = hashlib.sha256()
+    for base in project_dirs:
+        h.update(b"project\0")
+        for sub in ("models", "views"):
+            h.update(digests.python_tree_digest(base / sub).encode("ascii"))
+        h.update((digests.digest(base / "project.toml") or "").encode("ascii"))
+    for d in external_dirs:
+        h.update(b"external\0")
+        h.update(digests.python_tree_digest(d).encode("ascii"))
+    if model_snapshot is not None:
+        h.update(b"model-snapshot\0")
+        h.update((digests.digest(model_snapshot) or "").encode("ascii"))
+    return h.hexdigest()
 
 
 def _compute_cache_key(
     *,
-    root: Path,
-    project: Optional[str],
-    external_model_dirs: list[Path],
-    external_view_dirs: list[Path],
-    select_names: Optional[Iterable[str]],
-    select_tags: Optional[Iterable[str]],
-    select_modules: Optional[Iterable[str]],
-    exporter: str,
+    inputs_digest: str,
+    code_digest: str,
+    workspace_name: str,
     tagging: Optional[Iterable[str]],
-    view_generator: Optional[str],
-    view_generator_config: Optional[Dict[str, Any]],
+    target: BuildTarget,
+    tag_rules: str = "",
 ) -> str:
-    """Compute a stable cache key based on input files' mtimes and contents and build params."""
-    files: list[Path] = []
-    # Internal project files
-    if project:
-        base = root / "projects" / project
-        if base.exists():
-            for pat in ("models", "views"):
-                d = base / pat
-                if d.exists():
-                    files.extend(p for p in d.rglob("*.py"))
-            manifest = base / "project.toml"
-            if manifest.exists():
-                files.append(manifest)
-    # External dirs
-    for d in list(external_model_dirs) + list(external_view_dirs):
-        if d.exists():
-            files.extend(p for p in d.rglob("*.py"))
-
-    # Deduplicate
-    unique_files = sorted({str(p): p for p in files}.values(), key=lambda p: str(p))
+    """Content-addressed output cache key: input and code digests plus build params."""
     h = hashlib.sha256()
-    # Params
     params = {
-        "select_names": list(select_names or []),
-        "select_tags": list(select_tags or []),
-        "select_modules": list(select_modules or []),
-        "exporter": exporter,
+        "workspace_name": workspace_name,
+        "select_names": list(target.select_names or []),
+        "select_tags": list(target.select_tags or []),
+        "select_modules": list(target.select_modules or []),
+        "prune_to_views": target.prune_to_views,
+        "exporter": target.exporter,
         "tagging": list(tagging or []),
-        "view_generator": view_generator or "",
-        "view_generator_config": view_generator_config or {},
+        "tag_rules": tag_rules,
+        "view_generator": target.view_generator or "",
+        "view_generator_config": target.view_generator_config or {},
     }
     h.update(json.dumps(params, sort_keys=True).encode("utf-8"))
-    for p in unique_files:
-        try:
-            st = p.stat()
-            h.update(str(p).encode("utf-8"))
-            h.update(str(int(st.st_mtime)).encode("utf-8"))
-            # Content hash
-            h.update(hashlib.sha256(p.read_bytes()).digest())
-        except Exception:
-            continue
+    h.update(inputs_digest.encode("ascii"))
+    h.update(code_digest.encode("ascii"))
     return h.hexdigest()
@@ -0,0 +1,239 @@
+"""Bounded on-disk cache for build outputs and model snapshots.
+
+Entries are the files ``build_workspace(enable_cache=True)`` writes under
+``.arch_diags_cache``: rendered outputs (``<key>.out``) and composed-model snapshots
+(``<key>.model.snap``). The discovery manifest and the digest memo are metadata: they
+are small, rewritten in place and never evicted (``clear`` removes them too).
+
+Writes go through a temp file and ``os.replace`` so readers never see partial entries.
+Reads refresh the entry's access time explicitly (many build agents mount with
+``noatime``), and eviction removes least-recently-accessed entries first until the
+cache is within its size limit; entries not accessed within the age limit go as well.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from architecture_diagrams.orchestrator.snapshot import SNAPSHOT_SUFFIX
+
+OUTPUT_SUFFIX = ".out"
+ENTRY_SUFFIXES = (OUTPUT_SUFFIX, SNAPSHOT_SUFFIX)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600.0  # seconds since last access
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def default_cache_dir() -> Path:
+    """<repo root>/.arch_diags_cache, the directory build_workspace uses by default."""
+    return Path(__file__).resolve().parents[2] / ".arch_diags_cache"
+
+
+def parse_size(text: str) -> int:
+    """Parse '500M', '2g', '1024' (bytes) into a byte count."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmg]?)i?b?\s*", text.lower())
+    if not m:
+        raise ValueError(f"invalid size: {text!r} (use e.g. 500M, 2G)")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2)])
+
+
+def parse_age(text: str) -> float:
+    """Parse '30d', '12h', '90m', '3600' (seconds) into seconds."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", text.lower())
+    if not m:
+        raise ValueError(f"invalid age: {text!r} (use e.g. 7d, 12h)")
+    return float(m.group(1)) * _AGE_UNITS[m.group(2) or "s"]
+
+
+@dataclass
+class CacheEntry:
+    path: Path
+    size: int
+    atime: float
+
+
+@dataclass
+class CacheStats:
+    entries: int = 0
+    total_bytes: int = 0
+    outputs: int = 0
+    snapshots: int = 0
+    oldest_access: Optional[float] = None
+    newest_access: Optional[float] = None
+
+
+@dataclass
+class PruneResult:
+    removed: int = 0
+    freed_bytes: int = 0
+
+
+class CacheManager:
+    """Size- and age-bounded cache directory with LRU (access time) eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        *,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    # ----- Entries -----
+    def output_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{OUTPUT_SUFFIX}"
+
+    def read_output(self, key: str) -> Optional[str]:
+        """Cached output for key (refreshing its access time), or None."""
+        path = self.output_path(key)
+        try:
+            text = path.read_text()
+        except Exception:
+            return None
+        self.touch(path)
+        return text
+
+    def write_output(self, key: str, text: str) -> bool:
+        return self.write_bytes(self.output_path(key), text.encode("utf-8"))
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """Atomically write data to path inside the cache; False (nothing written) on error."""
+        tmp: Optional[str] = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".entry-", suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+            return True
+        except Exception:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+            return False
+
+    @staticmethod
+    def touch(path: Path) -> None:
+        """Mark path as just used (atime only; mtime is left alone)."""
+        try:
+            st = os.stat(path)
+            os.utime(path, ns=(time.time_ns(), st.st_mtime_ns))
+        except OSError:
+            pass
+
+    def entries(self) -> List[CacheEntry]:
+        """Cache entries, least recently accessed first."""
+        found: List[CacheEntry] = []
+        try:
+            it = os.scandir(self.cache_dir)
+        except OSError:
+            return found
+        with it:
+            for e in it:
+                if not e.name.endswith(ENTRY_SUFFIXES) or e.name.startswith("."):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                found.append(CacheEntry(Path(e.path), st.st_size, st.st_atime))
+        found.sort(key=lambda c: (c.atime, c.path.name))
+        return found
+
+    # ----- Maintenance -----
+    def stats(self) -> CacheStats:
+        entries = self.entries()
+        stats = CacheStats(entries=len(entries), total_bytes=sum(e.size for e in entries))
+        stats.outputs = sum(1 for e in entries if e.path.name.endswith(OUTPUT_SUFFIX))
+        stats.snapshots = stats.entries - stats.outputs
+        if entries:
+            stats.oldest_access, stats.newest_access = entries[0].atime, entries[-1].atime
+        return stats
+
+    def prune(
+        self, *, max_bytes: Optional[int] = None, max_age: Optional[float] = None
+    ) -> PruneResult:
+        """Evict entries older than max_age, then LRU entries until within max_bytes.
+
+        Limits default to the manager's own; pass explicit values to override them.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        entries = self.entries()
+        total = sum(e.size for e in entries)
+        now = time.time()
+        result = PruneResult()
+        for e in entries:
+            expired = max_age is not None and now - e.atime > max_age
+            if not expired and (max_bytes is None or total <= max_bytes):
+                continue
+            if self._remove(e.path):
+                total -= e.size
+                result.removed += 1
+                result.freed_bytes += e.size
+        self._remove_stale_temp_files(now)
+        return result
+
+    def clear(self) -> PruneResult:
+        """Remove every entry, temp file and metadata file in the cache directory."""
+        result = PruneResult()
+        try:
+            paths = [p for p in self.cache_dir.iterdir() if p.is_file()]
+        except OSError:
+            return result
+        for p in paths:
+            size = _size(p)
+            if self._remove(p):
+                result.removed += 1
+                result.freed_bytes += size
+        return result
+
+    def _remove_stale_temp_files(self, now: float, grace: float = 3600.0) -> None:
+        # Leftovers from interrupted writes; recent ones may belong to a concurrent writer
+        try:
+            temps: List[Tuple[Path, float]] = [
+                (p, p.stat().st_mtime) for p in self.cache_dir.glob(".*.tmp")
+            ]
+        except OSError:
+            return
+        for p, mtime in temps:
+            if now - mtime > grace:
+                self._remove(p)
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+__all__ = [
+    "CacheManager",
+    "CacheEntry",
+    "CacheStats",
+    "PruneResult",
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MAX_AGE",
+    "default_cache_dir",
+    "parse_size",
+    "parse_age",
+]
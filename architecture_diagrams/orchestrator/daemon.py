@@ -0,0 +1,221 @@
+"""Build daemon: keep composed models warm and answer CLI requests over a Unix socket.
+
+``architecture-diagrams serve`` listens on ``.arch_diags_cache/serve.sock`` (override with
+ARCH_DIAGS_SOCKET). ``generate`` and ``list-views`` first try ``request()``; when no daemon
+is listening they fall back to doing the work in-process, so the daemon is purely an
+accelerator. Set ARCH_DIAGS_NO_DAEMON=1 to bypass a running daemon.
+
+Protocol: the client sends one JSON object per connection, ``{"op": ..., "params": {...}}``,
+followed by a newline. The daemon answers with one JSON line, either ``{"ok": true, ...}``
+or ``{"ok": false, "error": message, "error_type": exception class name}``.
+
+Each project gets a ``WarmProject``. Before every request its tree is re-scanned (file
+stats only) and changed modules are reloaded, so answers always reflect the files on
+disk. Changes to the architecture_diagrams package itself need a daemon restart.
+
+The client side (``request``) is imported by every CLI invocation, so the build machinery
+is only imported inside the daemon.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from architecture_diagrams.orchestrator.watch import WarmProject
+
+SOCKET_ENV = "ARCH_DIAGS_SOCKET"
+NO_DAEMON_ENV = "ARCH_DIAGS_NO_DAEMON"
+SOCKET_NAME = "serve.sock"
+DEFAULT_TIMEOUT = 300.0
+
+log = logging.getLogger("architecture-diagrams.serve")
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class DaemonError(RuntimeError):
+    """A request reached the daemon but failed there."""
+
+    def __init__(self, message: str, error_type: str = "") -> None:
+        super().__init__(message)
+        self.error_type = error_type
+
+
+def default_socket_path() -> Path:
+    env = os.environ.get(SOCKET_ENV)
+    if env:
+        return Path(env)
+    # cache.default_cache_dir(), without importing the cache module on every CLI call
+    return Path(__file__).resolve().parents[2] / ".arch_diags_cache" / SOCKET_NAME
+
+
+def request(
+    op: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    socket_path: Optional[Path] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Optional[Dict[str, Any]]:
+    """Send one request to a running daemon.
+
+    Returns None when no daemon is reachable (callers then work in-process) and raises
+    ``DaemonError`` when the daemon ran the request and it failed.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path or default_socket_path()
+    if not path.exists():
+        return None
+    payload = json.dumps({"op": op, "params": params or {}}).encode() + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(payload)
+            with sock.makefile("rb") as fh:
+                line = fh.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    response: Dict[str, Any] = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonError(str(response.get("error")), str(response.get("error_type", "")))
+    return response
+
+
+class WarmBuilds:
+    """Warm projects keyed by (project, project_path), created on first use."""
+
+    def __init__(self) -> None:
+        self.projects: Dict[Tuple[Optional[str], Optional[str]], WarmProject] = {}
+
+    def project(self, project: Optional[str], project_path: Optional[str]) -> WarmProject:
+        """The warm project, refreshed from any files changed since the last request."""
+        from architecture_diagrams.orchestrator.watch import WarmProject
+
+        key = (project, project_path)
+        warm = self.projects.get(key)
+        if warm is None:
+            warm = WarmProject(
+                project=project, project_path=Path(project_path) if project_path else None
+            )
+            self.projects[key] = warm
+        else:
+            warm.refresh()
+        return warm
+
+    def generate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Params mirror ``build_workspace``; returns {"text": exported workspace}."""
+        from architecture_diagrams.orchestrator.build import BuildTarget
+
+        p = dict(params)
+        warm = self.project(p.pop("project", None), p.pop("project_path", None))
+        overrides = {
+            k: p.pop(k)
+            for k in ("workspace_name", "tagging", "enable_cache", "cache_dir", "view_workers")
+            if k in p
+        }
+        if overrides.get("cache_dir"):
+            overrides["cache_dir"] = Path(overrides["cache_dir"])
+        return {"text": warm.render(BuildTarget(**p), **overrides)}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+            handler = self.server.handlers.get(message.get("op"))
+            if handler is None:
+                raise ValueError(f"Unknown op {message.get('op')!r}")
+            with self.server.lock:
+                response = {"ok": True, **handler(message.get("params") or {})}
+        except Exception as e:
+            log.debug("Request failed", exc_info=True)
+            response = {"ok": False, "error": str(e), "error_type": type(e).__name__}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, handlers: Dict[str, Handler]) -> None:
+        self.handlers = handlers
+        # Builds reload modules and share warm models; run them one at a time
+        self.lock = threading.Lock()
+        super().__init__(path, _Handler)
+
+
+class BuildDaemon:
+    """Serve ``handlers`` (op -> callable(params) -> response fields) on a Unix socket.
+
+    ``ping`` and ``shutdown`` are built in; ``generate`` defaults to ``WarmBuilds.generate``.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        handlers: Optional[Dict[str, Handler]] = None,
+    ) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("serve requires Unix domain socket support")
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.builds = WarmBuilds()
+        self.handlers: Dict[str, Handler] = {
+            "ping": self._ping,
+            "shutdown": self._shutdown,
+            "generate": self.builds.generate,
+            **(handlers or {}),
+        }
+        self._server: Optional[_Server] = None
+        self.ready = threading.Event()
+
+    def _ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"pid": os.getpid(), "projects": len(self.builds.projects)}
+
+    def _shutdown(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        server = self._server
+        if server is not None:
+            # shutdown() waits for serve_forever, which is busy with this request
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        return {}
+
+    def serve_forever(self) -> None:
+        """Listen until a ``shutdown`` request (or KeyboardInterrupt); removes the socket."""
+        path = self.socket_path
+        if path.exists():
+            if request("ping", socket_path=path, timeout=2.0) is not None:
+                raise RuntimeError(f"A daemon is already listening on {path}")
+            path.unlink()  # left behind by a daemon that did not exit cleanly
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = _Server(str(path), self.handlers)
+        try:
+            self.ready.set()
+            self._server.serve_forever(poll_interval=0.1)
+        finally:
+            self._server.server_close()
+            self._server = None
+            if path.exists():
+                path.unlink()
+
+
+__all__ = [
+    "BuildDaemon",
+    "DaemonError",
+    "WarmBuilds",
+    "default_socket_path",
+    "request",
+]
@@ -0,0 +1,154 @@
+"""Content digests for cache keys, memoized per file.
+
+Cache keys are content-addressed: a file contributes its path relative to the tree it
+belongs to and the SHA-256 of its bytes, never its mtime, so a ``git checkout`` or a CI
+cache restore of identical sources still hits. To avoid re-reading every file on each
+run, digests are memoized on ``(inode, size, mtime_ns)`` in ``file-digests.json`` under
+the cache directory; a file is only hashed again when one of those changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DIGESTS_VERSION = 1
+DIGESTS_NAME = "file-digests.json"
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+
+@lru_cache(maxsize=1)
+def package_version() -> str:
+    from importlib import metadata  # deferred: costs ~15 ms and only cache keys need it
+
+    try:
+        return metadata.version("architecture-diagrams")
+    except metadata.PackageNotFoundError:
+        return "0+unknown"
+
+
+class FileDigests:
+    """SHA-256 of file contents, memoized on (inode, size, mtime_ns) and persisted as JSON.
+
+    With ``path=None`` the memo only lives for this object.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.hashed = 0  # files actually read (memo misses)
+        self._memo: Dict[str, Tuple[int, int, int, str]] = {}
+        self._dirty = False
+        self._package: Optional[str] = None  # package sources digest, computed once
+        if path is not None:
+            self._load(path)
+
+    @classmethod
+    def in_cache_dir(cls, cache_dir: Path) -> "FileDigests":
+        return cls(cache_dir / DIGESTS_NAME)
+
+    def digest(self, path: Path) -> Optional[str]:
+        """Hex digest of path's contents, or None if it cannot be read."""
+        key = str(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        rec = self._memo.get(key)
+        if rec is not None and rec[:3] == stamp:
+            return rec[3]
+        try:
+            with open(key, "rb") as fh:
+                hexdigest = hashlib.file_digest(fh, "sha256").hexdigest()
+        except OSError:
+            return None
+        self.hashed += 1
+        self._memo[key] = (*stamp, hexdigest)
+        self._dirty = True
+        return hexdigest
+
+    def tree_digest(self, base_dir: Path, files: Iterable[Path]) -> str:
+        """Combined digest of files under base_dir, keyed by their relative paths."""
+        entries: List[Tuple[str, str]] = []
+        for p in files:
+            d = self.digest(p)
+            if d is None:
+                continue
+            try:
+                rel = p.relative_to(base_dir).as_posix()
+            except ValueError:
+                rel = p.as_posix()
+            entries.append((rel, d))
+        h = hashlib.sha256()
+        for rel, d in sorted(entries):
+            h.update(rel.encode("utf-8"))
+            h.update(b"\0")
+            h.update(d.encode("ascii"))
+        return h.hexdigest()
+
+    def python_tree_digest(self, base_dir: Path) -> str:
+        """Digest of every *.py file under base_dir ("" for a missing directory)."""
+        if not base_dir.exists():
+            return ""
+        return self.tree_digest(base_dir, base_dir.rglob("*.py"))
+
+    def code_digest(self, *objects: Any) -> str:
+        """Digest of the package version, the package sources and the given objects' modules.
+
+        Pass plugin callables (e.g. an exporter registered from outside the package) so
+        edits to their source also change the key.
+        """
+        if self._package is None:
+            self._package = self.python_tree_digest(PACKAGE_DIR)
+        h = hashlib.sha256()
+        h.update(package_version().encode("utf-8"))
+        h.update(self._package.encode("ascii"))
+        for obj in objects:
+            try:
+                src = inspect.getsourcefile(obj)
+            except TypeError:
+                src = None
+            if src is None:
+                continue
+            path = Path(src).resolve()
+            if PACKAGE_DIR in path.parents:
+                continue  # already covered by the package digest
+            h.update((self.digest(path) or "").encode("ascii"))
+        return h.hexdigest()
+
+    # ----- Persistence -----
+    def _load(self, path: Path) -> None:
+        try:
+            data = json.loads(path.read_text())
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("version") != DIGESTS_VERSION:
+            return
+        files = data.get("files") or {}
+        self._memo = {k: (v[0], v[1], v[2], v[3]) for k, v in files.items() if len(v) == 4}
+
+    def save(self) -> None:
+        """Write the memo atomically if anything changed; errors are ignored."""
+        if self.path is None or not self._dirty:
+            return
+        payload = {"version": DIGESTS_VERSION, "files": self._memo}
+        tmp: Optional[str] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".digests-", suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(payload, fh)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+
+__all__ = ["FileDigests", "package_version", "DIGESTS_NAME"]
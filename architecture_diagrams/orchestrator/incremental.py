@@ -0,0 +1,502 @@
+"""Incremental composition: replay only the model modules whose source changed.
+
+``IncrementalComposer.compose`` runs the project builders like ``compose`` but records,
+for every ``define_*``/``link_*`` call made through ``auto_register`` (a *unit*), which
+people, systems, containers, components and relationships it created. After editing
+e.g. ``payments_c4.py``, ``update(["projects.banking.models.payments_c4"])`` reloads
+that module, retracts the contributions of its units and replays them.
+
+Dependencies are tracked so the result matches a full rebuild:
+  - a unit whose elements live under a retracted element (a container added to another
+    module's system) or whose relationships touch one is retracted and replayed too;
+  - a unit that merged into or modified another unit's elements (re-declaring a system,
+    a duplicate relationship, extra tags) is tied to that unit in both directions.
+Replayed units run in their original order and element/relationship insertion order is
+restored afterwards, so exports are identical to composing from scratch.
+
+A unit's contributions are found without rescanning the model: only the top-level
+elements it created, looked up, re-declared or tagged are walked, plus the relationships
+stored since it started. One full comparison at the end of ``compose`` and ``update``
+catches anything changed another way (e.g. through a reference kept from an earlier
+unit); tracking is then abandoned and callers compose from scratch.
+
+``update`` returns None whenever it cannot guarantee that: the changed module holds no
+recorded unit (e.g. system_landscape.py or a shared helper), a builder changed the model
+outside any unit, or an affected unit removed elements or touched groups, deployment
+nodes, views or styles. Callers then compose from scratch.
+
+The composer owns its model and mutates it in place; build views, run overlays and
+tagging on a copy.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from architecture_diagrams.c4.auto_two_phase import phase_runner
+from architecture_diagrams.c4.model import (
+    Component,
+    Container,
+    ElementBase,
+    Person,
+    Relationship,
+    SoftwareSystem,
+)
+from architecture_diagrams.c4.relationship_store import RelationshipStore
+from architecture_diagrams.c4.system_landscape import SystemLandscape
+from architecture_diagrams.orchestrator.compose import ModelBuilder
+
+_Sig = Tuple[Any, ...]
+
+
+@dataclass(eq=False)
+class _Unit:
+    """What one define_/link_ call (or code between calls, module=None) contributed."""
+
+    order: int
+    module: Optional[str]
+    function: Optional[str]
+    elements: List[ElementBase] = field(default_factory=list)
+    relationships: List[Relationship] = field(default_factory=list)
+    depends_on: Set[int] = field(default_factory=set)  # orders of units merged into/modified
+    opaque: bool = False  # removed elements or touched state we do not track
+
+    @property
+    def label(self) -> str:
+        return f"{self.module}.{self.function}" if self.module else "<builder>"
+
+    @property
+    def replayable(self) -> bool:
+        return self.module is not None and not self.opaque
+
+
+def _element_sig(e: ElementBase) -> _Sig:
+    return (e.description, e.technology, frozenset(e.tags))
+
+
+def _rel_sig(r: Relationship) -> _Sig:
+    return (id(r.source), id(r.destination), r.description, r.technology, frozenset(r.tags))
+
+
+def _tracked_elements(model: SystemLandscape) -> Iterator[ElementBase]:
+    yield from model.people.values()
+    for s in model.software_systems.values():
+        yield s
+        for c in s.containers:
+            yield c
+            yield from c.components
+
+
+def _root(e: ElementBase) -> ElementBase:
+    while e.parent is not None:
+        e = e.parent
+    return e
+
+
+def _subtree(root: ElementBase) -> Iterator[ElementBase]:
+    yield root
+    yield from _descendants(root)
+
+
+def _untracked_state(model: SystemLandscape) -> _Sig:
+    styles = model.styles
+    return (
+        tuple((k, tuple(id(s) for s in v)) for k, v in model.groups.items()),
+        len(model.deployment_nodes),
+        len(model.views),
+        len(styles.element_styles),
+        len(styles.relationship_styles),
+        len(styles.themes),
+    )
+
+
+def _untracked_counts(model: SystemLandscape) -> _Sig:
+    """Cheap per-unit stand-in for ``_untracked_state`` (sizes only)."""
+    styles = model.styles
+    return (
+        tuple(len(v) for v in model.groups.values()),
+        len(model.deployment_nodes),
+        len(model.views),
+        len(styles.element_styles),
+        len(styles.relationship_styles),
+        len(styles.themes),
+    )
+
+
+def _descendants(e: ElementBase) -> Iterator[ElementBase]:
+    if isinstance(e, SoftwareSystem):
+        for c in e.containers:
+            yield c
+            yield from c.components
+    elif isinstance(e, Container):
+        yield from e.components
+
+
+class IncrementalComposer:
+    """Compose a model once, then replay only the units of changed modules."""
+
+    def __init__(self) -> None:
+        self.model: Optional[SystemLandscape] = None
+        self.units: List[_Unit] = []
+        self.last_replayed: List[str] = []  # unit labels replayed by the last update
+        self._supported = False
+        self._owner: Dict[int, _Unit] = {}  # id(element or relationship) -> creating unit
+        self._elements: Dict[int, Tuple[ElementBase, _Sig]] = {}
+        self._members: Dict[int, Set[int]] = {}  # id(top-level element) -> ids in its subtree
+        self._root_counts: Tuple[int, int] = (0, 0)  # len(people), len(software_systems)
+        self._rels: Dict[int, Tuple[Relationship, _Sig]] = {}
+        self._store: Optional[RelationshipStore] = None
+        self._rel_seq = 0  # store sequence at the last capture
+        self._state: _Sig = ()
+        self._counts: _Sig = ()
+        self._active: Optional[_Unit] = None
+
+    # ----- Full composition -----
+    def compose(
+        self, builders: Iterable[ModelBuilder], *, name: str = "banking"
+    ) -> SystemLandscape:
+        """Run builders like ``compose()``, recording each unit's contributions."""
+        model = SystemLandscape(name=name)
+        self.model, self.units, self.last_replayed = model, [], []
+        self._owner, self._supported = {}, True
+        self._capture()
+        token = phase_runner.set(self._run_unit)
+        try:
+            for builder in builders:
+                result = builder(model)
+                if result is not model:
+                    # The builder swapped the model object; nothing recorded applies to it
+                    self._supported = False
+                    model = result
+        finally:
+            phase_runner.reset(token)
+        self._close_gap()
+        if self._supported and not self._verify():
+            self._supported = False
+        self.model = model
+        return model
+
+    def _run_unit(self, module: str, function: str, call: Callable[[], Any]) -> Any:
+        if self._active is not None or not self._supported:
+            return call()  # nested units are attributed to the outer one
+        self._close_gap()
+        unit = _Unit(order=len(self.units), module=module, function=function)
+        self.units.append(unit)
+        return self._record(unit, call)
+
+    def _close_gap(self) -> None:
+        """Attribute changes made outside any unit (builder code) to an opaque unit."""
+        if not self._supported:
+            return
+        gap = _Unit(order=len(self.units), module=None, function=None, opaque=True)
+        if self._diff(gap):
+            # Replaying units could resurrect what the builder removed; give up tracking
+            self._supported = False
+        elif gap.elements or gap.relationships or gap.depends_on:
+            self.units.append(gap)
+
+    def _record(self, unit: _Unit, call: Callable[[], Any]) -> Any:
+        model = self.model
+        assert model is not None
+        touched: Set[int] = set()
+        reached: Dict[int, ElementBase] = {}  # top-level elements the unit may have changed
+        merged: Dict[int, Relationship] = {}  # existing relationships returned again
+
+        def note(obj: Any) -> Any:
+            owner = self._owner.get(id(obj))
+            if owner is not None and owner is not unit:
+                touched.add(owner.order)
+            return reach(obj)
+
+        def reach(obj: Any) -> Any:
+            if isinstance(obj, ElementBase):
+                root = _root(obj)
+                reached[id(root)] = root
+            elif isinstance(obj, Relationship) and id(obj) in self._rels:
+                merged[id(obj)] = obj
+            return obj
+
+        def returning(method: Callable[..., Any], seen: Callable[[Any], Any]) -> Callable[..., Any]:
+            return lambda *args, **kwargs: seen(method(*args, **kwargs))
+
+        def reporting(method: Callable[[ElementBase], None]) -> Callable[[ElementBase], None]:
+            return lambda element: method(reach(element))
+
+        # Re-declarations return the existing object; tie this unit to its creator. Lookups
+        # and tag reports name the top-level elements whose subtrees _diff has to walk.
+        patched = {
+            "add_relationship": returning(model.add_relationship, note),
+            "add_software_system": returning(model.add_software_system, note),
+            "find_system": returning(model.find_system, reach),
+            "find_person": returning(model.find_person, reach),
+            "get_container": returning(model.get_container, reach),
+            "_track_tags": reporting(model._track_tags),
+        }
+        for name, method in patched.items():
+            setattr(model, name, method)
+        self._active = unit
+        try:
+            return call()
+        finally:
+            self._active = None
+            for name in patched:
+                delattr(model, name)
+            unit.depends_on |= touched
+            self._diff(unit, reached.values(), merged.values())
+
+    # ----- Change tracking -----
+    def _capture(self) -> None:
+        model = self.model
+        assert model is not None
+        self._elements, self._members = {}, {}
+        for root in (*model.people.values(), *model.software_systems.values()):
+            members = self._members[id(root)] = set()
+            for e in _subtree(root):
+                self._elements[id(e)] = (e, _element_sig(e))
+                members.add(id(e))
+        self._root_counts = (len(model.people), len(model.software_systems))
+        self._rels = {id(r): (r, _rel_sig(r)) for r in model.relationships}
+        self._store, self._rel_seq = model.relationships, model.relationships.next_seq
+        self._state, self._counts = _untracked_state(model), _untracked_counts(model)
+
+    def _new_roots(self) -> Tuple[List[ElementBase], bool]:
+        """Top-level elements added since the last diff, and whether any were removed."""
+        model = self.model
+        assert model is not None
+        added: List[ElementBase] = []
+        removed = False
+        stores: Tuple[Dict[str, Any], ...] = (model.people, model.software_systems)
+        for store, before in zip(stores, self._root_counts, strict=True):
+            if len(store) < before:
+                removed = True
+            elif len(store) > before:
+                added.extend(list(store.values())[before:])
+        if any(id(root) in self._members for root in added):
+            removed = True  # a root was dropped and the dict refilled
+        self._root_counts = (len(model.people), len(model.software_systems))
+        return added, removed
+
+    def _diff(
+        self,
+        unit: _Unit,
+        reached: Iterable[ElementBase] = (),
+        merged: Iterable[Relationship] = (),
+    ) -> bool:
+        """Record what changed since the last diff as unit's contribution.
+
+        Only the subtrees of new and ``reached`` top-level elements are compared, and only
+        relationships stored since the last diff or ``merged`` into; ``_verify`` checks the
+        rest. Returns True if elements or relationships were removed or rewired.
+        """
+        model = self.model
+        assert model is not None
+        new_roots, destructive = self._new_roots()
+        roots: Dict[int, ElementBase] = {
+            id(r): r for r in reached if isinstance(r, (Person, SoftwareSystem))
+        }
+        roots.update((id(r), r) for r in new_roots)
+        for key, root in roots.items():
+            members: Set[int] = set()
+            for e in _subtree(root):
+                eid = id(e)
+                members.add(eid)
+                known = self._elements.get(eid)
+                sig = _element_sig(e)
+                if known is None:
+                    unit.elements.append(e)
+                    self._owner[eid] = unit
+                elif known[1] != sig:
+                    owner = self._owner.get(eid)
+                    if owner is not None and owner is not unit:
+                        unit.depends_on.add(owner.order)
+                self._elements[eid] = (e, sig)
+            gone = self._members.get(key, set()) - members
+            if gone:
+                destructive = True
+                for eid in gone:
+                    self._elements.pop(eid, None)
+            self._members[key] = members
+
+        store = model.relationships
+        added = store.stored_since(self._rel_seq) if store is self._store else None
+        if added is None or len(store) != len(self._rels) + len(added):
+            # Replaced wholesale or relationships removed: compare everything once
+            destructive = True
+            added = [r for r in store if id(r) not in self._rels]
+            self._rels = {id(r): (r, _rel_sig(r)) for r in store}
+        for r in added:
+            unit.relationships.append(r)
+            self._owner[id(r)] = unit
+            self._rels[id(r)] = (r, _rel_sig(r))
+        for r in merged:
+            known_rel = self._rels.get(id(r))
+            if known_rel is not None and known_rel[1] != _rel_sig(r):
+                destructive = True  # edited in place
+                self._rels[id(r)] = (r, _rel_sig(r))
+        self._store, self._rel_seq = store, store.next_seq
+
+        counts = _untracked_counts(model)
+        if counts != self._counts:
+            unit.opaque = True
+            self._counts = counts
+        unit.opaque |= destructive
+        return destructive
+
+    def _verify(self) -> bool:
+        """Whether the recorded state matches the model, i.e. every change was attributed."""
+        model = self.model
+        assert model is not None
+        elements = {id(e): _element_sig(e) for e in _tracked_elements(model)}
+        rels = {id(r): _rel_sig(r) for r in model.relationships}
+        return (
+            elements == {k: sig for k, (_, sig) in self._elements.items()}
+            and rels == {k: sig for k, (_, sig) in self._rels.items()}
+            and _untracked_state(model) == self._state
+        )
+
+    # ----- Incremental update -----
+    def update(
+        self, changed_modules: Iterable[str], *, reload: bool = True
+    ) -> Optional[SystemLandscape]:
+        """Reload changed modules and replay the affected units; None if a full compose is needed."""
+        model = self.model
+        if model is None or not self._supported:
+            return None
+        changed = set(changed_modules)
+        by_module = {u.module for u in self.units if u.module}
+        if not changed or not changed <= by_module:
+            return None
+        if reload:
+            for name in sorted(changed):
+                importlib.reload(sys.modules[name])
+        affected = self._affected({u.order for u in self.units if u.module in changed})
+        units = [self.units[i] for i in sorted(affected)]
+        if not all(u.replayable and self._function(u) is not None for u in units):
+            return None
+        removed = self._removed_elements(units)
+        if any(id(s) in removed for systems in model.groups.values() for s in systems):
+            return None
+        if model.views:
+            return None
+
+        self._retract(units, removed)
+        self._capture()
+        try:
+            for unit in units:
+                fresh = _Unit(order=unit.order, module=unit.module, function=unit.function)
+                self.units[unit.order] = fresh
+                fn = self._function(fresh)
+                assert fn is not None
+                self._record(fresh, partial(fn, model))
+        except Exception:
+            # The model is half-replayed; force the next update to recompose
+            self.model, self._supported = None, False
+            raise
+        if not self._verify():
+            # A replayed unit changed elements it did not look up; ties may be missing
+            self.model, self._supported = None, False
+            return None
+        self._reorder()
+        self.last_replayed = [u.label for u in units]
+        return model
+
+    @staticmethod
+    def _function(unit: _Unit) -> Optional[Callable[[SystemLandscape], Any]]:
+        module = sys.modules.get(unit.module or "")
+        fn = getattr(module, unit.function or "", None)
+        return fn if callable(fn) else None
+
+    def _affected(self, seeds: Set[int]) -> Set[int]:
+        """Close seeds over element nesting, relationship endpoints and merge/modify ties."""
+        affected = set(seeds)
+        while True:
+            removed = self._removed_elements([self.units[i] for i in affected])
+            grown = set(affected)
+            for u in self.units:
+                if u.order in grown:
+                    continue
+                if (
+                    u.depends_on & affected
+                    or any(u.order in self.units[i].depends_on for i in affected)
+                    or any(id(e) in removed for e in u.elements)
+                    or any(
+                        id(r.source) in removed or id(r.destination) in removed
+                        for r in u.relationships
+                    )
+                ):
+                    grown.add(u.order)
+            if grown == affected:
+                return affected
+            affected = grown
+
+    @staticmethod
+    def _removed_elements(units: Iterable[_Unit]) -> Dict[int, ElementBase]:
+        removed: Dict[int, ElementBase] = {}
+        for u in units:
+            for e in u.elements:
+                removed[id(e)] = e
+                for d in _descendants(e):
+                    removed[id(d)] = d
+        return removed
+
+    def _retract(self, units: List[_Unit], removed: Dict[int, ElementBase]) -> None:
+        model = self.model
+        assert model is not None
+        dropped = {id(r) for u in units for r in u.relationships}
+        model.relationships = [
+            r
+            for r in model.relationships
+            if id(r) not in dropped
+            and id(r.source) not in removed
+            and id(r.destination) not in removed
+        ]
+        for e in removed.values():
+            parent = e.parent
+            if isinstance(e, Person):
+                model.remove_person(e)
+            elif isinstance(e, SoftwareSystem):
+                model.remove_software_system(e)
+            elif isinstance(e, Container) and isinstance(parent, SoftwareSystem):
+                if id(parent) not in removed and parent._containers.get(e.name) is e:
+                    del parent._containers[e.name]
+            elif isinstance(e, Component) and isinstance(parent, Container):
+                if id(parent) not in removed and parent._components.get(e.name) is e:
+                    del parent._components[e.name]
+            model._all_ids.discard(e.id)
+            self._owner.pop(id(e), None)
+        for key in dropped:
+            self._owner.pop(key, None)
+
+    def _reorder(self) -> None:
+        """Restore the insertion order a full compose would have produced."""
+        model = self.model
+        assert model is not None
+        pos: Dict[int, Tuple[int, int]] = {}
+        for u in self.units:
+            for i, e in enumerate(u.elements):
+                pos[id(e)] = (u.order, i)
+            for i, r in enumerate(u.relationships):
+                pos[id(r)] = (u.order, i)
+
+        def key(item: Tuple[str, Any]) -> Tuple[int, int]:
+            return pos.get(id(item[1]), (-1, 0))
+
+        model.people = dict(sorted(model.people.items(), key=key))
+        model.software_systems = dict(sorted(model.software_systems.items(), key=key))
+        for s in model.software_systems.values():
+            s._containers = dict(sorted(s._containers.items(), key=key))
+            for c in s._containers.values():
+                c._components = dict(sorted(c._components.items(), key=key))
+        model.relationships = sorted(model.relationships, key=lambda r: pos.get(id(r), (-1, 0)))
+        model.reindex_names()
+        model._containers_index = {
+            (s.name, c.name): c for s in model.software_systems.values() for c in s.containers
+        }
+        self._capture()
+
+
+__all__ = ["IncrementalComposer"]
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from importlib import import_module
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
-from typing import List, Optional
+from types import ModuleType
+from typing import Callable, Collection, Iterable, List, Optional, Tuple
 
 from architecture_diagrams.orchestrator.compose import ModelBuilder
+from architecture_diagrams.orchestrator.manifest import MANIFEST_NAME, DiscoveryManifest
 from architecture_diagrams.orchestrator.specs import ViewSpec
 
 
@@ -67,6 +72,200 @@ def preload_external_project_packages(paths: List[Path]) -> None:
         pass
 
 
+Overlay = Callable[[object], None]
+
+BUILDERS = "builders"
+VIEWS = "views"
+OVERLAYS = "overlays"
+ALL_KINDS = frozenset({BUILDERS, VIEWS, OVERLAYS})
+
+# Upper bound for concurrent view module imports
+MAX_IMPORT_WORKERS = 8
+
+# Serialises file-location imports, which bypass the import system's per-module locks
+_FILE_IMPORT_LOCK = threading.Lock()
+
+
+@dataclass
+class DiscoveredModules:
+    """Hooks found by one discovery pass, each list in file discovery order."""
+
+    builders: List[ModelBuilder] = field(default_factory=list)
+    view_specs: List[ViewSpec] = field(default_factory=list)
+    overlays: List[Overlay] = field(default_factory=list)
+
+
+@dataclass
+class _Classified:
+    builders: List[Path] = field(default_factory=list)
+    views: List[Tuple[Path, str]] = field(default_factory=list)  # (path, project label)
+    overlays: List[Path] = field(default_factory=list)
+
+
+def _classify_models_file(rel_parts: Tuple[str, ...], path: Path, out: _Classified) -> None:
+    # rel_parts is relative to a models/ directory
+    if path.name == "system_landscape.py":
+        out.builders.append(path)
+    if rel_parts[0] == "overlays" and not path.name.startswith("_"):
+        out.overlays.append(path)
+
+
+def _walk(base_dir: Path, role: str, out: _Classified, manifest: DiscoveryManifest) -> None:
+    """Walk base_dir once and classify every Python file by its role in the project layout.
+
+    role is "project" (projects/<name>), "models" or "views". The listing comes from the
+    discovery manifest when the tree is unchanged since the last walk.
+    """
+    base_dir = base_dir.absolute()
+    for path in manifest.files(base_dir):
+        parts = path.relative_to(base_dir).parts
+        if role == "project":
+            if len(parts) < 2:
+                continue
+            role_here, parts = parts[0], parts[1:]
+            label = base_dir.name
+        else:
+            role_here, label = role, base_dir.parent.name
+        if role_here == "models":
+            _classify_models_file(parts, path, out)
+        elif role_here == "views" and not path.name.startswith("_"):
+            out.views.append((path, label))
+
+
+def _module_name(root: Path, path: Path) -> str:
+    # Prefer repo-relative when possible, otherwise synthesize a unique name
+    try:
+        rel = path.relative_to(root).with_suffix("")
+        return ".".join(rel.parts)
+    except Exception:
+        return "external_" + "_".join(path.with_suffix("").parts[-6:])
+
+
+def _import_path(root: Path, path: Path) -> Optional[ModuleType]:
+    mod_name = _module_name(root, path)
+    try:
+        return import_module(mod_name)
+    except ImportError:
+        pass
+    with _FILE_IMPORT_LOCK:
+        loaded = sys.modules.get(mod_name)
+        if loaded is not None and getattr(loaded, "__file__", None) == str(path):
+            return loaded
+        spec = spec_from_file_location(mod_name, path)
+        if spec is None or spec.loader is None:
+            return None
+        mod = module_from_spec(spec)
+        sys.modules[mod_name] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except BaseException:
+            sys.modules.pop(mod_name, None)
+            raise
+        return mod
+
+
+def _may_export(manifest: DiscoveryManifest, path: Path, hook: str) -> bool:
+    hooks = manifest.hooks(path)
+    return hooks is None or hook in hooks
+
+
+def _import_all(
+    root: Path, paths: List[Path], hook: str, manifest: DiscoveryManifest, concurrent: bool
+) -> List[Tuple[Path, ModuleType]]:
+    """Import the modules exporting ``hook``; results follow the order of paths.
+
+    Modules the manifest knows not to export the hook (and unchanged since) are skipped.
+    """
+    wanted = [p for p in paths if _may_export(manifest, p, hook)]
+    if not concurrent or len(wanted) < 2:
+        modules = [_import_path(root, p) for p in wanted]
+    else:
+        workers = min(MAX_IMPORT_WORKERS, len(wanted))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="arch-diags-import"
+        ) as pool:
+            modules = list(pool.map(lambda p: _import_path(root, p), wanted))
+    result: List[Tuple[Path, ModuleType]] = []
+    for path, mod in zip(wanted, modules, strict=True):
+        if mod is not None:
+            manifest.record(path, mod)
+            result.append((path, mod))
+    return result
+
+
+def discover_project(
+    root: Path,
+    project: Optional[str] = None,
+    *,
+    extra_model_dirs: Optional[Iterable[Path]] = None,
+    extra_view_dirs: Optional[Iterable[Path]] = None,
+    kinds: Collection[str] = ALL_KINDS,
+    cache_dir: Optional[Path] = None,
+    use_manifest: bool = False,
+) -> DiscoveredModules:
+    """Discover builders, view specs and overlays with a single walk per directory tree.
+
+    Searches projects/<project> (models/ and views/) plus any external models/ and views/
+    directories. Within the walk, files are classified as:
+      - builders: models/**/system_landscape.py exporting build(model)
+      - overlays: models/overlays/**/*.py exporting apply(model)
+      - views: views/**/*.py exporting get_views()
+    View modules are independent of each other and are imported concurrently; results keep
+    file discovery order. ``kinds`` limits which hooks are imported.
+
+    With ``use_manifest``, directory listings and module hooks are persisted in a
+    discovery manifest under ``cache_dir`` (default: <root>/.arch_diags_cache) so warm
+    runs skip walking unchanged trees; ``build_workspace`` enables it with its cache.
+    """
+    model_dirs = [d for d in (extra_model_dirs or []) if d.exists()]
+    view_dirs = [d for d in (extra_view_dirs or []) if d.exists()]
+    external = model_dirs + view_dirs
+    if external:
+        _ensure_projects_parent_on_syspath(external)
+        preload_external_project_packages(external)
+
+    manifest = DiscoveryManifest(
+        (cache_dir or root / ".arch_diags_cache") / MANIFEST_NAME if use_manifest else None
+    )
+    found = _Classified()
+    if project:
+        project_dir = root / "projects" / project
+        if project_dir.exists():
+            _walk(project_dir, "project", found, manifest)
+    for d in model_dirs:
+        _walk(d, "models", found, manifest)
+    for d in view_dirs:
+        _walk(d, "views", found, manifest)
+
+    result = DiscoveredModules()
+    if BUILDERS in kinds:
+        for _, mod in _import_all(root, found.builders, "build", manifest, concurrent=False):
+            if hasattr(mod, "build"):
+                result.builders.append(mod.build)
+    if OVERLAYS in kinds:
+        for _, mod in _import_all(root, found.overlays, "apply", manifest, concurrent=False):
+            func = getattr(mod, "apply", None)
+            if callable(func):
+                result.overlays.append(func)
+    if VIEWS in kinds:
+        labels = dict(found.views)
+        view_paths = [p for p, _ in found.views]
+        for path, mod in _import_all(root, view_paths, "get_views", manifest, concurrent=True):
+            if not hasattr(mod, "get_views"):
+                continue
+            project_label = labels[path]
+            views = mod.get_views()
+            # Annotate each view with the originating project label
+            for v in views:
+                try:
+                    v.project = project_label
+                except Exception:
+                    pass
+            result.view_specs.extend(views)
+    manifest.save()
+    return result
+
+
 def discover_model_builders(
     root: Path, project: Optional[str] = None, extra_dirs: Optional[List[Path]] = None
 ) -> List[ModelBuilder]:
@@ -77,42 +276,7 @@ def discover_model_builders(
 
     Each module must export a callable "build(model: Optional[SystemLandscape]) -> SystemLandscape".
     """
-    results: List[ModelBuilder] = []
-    searched: List[Path] = []
-    if extra_dirs:
-        _ensure_projects_parent_on_syspath(extra_dirs)
-        preload_external_project_packages(extra_dirs)
-
-    if project:
-        pref_root = root / "projects" / project / "models"
-        if pref_root.exists():
-            searched.append(pref_root)
-    # Support external project directories passed by build: allow direct models/ under provided root
-    if extra_dirs:
-        for d in extra_dirs:
-            if d.exists():
-                searched.append(d)
-
-    for base_dir in searched:
-        for path in base_dir.rglob("system_landscape.py"):
-            # Derive a module name; prefer repo-relative when possible, otherwise synthesize a unique name
-            try:
-                rel = path.relative_to(root).with_suffix("")
-                mod_name = ".".join(rel.parts)
-            except Exception:
-                mod_name = "external_" + "_".join(path.with_suffix("").parts[-6:])
-            try:
-                mod = import_module(mod_name)
-            except Exception:
-                spec = spec_from_file_location(mod_name, path)
-                if spec is None or spec.loader is None:
-                    continue
-                mod = module_from_spec(spec)
-                sys.modules[mod_name] = mod
-                spec.loader.exec_module(mod)
-            if hasattr(mod, "build"):
-                results.append(mod.build)
-    return results
+    return discover_project(root, project, extra_model_dirs=extra_dirs, kinds={BUILDERS}).builders
 
 
 def discover_view_specs(
@@ -123,50 +287,7 @@ def discover_view_specs(
     Supported layout (enforced):
       - projects/<project>/views/**/*.py
     """
-    results: List[ViewSpec] = []
-    searched: List[Path] = []
-    if extra_dirs:
-        _ensure_projects_parent_on_syspath(extra_dirs)
-        preload_external_project_packages(extra_dirs)
-    if project:
-        pref_root = root / "projects" / project / "views"
-        if pref_root.exists():
-            searched.append(pref_root)
-    # Support external project directories passed by build: allow direct views/ under provided root
-    if extra_dirs:
-        for d in extra_dirs:
-            if d.exists():
-                searched.append(d)
-
-    for base_dir in searched:
-        project_label = base_dir.parent.name
-        for path in base_dir.rglob("*.py"):
-            if path.name.startswith("_"):
-                continue
-            try:
-                rel = path.relative_to(root).with_suffix("")
-                mod_name = ".".join(rel.parts)
-            except Exception:
-                mod_name = "external_" + "_".join(path.with_suffix("").parts[-6:])
-            try:
-                mod = import_module(mod_name)
-            except Exception:
-                spec = spec_from_file_location(mod_name, path)
-                if spec is None or spec.loader is None:
-                    continue
-                mod = module_from_spec(spec)
-                sys.modules[mod_name] = mod
-                spec.loader.exec_module(mod)
-            if hasattr(mod, "get_views"):
-                views = mod.get_views()
-                # Annotate each view with the originating project label
-                for v in views:
-                    try:
-                        v.project = project_label
-                    except Exception:
-                        pass
-                results.extend(views)
-    return results
+    return discover_project(root, project, extra_view_dirs=extra_dirs, kinds={VIEWS}).view_specs
 
 
 def discover_overlays(
@@ -179,40 +300,5 @@ def discover_overlays(
       - For external overlays, pass directories via extra_dirs
     Returns a list of callables.
     """
-    results: List[object] = []
-    searched: List[Path] = []
-    if extra_dirs:
-        _ensure_projects_parent_on_syspath(extra_dirs)
-        preload_external_project_packages(extra_dirs)
-    if project:
-        pref_root = root / "projects" / project / "models" / "overlays"
-        if pref_root.exists():
-            searched.append(pref_root)
-    if extra_dirs:
-        for d in extra_dirs:
-            ov = d / "overlays"
-            if ov.exists():
-                searched.append(ov)
-
-    for base_dir in searched:
-        for path in base_dir.rglob("*.py"):
-            if path.name.startswith("_"):
-                continue
-            try:
-                rel = path.relative_to(root).with_suffix("")
-                mod_name = ".".join(rel.parts)
-            except Exception:
-                mod_name = "external_" + "_".join(path.with_suffix("").parts[-6:])
-            try:
-                mod = import_module(mod_name)
-            except Exception:
-                spec = spec_from_file_location(mod_name, path)
-                if spec is None or spec.loader is None:
-                    continue
-                mod = module_from_spec(spec)
-                sys.modules[mod_name] = mod
-                spec.loader.exec_module(mod)
-            func = getattr(mod, "apply", None)
-            if callable(func):
-                results.append(func)
-    return results
+    found = discover_project(root, project, extra_model_dirs=extra_dirs, kinds={OVERLAYS})
+    return list(found.overlays)
@@ -0,0 +1,150 @@
+"""Persistent discovery manifest for project trees.
+
+Discovery normally walks every models/ and views/ tree on each CLI call. With the build
+cache enabled, the manifest (stored in the cache directory) remembers, per walked tree, the Python files found
+and the mtime of every directory visited, plus per module its file mtime, module name
+and which loader hooks (``build``, ``get_views``, ``apply``) it exports.
+
+A tree listing is reused while none of its directories changed mtime: adding, removing
+or renaming a file updates the mtime of the directory holding it, so a warm run only
+stats directories instead of listing them. Hook records are reused while the file's
+own mtime is unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "discovery-manifest.json"
+HOOKS = ("build", "get_views", "apply")
+
+log = logging.getLogger("architecture-diagrams.discovery")
+
+
+def walk_python_files(base_dir: Path) -> Tuple[List[Path], Dict[str, int]]:
+    """List *.py files under base_dir and record the mtime of each directory visited.
+
+    Order matches ``Path.rglob("*.py")``: a directory's files first, then its
+    subdirectories depth-first, both in scandir order. Symlinked directories and
+    __pycache__ are not entered.
+    """
+    files: List[Path] = []
+    dirs: Dict[str, int] = {}
+
+    def visit(d: Path) -> None:
+        try:
+            dirs[str(d)] = d.stat().st_mtime_ns
+            with os.scandir(d) as it:
+                entries = list(it)
+        except OSError:
+            return
+        subdirs: List[Path] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir() and not entry.is_symlink()
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name != "__pycache__":
+                    subdirs.append(Path(entry.path))
+            elif entry.name.endswith(".py"):
+                files.append(Path(entry.path))
+        for sub in subdirs:
+            visit(sub)
+
+    visit(base_dir)
+    return files, dirs
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class DiscoveryManifest:
+    """Cached tree listings and module hook records, persisted as JSON.
+
+    With ``path=None`` the manifest only lives for the current discovery pass.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.walks = 0  # trees actually walked (not served from the manifest)
+        self._trees: Dict[str, Dict[str, Any]] = {}
+        self._modules: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if path is not None:
+            self._load(path)
+
+    @classmethod
+    def in_cache_dir(cls, cache_dir: Path) -> "DiscoveryManifest":
+        return cls(cache_dir / MANIFEST_NAME)
+
+    # ----- Tree listings -----
+    def files(self, base_dir: Path) -> List[Path]:
+        """Python files under base_dir, from the manifest when its directories are unchanged."""
+        key = str(base_dir.absolute())
+        tree = self._trees.get(key)
+        if tree is not None and all(_mtime_ns(d) == mtime for d, mtime in tree["dirs"].items()):
+            return [Path(f) for f in tree["files"]]
+        files, dirs = walk_python_files(Path(key))
+        self.walks += 1
+        self._trees[key] = {"dirs": dirs, "files": [str(f) for f in files]}
+        self._dirty = True
+        return files
+
+    # ----- Module hooks -----
+    def hooks(self, path: Path) -> Optional[FrozenSet[str]]:
+        """Hooks the module at path exported when last imported, or None if unknown/stale."""
+        rec = self._modules.get(str(path))
+        if rec is None or _mtime_ns(str(path)) != rec["mtime_ns"]:
+            return None
+        return frozenset(rec["hooks"])
+
+    def record(self, path: Path, module: ModuleType) -> None:
+        hooks = sorted(h for h in HOOKS if callable(getattr(module, h, None)))
+        rec = {"mtime_ns": _mtime_ns(str(path)), "module": module.__name__, "hooks": hooks}
+        if self._modules.get(str(path)) != rec:
+            self._modules[str(path)] = rec
+            self._dirty = True
+
+    # ----- Persistence -----
+    def _load(self, path: Path) -> None:
+        try:
+            data = json.loads(path.read_text())
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return
+        self._trees = dict(data.get("trees") or {})
+        self._modules = dict(data.get("modules") or {})
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything changed; failures are logged."""
+        if self.path is None or not self._dirty:
+            return
+        payload = {"version": MANIFEST_VERSION, "trees": self._trees, "modules": self._modules}
+        tmp: Optional[str] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".manifest-", suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(payload, fh)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as exc:
+            log.warning("Could not write discovery manifest %s: %s", self.path, exc)
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+
+__all__ = ["DiscoveryManifest", "walk_python_files", "MANIFEST_NAME", "HOOKS"]
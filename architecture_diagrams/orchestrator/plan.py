@@ -0,0 +1,131 @@
+"""Batch build plans: many view selections/exports from one composed model.
+
+A plan is a TOML file with composition settings at the top level and one
+``[[targets]]`` table per output::
+
+    project = "banking"
+    tagging = ["auto_external"]
+    workers = 4
+    view_workers = 2
+
+    [[targets]]
+    output = "out/payments.dsl"
+    modules = ["payments"]
+    prune_to_views = true
+
+    [[targets]]
+    output = "out/landscape.json"
+    tags = ["default"]
+    exporter = "json"
+
+List values may also be given as comma-separated strings, as on the command line.
+"""
+
+from __future__ import annotations
+
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from architecture_diagrams.orchestrator.build import BuildTarget
+
+_PLAN_KEYS = {
+    "workspace_name",
+    "project",
+    "project_path",
+    "tagging",
+    "enable_cache",
+    "workers",
+    "view_workers",
+}
+_TARGET_KEYS = {
+    "output",
+    "views",
+    "tags",
+    "modules",
+    "prune_to_views",
+    "exporter",
+    "view_generator",
+    "view_generator_config",
+}
+
+
+@dataclass
+class BuildPlan:
+    """Composition settings plus the targets to build; unset settings defer to the caller."""
+
+    targets: List[BuildTarget] = field(default_factory=list)
+    workspace_name: Optional[str] = None
+    project: Optional[str] = None
+    project_path: Optional[Path] = None
+    tagging: Optional[List[str]] = None
+    enable_cache: Optional[bool] = None
+    workers: Optional[int] = None
+    view_workers: Optional[int] = None
+
+
+def _str_list(value: Any, where: str) -> List[str]:
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return [v.strip() for v in value]
+    raise ValueError(f"{where} must be a list of strings or a comma-separated string")
+
+
+def _parse_target(i: int, raw: Any) -> BuildTarget:
+    where = f"targets[{i}]"
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where} must be a table")
+    unknown = set(raw) - _TARGET_KEYS
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+    if not raw.get("output"):
+        raise ValueError(f"{where}: 'output' is required")
+    cfg = raw.get("view_generator_config")
+    if cfg is not None and not isinstance(cfg, dict):
+        raise ValueError(f"{where}.view_generator_config must be a table")
+    return BuildTarget(
+        select_names=_str_list(raw.get("views", []), f"{where}.views"),
+        select_tags=_str_list(raw.get("tags", []), f"{where}.tags"),
+        select_modules=_str_list(raw.get("modules", []), f"{where}.modules"),
+        prune_to_views=bool(raw.get("prune_to_views", False)),
+        exporter=str(raw.get("exporter", "structurizr")),
+        view_generator=raw.get("view_generator"),
+        view_generator_config=cfg,
+        output=Path(raw["output"]),
+    )
+
+
+def parse_plan(data: Dict[str, Any]) -> BuildPlan:
+    """Validate a decoded plan document; raises ValueError on malformed plans."""
+    unknown = set(data) - _PLAN_KEYS - {"targets"}
+    if unknown:
+        raise ValueError(f"plan: unknown keys {sorted(unknown)}")
+    raw_targets = data.get("targets")
+    if not isinstance(raw_targets, list) or not raw_targets:
+        raise ValueError("plan: at least one [[targets]] entry is required")
+    plan = BuildPlan(targets=[_parse_target(i, t) for i, t in enumerate(raw_targets)])
+    if "workspace_name" in data:
+        plan.workspace_name = str(data["workspace_name"])
+    if "project" in data:
+        plan.project = str(data["project"])
+    if "project_path" in data:
+        plan.project_path = Path(data["project_path"])
+    if "tagging" in data:
+        plan.tagging = _str_list(data["tagging"], "tagging")
+    if "enable_cache" in data:
+        plan.enable_cache = bool(data["enable_cache"])
+    if "workers" in data:
+        plan.workers = int(data["workers"])
+    if "view_workers" in data:
+        plan.view_workers = int(data["view_workers"])
+    return plan
+
+
+def load_plan(path: Path) -> BuildPlan:
+    """Read a TOML plan file (see module docstring for the format)."""
+    return parse_plan(tomllib.loads(Path(path).read_text()))
+
+
+__all__ = ["BuildPlan", "load_plan", "parse_plan"]
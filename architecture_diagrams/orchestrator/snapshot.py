@@ -0,0 +1,109 @@
+"""Snapshot cache for composed models.
+
+Composing a workspace (running every model builder, overlays and tagging strategies) is
+independent of which views are selected and how they are exported. The composed
+``SystemLandscape`` is stored in the build cache as a binary snapshot
+(``c4.binary_snapshot``), keyed by the contents of the model directories (builders and
+overlays), the package code and the composition parameters, so runs that differ only in
+view selection or exporter load it and go straight to view building.
+
+The snapshot format is plain data: loading one never runs code, unlike unpickling, so a
+tampered cache entry can at worst change the diagrams of later builds. Models carrying
+state the format cannot represent (e.g. attributes an overlay attaches to the landscape)
+are not cached.
+
+Builders that read inputs outside their models/ directories (other packages, data files)
+are not tracked by the key; clear the cache after changing such inputs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, FrozenSet, Iterable, Optional
+
+from architecture_diagrams.orchestrator.digests import FileDigests
+
+if TYPE_CHECKING:
+    from architecture_diagrams.c4.system_landscape import SystemLandscape
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".model.snap"
+
+
+def model_snapshot_key(
+    model_dirs: Iterable[Path],
+    *,
+    workspace_name: str,
+    tagging: Optional[Iterable[str]] = None,
+    tag_rules: str = "",
+    digests: Optional[FileDigests] = None,
+    code_digest: str = "",
+) -> str:
+    """Content-addressed key over the *.py files under model_dirs and the composition inputs.
+
+    code_digest should cover the package (the model classes) and any tagging plugins.
+    """
+    digests = digests or FileDigests()
+    h = hashlib.sha256()
+    params = {
+        "version": SNAPSHOT_VERSION,
+        "workspace_name": workspace_name,
+        "tagging": list(tagging or []),
+        "tag_rules": tag_rules,
+    }
+    h.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    h.update(code_digest.encode("ascii"))
+    for d in model_dirs:
+        h.update(b"\0")
+        h.update(digests.python_tree_digest(d).encode("ascii"))
+    return h.hexdigest()
+
+
+def snapshot_path(cache_dir: Path, key: str) -> Path:
+    return cache_dir / f"{key}{SNAPSHOT_SUFFIX}"
+
+
+def load_model_snapshot(path: Path) -> Optional[SystemLandscape]:
+    """Return the model snapshot at path, or None if missing or unreadable."""
+    from architecture_diagrams.c4 import binary_snapshot
+
+    try:
+        return binary_snapshot.load(path)
+    except Exception:
+        return None
+
+
+def save_model_snapshot(path: Path, model: SystemLandscape) -> bool:
+    """Write a binary snapshot of model to path atomically; False (nothing written) on failure.
+
+    Models the snapshot format cannot represent faithfully are not cached.
+    """
+    from architecture_diagrams.c4 import binary_snapshot
+    from architecture_diagrams.c4.system_landscape import SystemLandscape
+
+    if type(model) is not SystemLandscape or set(vars(model)) != _landscape_attributes():
+        return False
+    try:
+        binary_snapshot.dump(model, path)
+    except Exception:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _landscape_attributes() -> FrozenSet[str]:
+    from architecture_diagrams.c4.system_landscape import SystemLandscape
+
+    return frozenset(vars(SystemLandscape("")))
+
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "model_snapshot_key",
+    "snapshot_path",
+    "load_model_snapshot",
+    "save_model_snapshot",
+]
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Iterable, List, Optional, Protocol, Sequence, Set, Union, cast
+from functools import lru_cache
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from architecture_diagrams.c4 import ElementBase
 from architecture_diagrams.c4.system_landscape import SystemLandscape
@@ -35,6 +49,81 @@ def _empty_selectors() -> List[Selector]:
     return []
 
 
+Resolved = List[Union[ElementBase, RelationshipFilter]]
+
+
+class SelectorCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class SelectorCache:
+    """Memoized include-selector resolution shared by the ``ViewSpec.build`` calls of a build.
+
+    Many views share includes (the same external systems, the same callable); each
+    distinct string or callable is resolved once per model state. Strings are keyed by
+    value, callables by identity (the cache keeps them alive), so callables must be pure
+    functions of the model. Entries are dropped when the model changes, detected from
+    ``SystemLandscape.revision`` (which tag changes bump too) and the element and
+    relationship store sizes; adding views does not invalidate. Failed resolutions are not
+    cached.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, object], Resolved] = {}
+        self._callables: List[object] = []
+        self._stamp: Optional[Tuple[object, ...]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(
+        self, model: SystemLandscape, sel: Selector, compute: Callable[[Selector], Resolved]
+    ) -> Resolved:
+        """``compute(sel)``, or the cached result for this selector and model state."""
+        stamp = (
+            id(model),
+            model.revision,
+            len(model.people),
+            len(model.software_systems),
+            len(model.relationships),
+        )
+        if stamp != self._stamp:
+            self._entries.clear()
+            self._callables.clear()
+            self._stamp = stamp
+        key: Tuple[str, object] = ("str", sel) if isinstance(sel, str) else ("fn", id(sel))
+        found = self._entries.get(key)
+        if found is not None:
+            self.hits += 1
+            return found
+        self.misses += 1
+        result = compute(sel)
+        self._entries[key] = result
+        if key[0] == "fn":
+            self._callables.append(sel)  # pin so the id is not reused
+        return result
+
+    def info(self) -> SelectorCacheInfo:
+        """Hit/miss counters and the number of cached resolutions."""
+        return SelectorCacheInfo(self.hits, self.misses, len(self._entries))
+
+
+@lru_cache(maxsize=None)
+def tagged(*tags: str, match_all: bool = False) -> Callable[[SystemLandscape], List[ElementBase]]:
+    """Include selector for the elements carrying any (with ``match_all``, all) of ``tags``.
+
+    ``ViewSpec(..., includes=[tagged("external")])`` includes every external element,
+    answered from the model's tag index. Equal calls return the same function, so a
+    ``SelectorCache`` resolves it once per build however many views use it.
+    """
+
+    def select(model: SystemLandscape) -> List[ElementBase]:
+        return model.elements_with_all(tags) if match_all else model.elements_with_any(tags)
+
+    return select
+
+
 class ViewResolver(Protocol):
     def __call__(self, model: SystemLandscape) -> None: ...
 
@@ -59,8 +148,9 @@ class ViewSpec:
     )
     smart: bool = False  # Smart landscape view => include *
 
-    def build(self, model: SystemLandscape) -> None:
-        # Create the view on the model and resolve includes/excludes
+    def build(self, model: SystemLandscape, selectors: Optional[SelectorCache] = None) -> None:
+        # Create the view on the model and resolve includes/excludes; ``selectors`` shares
+        # include resolutions across the views of one build
         from architecture_diagrams.c4 import ViewType
 
         view = None
@@ -93,7 +183,7 @@ class ViewSpec:
             raise ValueError(f"Unsupported view type: {self.view_type}")
 
         # Resolve selectors to element ids or RelationshipFilter instances
-        def resolve(sel: Selector) -> List[Union[ElementBase, RelationshipFilter]]:
+        def resolve(sel: Selector) -> Resolved:
             if isinstance(sel, str):
                 s = cast(str, sel)
                 # Use unified getter; keep fallback to system if container path no longer exists
@@ -121,7 +211,13 @@ class ViewSpec:
         # For non-smart views, we store element IDs in the C4 view include set.
         # For smart views, the exporter will wrap them in extensions.smart_views.SmartView.
         for sel in self.includes:
-            for item in resolve(sel):
+            if isinstance(sel, RelationshipFilter):
+                resolved: Resolved = [sel]
+            elif selectors is not None:
+                resolved = selectors.resolve(model, sel, resolve)
+            else:
+                resolved = resolve(sel)
+            for item in resolved:
                 if hasattr(item, "id"):
                     # For system landscape views, containers are not valid include targets.
                     # If a container was selected (e.g., "System/Container"), include its parent Software System instead.
@@ -159,7 +255,15 @@ class ViewSpec:
             view._element_excludes_names = list(element_exclude_names)
 
 
-__all__ = ["ViewSpec", "Selector", "IncludeRelByName", "ExcludeRelByName"]
+__all__ = [
+    "ViewSpec",
+    "Selector",
+    "SelectorCache",
+    "SelectorCacheInfo",
+    "IncludeRelByName",
+    "ExcludeRelByName",
+    "tagged",
+]
 
 
 def derive_view(
@@ -0,0 +1,370 @@
+"""Watch mode: keep a warm process and regenerate output when project sources change.
+
+Change detection polls file stats (mtime_ns, size) of the watched trees, so it works the
+same on every platform without an OS-specific notifier. Bursts of saves are debounced:
+a rebuild starts once the tree has been quiet for ``debounce`` seconds.
+
+On each rebuild only the changed modules are reloaded through importlib. Model modules
+recorded by the ``IncrementalComposer`` are replayed incrementally; any other model
+change (a builder, a helper, project.toml) recomposes from scratch, and view-only edits
+reuse the composed model. Output is written atomically, so a viewer such as Structurizr
+Lite never reads a half-written file.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import pickle
+import stat
+import sys
+import tempfile
+import threading
+import time
+from importlib.util import spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    # Imported where used: generate imports write_atomic without the build machinery
+    from architecture_diagrams.c4.system_landscape import SystemLandscape
+    from architecture_diagrams.orchestrator.build import BuildTarget
+    from architecture_diagrams.orchestrator.compose import ModelBuilder
+    from architecture_diagrams.orchestrator.specs import ViewSpec
+
+DEFAULT_POLL_INTERVAL = 0.2
+DEFAULT_DEBOUNCE = 0.15
+
+log = logging.getLogger("architecture-diagrams.watch")
+
+_Stamp = Tuple[int, int]
+
+
+class PollingWatcher:
+    """Detect added, removed and modified *.py / *.toml files under the given paths."""
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self.paths = [Path(p) for p in paths]
+        self._stamps = self._scan()
+
+    def _scan(self) -> Dict[Path, _Stamp]:
+        stamps: Dict[Path, _Stamp] = {}
+        for base in self.paths:
+            if base.is_file():
+                candidates: Iterable[Path] = [base]
+            elif base.is_dir():
+                candidates = (
+                    p
+                    for pattern in ("*.py", "*.toml")
+                    for p in base.rglob(pattern)
+                    if "__pycache__" not in p.parts
+                )
+            else:
+                continue
+            for p in candidates:
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                stamps[p] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def poll(self) -> Set[Path]:
+        """Paths changed since the previous poll."""
+        current = self._scan()
+        changed = {
+            p for p in current.keys() | self._stamps.keys() if current.get(p) != self._stamps.get(p)
+        }
+        self._stamps = current
+        return changed
+
+    def wait(
+        self,
+        *,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        stop: Optional[threading.Event] = None,
+    ) -> Set[Path]:
+        """Block until files changed and stayed quiet for ``debounce`` seconds.
+
+        Returns an empty set if ``stop`` is set first.
+        """
+        changed: Set[Path] = set()
+        quiet_since = 0.0
+        while stop is None or not stop.is_set():
+            new = self.poll()
+            now = time.monotonic()
+            if new:
+                changed |= new
+                quiet_since = now
+            elif changed and now - quiet_since >= debounce:
+                return changed
+            time.sleep(min(interval, debounce) if changed else interval)
+        return set()
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace path's content in one rename (temp file in the same directory).
+
+    The result keeps the existing file's permissions, or gets the usual umask-derived
+    mode for a new file (``mkstemp`` itself creates owner-only files).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_current_umask()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _loaded_modules() -> Iterator[Tuple[Path, ModuleType]]:
+    for mod in list(sys.modules.values()):
+        f = getattr(mod, "__file__", None)
+        if f:
+            yield Path(f).resolve(), mod
+
+
+def _modules_for(paths: Iterable[Path]) -> Dict[Path, ModuleType]:
+    """Loaded modules by (resolved) source file, for the given files."""
+    wanted = {p.resolve() for p in paths}
+    return {p: mod for p, mod in _loaded_modules() if p in wanted}
+
+
+def _reload(mod: ModuleType, path: Path) -> None:
+    try:
+        importlib.reload(mod)
+    except ModuleNotFoundError:
+        # Loaded from a file location under a synthetic name (external projects)
+        spec = spec_from_file_location(mod.__name__, path)
+        if spec is None or spec.loader is None:
+            raise
+        mod.__spec__ = spec
+        spec.loader.exec_module(mod)
+
+
+def _modules_under(dirs: Iterable[Path]) -> List[ModuleType]:
+    roots = [d.resolve() for d in dirs]
+    return [mod for p, mod in _loaded_modules() if any(p.is_relative_to(r) for r in roots)]
+
+
+class WarmProject:
+    """One project's composed model kept in memory and refreshed from changed sources.
+
+    ``build_kwargs`` are passed to ``build_workspaces`` (project, project_path, tagging,
+    ...). The watcher's first scan happens here, before anything is imported, so no edit
+    made after construction is missed by ``refresh``.
+    """
+
+    def __init__(self, **build_kwargs: Any) -> None:
+        self.build_kwargs = build_kwargs
+        from architecture_diagrams.orchestrator.incremental import IncrementalComposer
+
+        self.composer = IncrementalComposer()
+        self.incremental_updates = 0  # rebuilds served by replaying units
+        self.watcher = PollingWatcher(self.watch_paths())
+        self._model: Optional[SystemLandscape] = None
+        self._pending: Optional[Set[str]] = None  # changed unit modules; None = recompose
+        self._view_specs: Dict[Hashable, List[ViewSpec]] = {}  # by caller-chosen key
+
+    def watch_paths(self) -> List[Path]:
+        """The project's models/, views/ and project.toml (plus an extends base project)."""
+        root = Path(__file__).resolve().parents[2]
+        project = self.build_kwargs.get("project")
+        project_path = self.build_kwargs.get("project_path")
+        if project_path is not None:
+            pp = Path(project_path).resolve()
+            if project and (pp / "projects" / project).exists():
+                return [pp / "projects" / project]
+            if project and (pp / project).exists():
+                return [pp / project]
+            return [pp]
+        paths: List[Path] = []
+        if project:
+            proj = root / "projects" / project
+            paths.append(proj)
+            base = _extends(proj / "project.toml")
+            if base:
+                paths.append(root / "projects" / base)
+        return paths
+
+    def model_dirs(self) -> List[Path]:
+        """Resolved models/ directories of the watched projects."""
+        dirs: List[Path] = []
+        for path in self.watch_paths():
+            candidates = [path / "models"]
+            if not candidates[0].is_dir():
+                # A projects/ root (or its parent) aggregating several projects
+                projects = path if path.name == "projects" else path / "projects"
+                candidates = (
+                    [sub / "models" for sub in projects.iterdir()] if projects.is_dir() else []
+                )
+            dirs.extend(d.resolve() for d in candidates if d.is_dir())
+        return dirs
+
+    def view_specs(self, key: Hashable, discover: Callable[[], List[ViewSpec]]) -> List[ViewSpec]:
+        """``discover()``'s view specs, reused until a watched file changes."""
+        specs = self._view_specs.get(key)
+        if specs is None:
+            specs = self._view_specs[key] = discover()
+        return specs
+
+    def _compose(self, builders: List[ModelBuilder], name: str) -> SystemLandscape:
+        model = None
+        if self._model is not None and self.composer.model is not None and self._model.name == name:
+            if not self._pending:
+                model = self._model  # view-only change
+            else:
+                model = self.composer.update(self._pending, reload=False)
+                if model is not None:
+                    self.incremental_updates += 1
+        if model is None:
+            model = self.composer.compose(builders, name=name)
+        self._model = model
+        self._pending = set()
+        # Overlays, tagging and view building mutate the model; hand out a copy
+        return pickle.loads(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))  # type: ignore[no-any-return]
+
+    def render(self, target: BuildTarget, **overrides: Any) -> str:
+        """Build one target from the warm model; ``overrides`` replace build_kwargs entries."""
+        from architecture_diagrams.orchestrator.build import build_workspaces
+
+        kwargs = {**self.build_kwargs, **overrides}
+        (text,) = build_workspaces([target], composer=self._compose, **kwargs)
+        return text
+
+    def refresh(self) -> Set[Path]:
+        """Apply every change since the last refresh (or construction); returns the paths."""
+        changed = self.watcher.poll()
+        if changed:
+            try:
+                self.apply_changes(changed)
+            except Exception:
+                self._pending, self._model = None, None
+                raise
+        return changed
+
+    def apply_changes(self, changed: Set[Path]) -> None:
+        """Reload the modules behind changed files and decide how to recompose.
+
+        Edits to recorded model modules are reloaded and replayed incrementally. Any other
+        model change (new or deleted files, helpers, project.toml) drops every loaded model
+        module so the next build imports and composes from scratch.
+        """
+        self._view_specs.clear()
+        modules = _modules_for(p for p in changed if p.suffix == ".py")
+        unit_modules = {u.module for u in self.composer.units if u.module}
+        model_dirs = self.model_dirs()
+        model_files = {
+            p
+            for p in changed
+            if p.suffix == ".toml" or any(p.resolve().is_relative_to(d) for d in model_dirs)
+        }
+        incremental = self._pending is not None and all(
+            p.exists() and p.resolve() in modules and modules[p.resolve()].__name__ in unit_modules
+            for p in model_files
+        )
+        if model_files and not incremental:
+            self._pending, self._model = None, None
+            for mod in _modules_under(model_dirs):
+                sys.modules.pop(mod.__name__, None)
+        for path, mod in modules.items():
+            if mod.__name__ not in sys.modules:
+                continue
+            if path.exists():
+                _reload(mod, path)
+            else:
+                sys.modules.pop(mod.__name__, None)
+            if self._pending is not None and path in {p.resolve() for p in model_files}:
+                self._pending.add(mod.__name__)
+
+
+class WatchSession(WarmProject):
+    """Regenerate one output from a warm process.
+
+    ``target`` selects views and the exporter; see ``WarmProject`` for ``build_kwargs``.
+    """
+
+    def __init__(self, output: Path, target: BuildTarget, **build_kwargs: Any) -> None:
+        super().__init__(**build_kwargs)
+        self.output = Path(output)
+        self.target = target
+
+    def build(self) -> float:
+        """Build and write the output; returns the elapsed seconds."""
+        start = time.perf_counter()
+        write_atomic(self.output, self.render(self.target))
+        return time.perf_counter() - start
+
+    def run(
+        self,
+        *,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        stop: Optional[threading.Event] = None,
+        on_build: Optional[Callable[[float, Set[Path]], None]] = None,
+    ) -> None:
+        """Build once, then rebuild after every debounced change until ``stop`` is set."""
+        changed: Set[Path] = set()
+        while True:
+            try:
+                elapsed = self.build()
+            except Exception as e:
+                # Keep watching; the previous output stays in place until the next good build
+                log.error("Regeneration failed: %s", e)
+                self._pending, self._model = None, None
+            else:
+                if on_build is not None:
+                    on_build(elapsed, changed)
+            while True:
+                changed = self.watcher.wait(interval=interval, debounce=debounce, stop=stop)
+                if not changed:
+                    return
+                try:
+                    self.apply_changes(changed)
+                    break
+                except Exception as e:
+                    log.error("Reloading changed modules failed: %s", e)
+                    self._pending, self._model = None, None
+
+
+def _extends(manifest: Path) -> Optional[str]:
+    try:
+        import tomllib
+
+        data = tomllib.loads(manifest.read_text())
+    except Exception:
+        return None
+    base = data.get("extends")
+    return str(base) if base else None
+
+
+__all__ = ["PollingWatcher", "WarmProject", "WatchSession", "write_atomic"]
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, TextIO
 
 # Exporter is a callable that takes a model and returns a string representation
 Exporter = Callable[[object], str]
+# Streaming exporter: writes the same text to a text stream as it is produced
+StreamExporter = Callable[[object, TextIO], None]
 
 
 @dataclass(frozen=True)
 class PluginRegistry:
     exporters: Dict[str, Exporter]
+    stream_exporters: Dict[str, StreamExporter]
 
     @classmethod
     def default(cls) -> "PluginRegistry":
-        return cls(exporters={})
+        return cls(exporters={}, stream_exporters={})
 
 
 _registry: PluginRegistry = PluginRegistry.default()
@@ -30,3 +33,34 @@ def get_exporter(name: str) -> Optional[Exporter]:
 
 def list_exporters() -> list[str]:
     return sorted(_registry.exporters.keys())
+
+
+def register_stream_exporter(name: str, fn: StreamExporter) -> None:
+    """Register the streaming form of exporter ``name`` (used by ``export_to``)."""
+    _registry.stream_exporters[name.strip().lower()] = fn
+
+
+def get_stream_exporter(name: str) -> Optional[StreamExporter]:
+    return _registry.stream_exporters.get(name.strip().lower())
+
+
+def export_to(model: object, fp: TextIO, exporter: str = "structurizr") -> None:
+    """Write ``model`` exported with ``exporter`` to a text stream.
+
+    Uses the exporter's streaming form when one is registered, so the output is never
+    held as one string; otherwise writes the exporter's result. Unknown exporters fall
+    back to Structurizr DSL, as in builds.
+    """
+    from architecture_diagrams.plugins import exporters as _ensure_exporters  # noqa: F401
+
+    stream = get_stream_exporter(exporter)
+    if stream is not None:
+        stream(model, fp)
+        return
+    fn = get_exporter(exporter)
+    if fn is not None:
+        fp.write(fn(model))
+        return
+    stream = get_stream_exporter("structurizr")
+    assert stream is not None
+    stream(model, fp)
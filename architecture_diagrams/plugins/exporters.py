@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, TextIO
 
-from architecture_diagrams.adapter.pystructurizr_export import dump_dsl as structurizr_dump
-from architecture_diagrams.plugins import register_exporter
+from architecture_diagrams.adapter.pystructurizr_export import (
+    dump_dsl as structurizr_dump,
+    write_dsl as structurizr_write,
+)
+from architecture_diagrams.adapter.structurizr_json import (
+    dump_workspace_json,
+    write_workspace_json,
+)
+from architecture_diagrams.plugins import register_exporter, register_stream_exporter
 
 
-def _as_json_graph(model: Any) -> str:
+def _json_graph(model: Any) -> dict[str, Any]:
     """Very simple JSON graph exporter to support alternative outputs and tests.
 
     Shape:
@@ -78,9 +85,22 @@ def _as_json_graph(model: Any) -> str:
         except Exception:
             continue
 
-    return json.dumps(data, indent=2, sort_keys=True)
+    return data
+
+
+def _as_json_graph(model: Any) -> str:
+    return json.dumps(_json_graph(model), indent=2, sort_keys=True)
+
+
+def _write_json_graph(model: Any, fp: TextIO) -> None:
+    # json.dump encodes chunk by chunk; same text as _as_json_graph
+    json.dump(_json_graph(model), fp, indent=2, sort_keys=True)
 
 
 # Register exporters
 register_exporter("structurizr", structurizr_dump)
 register_exporter("json", _as_json_graph)
+register_exporter("structurizr-json", dump_workspace_json)
+register_stream_exporter("structurizr", structurizr_write)
+register_stream_exporter("json", _write_json_graph)
+register_stream_exporter("structurizr-json", write_workspace_json)
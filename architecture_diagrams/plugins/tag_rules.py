@@ -0,0 +1,192 @@
+"""Declarative tagging rules: "technology contains kafka -> message-broker".
+
+Rules come from Python (``TagRule`` + ``TagRuleEngine``, registered as a tagging
+strategy with ``register_rules``) or from a project manifest::
+
+    [[tag_rules]]
+    name = "kafka-broker"            # optional; used when reporting hit counts
+    kinds = ["Container"]            # optional; element class names (default: any)
+    fields = ["technology", "name"]  # name, description and/or technology
+    contains = ["kafka"]             # case-insensitive substrings, any of them
+    tags = ["message-broker"]
+
+All rules are compiled into one combined pattern per (kind, field), and applied in a
+single pass over ``iter_elements()``; an element gets the tags of every rule whose
+terms occur in any of the rule's fields.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+FIELDS = ("name", "description", "technology")
+
+log = logging.getLogger("architecture-diagrams.tagging")
+
+
+@dataclass(frozen=True)
+class TagRule:
+    """Add ``tags`` to elements whose ``fields`` contain any of ``contains``."""
+
+    contains: Tuple[str, ...]
+    tags: Tuple[str, ...]
+    fields: Tuple[str, ...] = ("name",)
+    kinds: Optional[FrozenSet[str]] = None  # None => every element kind
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        unknown = set(self.fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"tag rule {self.label}: unknown fields {sorted(unknown)}")
+        if not self.contains or not all(self.contains):
+            raise ValueError(f"tag rule {self.label}: 'contains' needs non-empty strings")
+        if not self.tags:
+            raise ValueError(f"tag rule {self.label}: 'tags' is required")
+
+    @property
+    def label(self) -> str:
+        return self.name or f"{'/'.join(self.fields)} ~ {'|'.join(self.contains)}"
+
+    @classmethod
+    def from_dict(cls, raw: Any, where: str = "tag_rules") -> "TagRule":
+        """Parse one manifest table; raises ValueError on malformed rules."""
+        if not isinstance(raw, dict):
+            raise ValueError(f"{where} must be a table")
+        unknown = set(raw) - {"name", "kinds", "fields", "contains", "tags"}
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+
+        def strings(key: str, default: Sequence[str] = ()) -> Tuple[str, ...]:
+            value = raw.get(key, list(default))
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                raise ValueError(f"{where}.{key} must be a string or a list of strings")
+            return tuple(value)
+
+        kinds = strings("kinds")
+        return cls(
+            contains=strings("contains"),
+            tags=strings("tags"),
+            fields=strings("fields", ("name",)),
+            kinds=frozenset(kinds) if kinds else None,
+            name=str(raw.get("name", "")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kinds": sorted(self.kinds) if self.kinds is not None else None,
+            "fields": list(self.fields),
+            "contains": list(self.contains),
+            "tags": list(self.tags),
+        }
+
+
+class _FieldMatcher:
+    """One combined pattern over every term used on a field by the rules of one kind.
+
+    The pattern is a lookahead of all terms, longest first, so ``finditer`` reports the
+    longest term starting at each position. The terms that are prefixes of it match at
+    the same position too, so each term maps to the rules of all its prefix terms.
+    """
+
+    def __init__(self, terms: Dict[str, FrozenSet[int]]) -> None:
+        ordered = sorted(terms, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(re.escape(t) for t in ordered) + "))")
+        self.rules: Dict[str, FrozenSet[int]] = {
+            t: frozenset().union(*(r for p, r in terms.items() if t.startswith(p))) for t in ordered
+        }
+
+    def matches(self, text: str) -> FrozenSet[int]:
+        found: FrozenSet[int] = frozenset()
+        for m in self.pattern.finditer(text.lower()):
+            found |= self.rules[m.group(1)]
+        return found
+
+
+class TagRuleEngine:
+    """Compiled rule set; calling it tags a model (a tagging strategy).
+
+    ``hits`` maps each rule label to the number of elements it matched in the last run.
+    """
+
+    def __init__(self, rules: Iterable[TagRule]) -> None:
+        self.rules: List[TagRule] = list(rules)
+        self.hits: Dict[str, int] = {}
+        # Matchers per kind (None => rules without a kind filter), then per field
+        self._matchers: Dict[Optional[str], Dict[str, _FieldMatcher]] = {}
+        self._by_kind: Dict[str, List[Tuple[str, _FieldMatcher]]] = {}
+        kinds: set[Optional[str]] = {None}
+        for rule in self.rules:
+            kinds.update(rule.kinds or ())
+        for kind in kinds:
+            terms: Dict[str, Dict[str, set[int]]] = {}
+            for i, rule in enumerate(self.rules):
+                if rule.kinds is not None and kind not in rule.kinds:
+                    continue
+                for f in rule.fields:
+                    for term in rule.contains:
+                        terms.setdefault(f, {}).setdefault(term.lower(), set()).add(i)
+            self._matchers[kind] = {
+                f: _FieldMatcher({t: frozenset(r) for t, r in by_term.items()})
+                for f, by_term in terms.items()
+            }
+
+    def fingerprint(self) -> str:
+        """Digest of the rules, for cache keys."""
+        data = json.dumps([r.to_dict() for r in self.rules], sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _fields_for(self, kind: str) -> List[Tuple[str, _FieldMatcher]]:
+        found = self._by_kind.get(kind)
+        if found is None:
+            # Kinds named by no rule only see the rules without a kind filter
+            matchers = self._matchers.get(kind, self._matchers[None])
+            found = self._by_kind[kind] = list(matchers.items())
+        return found
+
+    def __call__(self, model: Any) -> None:
+        counts = [0] * len(self.rules)
+        for element in model.iter_elements():
+            matched: FrozenSet[int] = frozenset()
+            for f, matcher in self._fields_for(type(element).__name__):
+                text = getattr(element, f, None)
+                if text:
+                    matched |= matcher.matches(text)
+            if not matched:
+                continue
+            tags: set[str] = set()
+            for i in matched:
+                counts[i] += 1
+                tags.update(self.rules[i].tags)
+            element.add_tags(tags)
+        self.hits = {}
+        for rule, n in zip(self.rules, counts, strict=True):
+            self.hits[rule.label] = self.hits.get(rule.label, 0) + n
+        for label, n in self.hits.items():
+            log.debug("Tag rule %s: %d elements", label, n)
+
+
+def parse_rules(raw: Any, where: str = "tag_rules") -> List[TagRule]:
+    """Rules from a manifest's ``[[tag_rules]]`` array."""
+    if not isinstance(raw, list):
+        raise ValueError(f"{where} must be an array of tables")
+    return [TagRule.from_dict(r, f"{where}[{i}]") for i, r in enumerate(raw)]
+
+
+def register_rules(name: str, rules: Iterable[TagRule]) -> TagRuleEngine:
+    """Compile rules and register them as the tagging strategy ``name``."""
+    from architecture_diagrams.plugins.tagging import register_strategy
+
+    engine = TagRuleEngine(rules)
+    register_strategy(name, engine)
+    return engine
+
+
+__all__ = ["TagRule", "TagRuleEngine", "parse_rules", "register_rules"]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Callable, Dict, Optional
 
+from architecture_diagrams.plugins.tag_rules import TagRule, TagRuleEngine
+
 Strategy = Callable[[object], None]
 
 _taggers: Dict[str, Strategy] = {}
@@ -24,63 +26,48 @@ def _noop(_: object) -> None:  # no-op tagging
     return None
 
 
-def _auto_external(model: object) -> None:
-    """Best-effort: tag clearly external software systems as 'external'.
-
-    Heuristics (conservative):
-      - Description contains the word 'External' (case-insensitive)
-      - Name contains common 3rd-party terms (e.g., 'Provider', 'Gateway', 'Clearing')
-    """
-
-    def _norm(s: Optional[str]) -> str:
-        return (s or "").lower()
-
-    systems = getattr(model, "software_systems", {})
-    for sys in systems.values():
-        name = _norm(getattr(sys, "name", ""))
-        desc = _norm(getattr(sys, "description", ""))
-        if "external" in desc or any(k in name for k in ("provider", "gateway", "clearing")):
-            raw = getattr(sys, "tags", None)
-            items = []
-            if isinstance(raw, set):
-                items = list(raw)
-            elif isinstance(raw, (list, tuple)):
-                items = list(raw)
-            new_tags = {str(x) for x in items}
-            new_tags.add("external")
-            sys.tags = new_tags  # type: ignore[attr-defined]
-
-
-def _auto_broker_queue(model: object) -> None:
-    """Tag containers as message-broker/queue based on technology/name heuristics.
-
-    - If container.technology contains 'kafka' -> add 'message-broker'
-    - If name or technology contains 'redis stream' or 'queue' -> add 'message-broker' and 'queue'
-    """
-
-    def _norm(s: Optional[str]) -> str:
-        return (s or "").lower()
-
-    systems = getattr(model, "software_systems", {})
-    for sys in systems.values():
-        for c in getattr(sys, "containers", []):
-            name = _norm(getattr(c, "name", ""))
-            tech = _norm(getattr(c, "technology", ""))
-            tags = set(getattr(c, "tags", set()) or set())
-            if "kafka" in tech or "kafka" in name:
-                tags.add("message-broker")
-            if (
-                "redis stream" in tech
-                or "redis streams" in tech
-                or "queue" in name
-                or "queue" in tech
-            ):
-                tags.add("message-broker")
-                tags.add("queue")
-            try:
-                c.tags = tags  # type: ignore[attr-defined]
-            except Exception:
-                pass
+# Best-effort: tag clearly external software systems as 'external' (description mentions
+# "external", or the name carries a common third-party term)
+_auto_external = TagRuleEngine(
+    [
+        TagRule(
+            kinds=frozenset({"SoftwareSystem"}),
+            fields=("description",),
+            contains=("external",),
+            tags=("external",),
+        ),
+        TagRule(
+            kinds=frozenset({"SoftwareSystem"}),
+            fields=("name",),
+            contains=("provider", "gateway", "clearing"),
+            tags=("external",),
+        ),
+    ]
+)
+
+# Tag containers as message-broker/queue from their technology and name
+_auto_broker_queue = TagRuleEngine(
+    [
+        TagRule(
+            kinds=frozenset({"Container"}),
+            fields=("technology", "name"),
+            contains=("kafka",),
+            tags=("message-broker",),
+        ),
+        TagRule(
+            kinds=frozenset({"Container"}),
+            fields=("technology",),
+            contains=("redis stream",),
+            tags=("message-broker", "queue"),
+        ),
+        TagRule(
+            kinds=frozenset({"Container"}),
+            fields=("name", "technology"),
+            contains=("queue",),
+            tags=("message-broker", "queue"),
+        ),
+    ]
+)
 
 
 # Register built-ins
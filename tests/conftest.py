@@ -1,7 +1,35 @@
 import pathlib
 import sys
+from typing import Any, Callable, Optional
+
+import pytest
 
 # Ensure project root (containing architecture_diagrams) is on sys.path when tests executed via `uv run`.
 ROOT = pathlib.Path(__file__).parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+class ComposeCalls(list):
+    """Workspace names passed to ``_compose_model``; ``mutate`` edits each composed model."""
+
+    mutate: Optional[Callable[[Any], None]] = None
+
+
+@pytest.fixture
+def compose_calls(monkeypatch) -> ComposeCalls:
+    """Record every model composition made by the build orchestrator."""
+    from architecture_diagrams.orchestrator import build as build_mod
+
+    calls = ComposeCalls()
+    real = build_mod._compose_model
+
+    def counting(**kwargs):
+        calls.append(kwargs["workspace_name"])
+        model = real(**kwargs)
+        if calls.mutate is not None:
+            calls.mutate(model)
+        return model
+
+    monkeypatch.setattr(build_mod, "_compose_model", counting)
+    return calls
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from architecture_diagrams.archdiags import cli
+from architecture_diagrams.orchestrator.build import BuildTarget, build_workspace, build_workspaces
+from architecture_diagrams.orchestrator.plan import parse_plan
+
+TARGETS = [
+    dict(),
+    dict(select_tags=["default"], prune_to_views=True),
+    dict(select_tags=["td"]),
+    dict(select_modules=["payments"], exporter="json"),
+    dict(select_tags=["default"], prune_to_views=True, exporter="json"),
+]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_batch_matches_individual_builds_and_composes_once(compose_calls, workers):
+    expected = [build_workspace(project="banking", tagging=["auto_external"], **t) for t in TARGETS]
+    compose_calls.clear()
+    outputs = build_workspaces(
+        [BuildTarget(**t) for t in TARGETS],  # type: ignore[arg-type]
+        project="banking",
+        tagging=["auto_external"],
+        workers=workers,
+    )
+    assert outputs == expected
+    assert len(compose_calls) == 1
+
+
+def test_plan_validation():
+    plan = parse_plan(
+        {
+            "project": "banking",
+            "tagging": "auto_external, auto_broker_queue",
+            "targets": [{"output": "a.dsl", "tags": "default,td", "prune_to_views": True}],
+        }
+    )
+    assert plan.tagging == ["auto_external", "auto_broker_queue"]
+    (target,) = plan.targets
+    assert target.select_tags == ["default", "td"] and target.output == Path("a.dsl")
+    with pytest.raises(ValueError, match="output"):
+        parse_plan({"targets": [{"tags": ["x"]}]})
+    with pytest.raises(ValueError, match="unknown keys"):
+        parse_plan({"targets": [{"output": "a", "tag": ["x"]}]})
+    with pytest.raises(ValueError, match="targets"):
+        parse_plan({"project": "banking"})
+
+
+def test_generate_plan_writes_every_target(tmp_path: Path):
+    out = tmp_path / "out"
+    plan = tmp_path / "plan.toml"
+    plan.write_text(f"""
+project = "banking"
+
+[[targets]]
+output = "{out / 'default.dsl'}"
+tags = ["default"]
+
+[[targets]]
+output = "{out / 'payments.json'}"
+modules = ["payments"]
+exporter = "json"
+""")
+    res = CliRunner().invoke(cli, ["generate", "--plan", str(plan)])
+    assert res.exit_code == 0, res.output
+    assert (out / "default.dsl").read_text() == build_workspace(
+        project="banking", select_tags=["default"]
+    )
+    assert (out / "payments.json").read_text() == build_workspace(
+        project="banking", select_modules=["payments"], exporter="json"
+    )
@@ -0,0 +1,110 @@
+import pytest
+
+from architecture_diagrams.adapter.dsl_emitter import emit_dsl
+from architecture_diagrams.adapter.structurizr_json import dump_workspace_json
+from architecture_diagrams.c4 import (
+    Container,
+    ElementStyle,
+    RelationshipStyle,
+    SoftwareSystem,
+    SystemLandscape,
+    binary_snapshot,
+)
+from architecture_diagrams.c4.binary_snapshot import ModelSnapshot
+
+
+def _model(compact: bool = False) -> SystemLandscape:
+    m = SystemLandscape("Acme", "Everything", compact=compact)
+    customer = m.add_person("Customer", "Buys", tags={"user"})
+    shop = m.add_software_system("Shop", "Sells things", tags={"svc", "team-a"})
+    m.add_software_system("Shop ", "Same id as Shop")  # registered as shop-2
+    bank = m.add_software_system("Bank", "", tags={"external"})
+    web = shop.add_container("Web", "", "Python", tags={"svc", "team-a"})
+    api = shop.add_container("API", "Orders", "Go")
+    bank.add_container("API", "Payments", None)  # same id as Shop/API
+    api.add_component("Checkout", "", "Go")
+    m.add_relationship(customer, web, "Uses", "HTTPS", tags={"sync"})
+    m.add_relationship(web, api, "Calls")
+    m.add_relationship(api, bank["API"], "Pays", "gRPC")
+    m.assign_group("Internal", shop)
+    m.styles.add_element_style(ElementStyle("external", background="#999999", opacity=50))
+    m.styles.add_relationship_style(RelationshipStyle("sync", dashed=False, thickness=3))
+    node = m.add_deployment_node("Cluster", "", technology="Kubernetes")
+    pod = node.add_deployment_node("Pod")
+    pod.add_container_instance(api)
+    node.add_infrastructure_node("Ingress", "", "nginx")
+    node.add_software_system_instance(shop, instance_tag="Blue")
+    m.add_smart_system_landscape_view("All", "All")
+    m.add_container_view("ShopContainers", "Shop", shop).add(bank)
+    m.add_component_view("Api", "API", api, "Inside the API")
+    m.add_deployment_view("Live", "Live", environment="Live")
+    m.views[1].project = "shop"  # type: ignore[attr-defined]
+    return m
+
+
+def _elements(m: SystemLandscape):
+    return [
+        (type(e).__name__, e.id, e.name, e.description, e.technology, sorted(e.tags))
+        for e in m.iter_elements()
+    ]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_round_trip_preserves_the_model(compact):
+    m = _model(compact)
+    loaded = binary_snapshot.loads(binary_snapshot.dumps(m))
+    assert _elements(loaded) == _elements(m)
+    assert emit_dsl(loaded) == emit_dsl(m)
+    assert dump_workspace_json(loaded) == dump_workspace_json(m)
+    assert [r.id_tuple() + (r.tags,) for r in loaded.relationships] == [
+        r.id_tuple() + (r.tags,) for r in m.relationships
+    ]
+    assert loaded.get("Bank/API").description == "Payments"
+    assert loaded.find_system("Shop ").id == "shop-2"
+    assert [s.name for s in loaded.get_group("Internal")] == ["Shop"]
+    assert loaded.styles == m.styles
+    assert loaded.views[1].project == "shop"  # type: ignore[attr-defined]
+    assert loaded.views[1].include == {"bank"}
+    instance = loaded.deployment_nodes["cluster"].children[0].container_instances[0]
+    assert instance.container is loaded.get("Shop/API")
+    assert all(isinstance(e.tags, frozenset) == compact for e in loaded.iter_elements())
+
+
+def test_offset_tables_decode_little_endian_on_any_host(monkeypatch):
+    data = binary_snapshot.dumps(_model())
+    native = ModelSnapshot(data)
+    monkeypatch.setattr(binary_snapshot, "_NATIVE_U32", False)  # as on a big-endian host
+    decoded = ModelSnapshot(data)
+    assert isinstance(decoded._string_ends, list)
+    assert list(decoded._string_ends) == list(native._string_ends)
+    assert emit_dsl(decoded.to_landscape()) == emit_dsl(native.to_landscape())
+    decoded.close()
+
+
+def test_mmap_snapshot_materializes_on_demand(tmp_path):
+    path = tmp_path / "model.snap"
+    binary_snapshot.dump(_model(), path)
+    with ModelSnapshot.open(path) as snap:
+        names = [snap.string(snap.record(i).name) for i in snap.roots()]
+        assert names == ["Customer", "Shop", "Shop ", "Bank", "Cluster"]
+        web = next(
+            i for i in range(snap.element_count) if snap.string(snap.record(i).name) == "Web"
+        )
+        element = snap.element(web)
+        # The enclosing system comes with its whole subtree
+        assert isinstance(element, Container) and isinstance(element.parent, SoftwareSystem)
+        assert [c.name for c in element.parent.containers] == ["Web", "API"]
+        assert snap.element(web) is element
+        assert len(snap._objects) == 4  # Shop, Web, API, Checkout
+    assert element.name == "Web"  # still usable after the mapping is closed
+    assert emit_dsl(binary_snapshot.load(path)) == emit_dsl(_model())
+
+
+def test_invalid_models_and_files_are_rejected():
+    m = _model()
+    stray = SoftwareSystem("Elsewhere")
+    m.add_relationship(m.get_system("Shop"), stray, "Calls")
+    with pytest.raises(ValueError, match="not in the model"):
+        binary_snapshot.dumps(m)
+    with pytest.raises(ValueError, match="not a model snapshot"):
+        ModelSnapshot(b"\0" * 256)
@@ -0,0 +1,75 @@
+import os
+import shutil
+from pathlib import Path
+
+from architecture_diagrams.orchestrator import build as build_mod
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.orchestrator.digests import FileDigests
+
+BANKING = Path(__file__).resolve().parents[1] / "projects" / "banking"
+
+
+def _touch(path: Path) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+def test_digests_are_memoized_on_stat_and_ignore_mtime(tmp_path):
+    tree = tmp_path / "models"
+    (tree / "sub").mkdir(parents=True)
+    (tree / "a.py").write_text("A = 1\n")
+    (tree / "sub" / "b.py").write_text("B = 2\n")
+    memo = tmp_path / "digests.json"
+
+    first = FileDigests(memo)
+    before = first.python_tree_digest(tree)
+    assert first.hashed == 2
+    first.save()
+
+    warm = FileDigests(memo)
+    assert warm.python_tree_digest(tree) == before and warm.hashed == 0
+
+    _touch(tree / "a.py")  # e.g. a git checkout rewriting identical content
+    touched = FileDigests(memo)
+    assert touched.python_tree_digest(tree) == before and touched.hashed == 1
+
+    moved = shutil.copytree(tree, tmp_path / "elsewhere" / "models")
+    assert FileDigests().python_tree_digest(moved) == before
+
+    (tree / "sub" / "b.py").write_text("B = 3\n")
+    assert FileDigests(memo).python_tree_digest(tree) != before
+
+
+def test_code_digest_covers_plugin_modules_outside_the_package(tmp_path):
+    plugin = tmp_path / "my_exporter.py"
+    plugin.write_text("def export(model):\n    return 'v1'\n")
+    ns: dict = {}
+    exec(compile(plugin.read_text(), str(plugin), "exec"), ns)
+    digests = FileDigests()
+    base, with_plugin = digests.code_digest(), digests.code_digest(ns["export"])
+    assert base != with_plugin
+    assert digests.code_digest(build_mod.dump_dsl) == base  # in-package code is already covered
+    plugin.write_text("def export(model):\n    return 'v2'\n")
+    assert FileDigests().code_digest(ns["export"]) != with_plugin
+
+
+def test_output_cache_survives_checkout_and_skips_composition(tmp_path, monkeypatch):
+    project = tmp_path / "projects" / "bank_copy"
+    shutil.copytree(BANKING, project, ignore=shutil.ignore_patterns("__pycache__"))
+    cache = tmp_path / "cache"
+
+    def run() -> str:
+        return build_workspace(
+            project_path=project, select_tags=["default"], enable_cache=True, cache_dir=cache
+        )
+
+    expected = run()
+    for p in project.rglob("*.py"):
+        _touch(p)
+
+    def fail(**kwargs):
+        raise AssertionError("cache miss recomposed the model")
+
+    monkeypatch.setattr(build_mod, "_compose_model", fail)
+    assert run() == expected
+    assert len(list(cache.glob("*.out"))) == 1
@@ -0,0 +1,83 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from architecture_diagrams.archdiags import cli
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.orchestrator.cache import CacheManager, parse_age, parse_size
+
+
+def _entry(cache: CacheManager, key: str, size: int, accessed_ago: float) -> Path:
+    assert cache.write_output(key, "x" * size)
+    path = cache.output_path(key)
+    t = time.time() - accessed_ago
+    os.utime(path, (t, t))
+    return path
+
+
+def test_prune_evicts_least_recently_accessed_then_expired(tmp_path):
+    cache = CacheManager(tmp_path, max_bytes=None, max_age=None)
+    old = _entry(cache, "old", 400, 300)
+    mid = _entry(cache, "mid", 400, 200)
+    new = _entry(cache, "new", 400, 100)
+    (tmp_path / "discovery-manifest.json").write_text("{}")
+    assert cache.read_output("old") == "x" * 400  # a hit makes it most recently used
+
+    r = cache.prune(max_bytes=900)
+    assert (r.removed, r.freed_bytes) == (1, 400)
+    assert not mid.exists() and old.exists() and new.exists()
+
+    r = cache.prune(max_age=60)
+    assert r.removed == 1 and not new.exists() and old.exists()
+    assert (tmp_path / "discovery-manifest.json").exists()  # metadata is never evicted
+
+    assert cache.clear().removed == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_writes_are_atomic_and_stale_temp_files_are_swept(tmp_path):
+    cache = CacheManager(tmp_path)
+    stale = tmp_path / ".entry-abc.tmp"
+    stale.write_text("partial")
+    os.utime(stale, (0, 0))
+    fresh = tmp_path / ".entry-def.tmp"
+    fresh.write_text("in flight")
+    assert cache.write_output("k", "done")
+    assert [p.name for p in tmp_path.glob("*.out")] == ["k.out"]
+    cache.prune()
+    assert not stale.exists() and fresh.exists()
+
+
+def test_builds_evict_entries_beyond_the_default_age(tmp_path):
+    stale = _entry(CacheManager(tmp_path), "stale", 10, 60 * 86400)
+    build_workspace(project="banking", select_tags=["td"], enable_cache=True, cache_dir=tmp_path)
+    assert not stale.exists()
+    assert CacheManager(tmp_path).stats().outputs == 1
+
+
+def test_parse_limits():
+    assert parse_size("500M") == 500 * 1024**2 and parse_size("2GiB") == 2 * 1024**3
+    assert parse_size("1024") == 1024
+    assert parse_age("7d") == 7 * 86400 and parse_age("90m") == 5400 and parse_age("15") == 15
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_cache_cli(tmp_path):
+    cache = CacheManager(tmp_path)
+    _entry(cache, "a", 2048, 10 * 86400)
+    _entry(cache, "b", 2048, 10)
+    runner = CliRunner()
+    res = runner.invoke(cli, ["cache", "stats", "--cache-dir", str(tmp_path)])
+    assert res.exit_code == 0, res.output
+    assert "entries:       2 (2 outputs, 0 model snapshots)" in res.output
+    assert "4.0 KiB" in res.output
+    res = runner.invoke(cli, ["cache", "prune", "--cache-dir", str(tmp_path), "--max-age", "1d"])
+    assert res.exit_code == 0 and "Removed 1 entries" in res.output
+    res = runner.invoke(cli, ["cache", "prune", "--cache-dir", str(tmp_path), "--max-size", "x"])
+    assert res.exit_code == 2
+    res = runner.invoke(cli, ["cache", "clear", "--cache-dir", str(tmp_path)])
+    assert res.exit_code == 0 and "Removed 1 files" in res.output
@@ -0,0 +1,84 @@
+import inspect
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+from architecture_diagrams.archdiags import cli
+
+ROOT = Path(__file__).resolve().parents[1]
+# Budgets in ms of imports after interpreter startup. Wall-clock checks are opt-in
+# (ARCH_DIAGS_IMPORT_BUDGET=1); on slow machines scale them with
+# ARCH_DIAGS_IMPORT_BUDGET_SCALE rather than loosening the numbers here
+BUDGETS_MS = {"--help": 150, "list-views": 400}
+HEAVY: tuple[str, ...] = (
+    "requests",
+    "architecture_diagrams.orchestrator.build",
+    "architecture_diagrams.adapter.pystructurizr_export",
+)
+STARTUP = {"site", "encodings", "encodings.utf_8", "_io", "marshal", "posix", "zipimport"}
+
+
+def _import_profile(*args: str) -> tuple[set[str], float]:
+    """Modules imported by the CLI and their total import time in ms (``-X importtime``)."""
+    env = {**os.environ, "ARCH_DIAGS_NO_DAEMON": "1"}
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "architecture_diagrams", *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: set[str] = set()
+    total_us = 0
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, field = line[len("import time:") :].split("|")
+        name = field.strip()
+        modules.add(name)
+        # Top-level entries (one leading space) hold the cumulative time of their subtree;
+        # interpreter startup (site, encodings) is not ours to budget
+        if field.startswith(" ") and not field.startswith("  ") and name not in STARTUP:
+            total_us += int(cumulative)
+    return modules, total_us / 1000
+
+
+CASES = [
+    (["--help"], HEAVY + ("pystructurizr.dsl",)),
+    # Views import ViewSpec, which needs pystructurizr's Element; nothing else heavy
+    (["list-views"], HEAVY),
+]
+
+
+@pytest.mark.parametrize("args, heavy", CASES)
+def test_cli_startup_skips_heavy_imports(args, heavy):
+    modules, _ = _import_profile(*args)
+    assert [m for m in heavy if m in modules] == []
+    if args == ["--help"]:
+        assert not any(m.startswith("architecture_diagrams.cli.") for m in modules)
+
+
+@pytest.mark.skipif(
+    os.environ.get("ARCH_DIAGS_IMPORT_BUDGET") != "1",
+    reason="wall-clock budget; set ARCH_DIAGS_IMPORT_BUDGET=1 to check",
+)
+@pytest.mark.parametrize("args", [args for args, _ in CASES])
+def test_cli_startup_import_budget(args):
+    _, total_ms = _import_profile(*args)
+    scale = float(os.environ.get("ARCH_DIAGS_IMPORT_BUDGET_SCALE", "1"))
+    budget = BUDGETS_MS[args[0]] * scale
+    assert total_ms < budget, f"{' '.join(args)} imports took {total_ms:.0f} ms (> {budget:.0f})"
+
+
+def test_lazy_help_matches_command_docstrings():
+    ctx = click.Context(cli)
+    for name, (_, summary) in cli.lazy_commands.items():
+        command = cli.get_command(ctx, name)
+        if command is None:  # optional dependency missing
+            continue
+        assert inspect.cleandoc(command.help or "").split("\n\n")[0] == summary, name
@@ -0,0 +1,53 @@
+import tracemalloc
+
+from architecture_diagrams.adapter.dsl_emitter import emit_dsl
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.plugins.tagging import get_strategy
+
+
+def _build(compact: bool) -> SystemLandscape:
+    m = SystemLandscape("Mem", compact=compact)
+    for i in range(100):
+        s = m.add_software_system(f"System {i}", "", tags={"internal"})
+        for j in range(4):
+            c = s.add_container(f"Queue {j}", "", "Kafka", tags=["svc"])
+            for k in range(25):
+                c.add_component(f"Component {k}", "", tags=["component", "svc"])
+    return m
+
+
+def _traced_size(compact: bool) -> int:
+    tracemalloc.start()
+    try:
+        model = _build(compact)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert model is not None
+    return size
+
+
+def test_compact_landscape_memory_benchmark():
+    standard, compact = _traced_size(False), _traced_size(True)
+    # ~10.5k elements; interned tag sets roughly halve the footprint
+    assert compact < standard * 0.7, (standard, compact)
+
+
+def test_elements_are_slotted_and_share_tag_sets():
+    m = _build(True)
+    a, b = m["System 1"]["Queue 0"], m["System 2"]["Queue 3"]
+    assert not hasattr(a, "__dict__")
+    assert a.tags is b.tags == frozenset({"svc"})
+    a.add_tags(["hot"])
+    assert a.tags == {"svc", "hot"} and b.tags == {"svc"}
+    assert m.add_software_system("System 1", tags=["edge"]).tags == {"internal", "edge"}
+
+
+def test_compact_and_standard_models_export_identically():
+    standard, compact = _build(False), _build(True)
+    tag_brokers = get_strategy("auto_broker_queue")
+    assert tag_brokers is not None
+    for model in (standard, compact):
+        tag_brokers(model)
+    assert compact["System 0"]["Queue 0"].tags is compact["System 9"]["Queue 2"].tags
+    assert emit_dsl(compact) == emit_dsl(standard)
@@ -0,0 +1,90 @@
+import json
+import os
+from pathlib import Path
+
+from architecture_diagrams.orchestrator import loader, manifest
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.orchestrator.loader import VIEWS, discover_project
+
+VIEW = """
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+
+def get_views():
+    return [ViewSpec(key="{key}", name="{key}", view_type="SystemLandscape")]
+"""
+
+
+def _views_dir(tmp_path: Path, name: str) -> Path:
+    views = tmp_path / "projects" / name / "views"
+    (views / "team").mkdir(parents=True)
+    (views / "a.py").write_text(VIEW.format(key="A"))
+    (views / "team" / "b.py").write_text(VIEW.format(key="B"))
+    (views / "helpers.py").write_text("COLOURS = ['red']\n")
+    return views
+
+
+def _discover(tmp_path: Path, views: Path) -> list[str]:
+    found = discover_project(
+        tmp_path,
+        extra_view_dirs=[views],
+        kinds={VIEWS},
+        cache_dir=tmp_path / "cache",
+        use_manifest=True,
+    )
+    return [v.key for v in found.view_specs]
+
+
+def test_warm_run_skips_walks_and_hookless_modules(tmp_path, monkeypatch):
+    views = _views_dir(tmp_path, "mf_warm")
+    assert _discover(tmp_path, views) == ["A", "B"]
+    data = json.loads((tmp_path / "cache" / manifest.MANIFEST_NAME).read_text())
+    helper = data["modules"][str(views / "helpers.py")]
+    assert helper["hooks"] == [] and helper["module"].endswith("views.helpers")
+    assert helper["mtime_ns"] == os.stat(views / "helpers.py").st_mtime_ns
+
+    imported: list[str] = []
+    real_import = loader._import_path
+
+    def no_walk(base_dir):
+        raise AssertionError(f"walked {base_dir}")
+
+    def tracking_import(root, path):
+        imported.append(path.name)
+        return real_import(root, path)
+
+    monkeypatch.setattr(manifest, "walk_python_files", no_walk)
+    monkeypatch.setattr(loader, "_import_path", tracking_import)
+    assert _discover(tmp_path, views) == ["A", "B"]
+    assert sorted(imported) == ["a.py", "b.py"]
+
+
+def test_directory_changes_invalidate_the_listing(tmp_path):
+    views = _views_dir(tmp_path, "mf_change")
+    assert _discover(tmp_path, views) == ["A", "B"]
+    (views / "team" / "c.py").write_text(VIEW.format(key="C"))
+    assert sorted(_discover(tmp_path, views)) == ["A", "B", "C"]
+    (views / "a.py").unlink()
+    assert sorted(_discover(tmp_path, views)) == ["B", "C"]
+
+
+def test_edited_module_hooks_are_rechecked(tmp_path):
+    views = _views_dir(tmp_path, "mf_edit")
+    _discover(tmp_path, views)
+    helper = views / "helpers.py"
+    helper.write_text(VIEW.format(key="H"))
+    os.utime(helper, ns=(0, os.stat(helper).st_mtime_ns + 1_000_000))
+    m = manifest.DiscoveryManifest(tmp_path / "cache" / manifest.MANIFEST_NAME)
+    assert m.hooks(helper) is None
+    assert m.hooks(views / "a.py") == {"get_views"}
+
+
+def test_builds_keep_the_manifest_in_their_cache_dir(tmp_path, monkeypatch):
+    saved: list[Path | None] = []
+    monkeypatch.setattr(manifest.DiscoveryManifest, "save", lambda self: saved.append(self.path))
+    build_workspace(project="banking", select_tags=["default"])
+    assert saved and set(saved) == {None}
+    saved.clear()
+    cache = tmp_path / "cache"
+    build_workspace(project="banking", select_tags=["default"], enable_cache=True, cache_dir=cache)
+    assert saved and set(saved) == {cache / manifest.MANIFEST_NAME}
@@ -0,0 +1,117 @@
+from architecture_diagrams.adapter.dsl_emitter import DeclarationIndex, _build_tree, emit_dsl
+from architecture_diagrams.adapter.pystructurizr_export import dump_dsl
+from architecture_diagrams.c4 import ElementStyle, SystemLandscape
+from architecture_diagrams.orchestrator.build import build_workspace_dsl
+
+
+def _block(dsl: str, header: str) -> list[str]:
+    lines = dsl.splitlines()
+    start = next(i for i, line in enumerate(lines) if line.strip().startswith(header))
+    indent = len(lines[start]) - len(lines[start].lstrip())
+    end = next(i for i in range(start + 1, len(lines)) if lines[i] == " " * indent + "}")
+    return lines[start : end + 1]
+
+
+def test_system_tags_stay_on_system_declaration():
+    m = SystemLandscape("Tags")
+    s = m.add_software_system("Alpha", "", tags={"external"})
+    s.add_container("API", "", "Python", tags=["svc"])
+    dsl = emit_dsl(m)
+    block = _block(dsl, 'alpha = SoftwareSystem "Alpha"')
+    assert block[1] == '      tags "external"'
+    api = _block(dsl, 'api = Container "API"')
+    assert api[1:3] == ['        technology "Python"', '        tags "svc"']
+
+
+def test_emit_is_deterministic_across_repeated_exports():
+    m = SystemLandscape("Repeat")
+    a = m.add_software_system("A", "")
+    b = m.add_software_system("B", "")
+    a.add_container("API", "")
+    b.add_container("API", "")
+    first = dump_dsl(m)
+    assert dump_dsl(m) == first
+    assert "api = Container" in first and "api_2 = Container" in first
+
+
+def test_view_header_comment_follows_emitted_view_when_one_is_skipped():
+    m = SystemLandscape("Skip")
+    a = m.add_software_system("A", "")
+    b = m.add_software_system("B", "")
+    skipped = m.add_system_context_view("Gone", "Gone", a)
+    skipped.software_system = None
+    m.add_system_context_view("BCtx", "B Context", b)
+    block = _block(emit_dsl(m), "systemContext b")
+    assert block[1].strip() == '// View: key="BCtx" name="B Context"'
+
+
+def test_configured_styles_are_emitted():
+    m = SystemLandscape("Styled")
+    m.styles.add_element_style(ElementStyle(tag="hot", background="#ff0000"))
+    block = _block(emit_dsl(m), 'element "hot"')
+    assert block[1].strip() == 'background "#ff0000"'
+
+
+def test_banking_export_unchanged_by_repeat_builds():
+    first = build_workspace_dsl(project="banking", select_tags=["default"])
+    assert build_workspace_dsl(project="banking", select_tags=["default"]) == first
+
+
+def test_declaration_index_resolves_names_once_built():
+    m = SystemLandscape("Index")
+    m.add_person("Api", "")
+    a = m.add_software_system("Alpha", "")
+    a.add_container("API", "", "Python").add_component("Handler", "")
+    m.add_software_system("Beta", "").add_container("API", "")
+    ws, element_mapping, _ = _build_tree(m)
+    index = DeclarationIndex(ws, element_mapping)
+    # The person is declared first ("api"), but containers outrank people
+    assert index.resolve_name("api") == "api_2"
+    assert index.resolve_name("Beta/API") == "api_3"
+    assert index.resolve_name("Alpha/Handler") == "handler"
+    assert index.resolve_name(None) == "*"
+    assert index.resolve_name("Missing") is None
+    handler = index.element_for(a["API"].components[0].id)
+    assert handler is not None and index.parent_system[id(handler)] is index.element_for(a.id)
+
+
+def test_name_filters_resolve_each_name_once(monkeypatch):
+    from architecture_diagrams.orchestrator.specs import (
+        ExcludeRelByName,
+        IncludeRelByName,
+        ViewSpec,
+    )
+
+    m = SystemLandscape("Filters")
+    a = m.add_software_system("A", "")
+    b = m.add_software_system("B", "")
+    m.add_software_system("C", "")
+    m.add_relationship(a, b, "calls")
+    filters = [
+        IncludeRelByName("A", None),
+        ExcludeRelByName("A", "B", but_include_names=["C", "Missing"]),
+        IncludeRelByName("Missing", "B"),
+    ]
+    for i in range(3):
+        spec = ViewSpec(
+            key=f"V{i}", name=f"V{i}", view_type="SystemLandscape", excludes=["C"], filters=filters
+        )
+        spec.build(m)
+    calls: list[object] = []
+    real = DeclarationIndex.resolve_name
+
+    def counting(self, name):
+        calls.append(name)
+        return real(self, name)
+
+    monkeypatch.setattr(DeclarationIndex, "resolve_name", counting)
+    dsl = emit_dsl(m)
+    assert len(calls) == len(set(calls)) == 5  # A, B, C, Missing and the wildcard
+    block = _block(dsl, "systemLandscape")
+    start = block.index("      //__NAME_FILTERS__")
+    assert block[start + 1 : -2] == [
+        "      exclude c",
+        "      include a->*",
+        "      exclude a->b",
+        "      include a->c",
+    ]
@@ -0,0 +1,133 @@
+import sys
+import types
+from functools import partial
+
+from architecture_diagrams.adapter.dsl_emitter import emit_dsl
+from architecture_diagrams.c4 import Container, SystemLandscape
+from architecture_diagrams.c4.auto_two_phase import auto_register
+from architecture_diagrams.orchestrator.compose import compose
+from architecture_diagrams.orchestrator.incremental import IncrementalComposer
+from projects.banking.models import core_c4, payments_c4
+from projects.banking.models.system_landscape import build
+
+PAYMENTS = "projects.banking.models.payments_c4"
+
+
+def _full() -> str:
+    return emit_dsl(compose([build], name="banking"))
+
+
+def test_define_edit_replays_dependents_only_and_matches_full_build(monkeypatch):
+    composer = IncrementalComposer()
+    model = composer.compose([build], name="banking")
+    assert emit_dsl(model) == _full()
+    original = payments_c4.define_payments
+
+    def define_payments(m):
+        pay = original(m)
+        pay.description = "Payments v2"
+        _ = pay + Container("Ledger", "Double-entry ledger", technology="Rust")
+        return pay
+
+    monkeypatch.setattr(payments_c4, "define_payments", define_payments)
+    assert composer.update([PAYMENTS], reload=False) is model
+    replayed = composer.last_replayed
+    assert f"{PAYMENTS}.define_payments" in replayed and f"{PAYMENTS}.link_payments" in replayed
+    # Modules that neither nest under nor link to Payments are left alone
+    assert not any("define_aml" in u or "link_identity" in u for u in replayed)
+    assert len(replayed) < len(composer.units)
+    assert emit_dsl(model) == _full()
+
+
+def test_link_edit_and_revert(monkeypatch):
+    composer = IncrementalComposer()
+    model = composer.compose([build], name="banking")
+    baseline = emit_dsl(model)
+
+    def link_payments(m):
+        pay = m["Payments"]
+        m.relate(pay["Payments API"], pay["Payments DB"], ("Reads/Writes", "SQL"))
+
+    monkeypatch.setattr(payments_c4, "link_payments", link_payments)
+    assert composer.update([PAYMENTS], reload=False) is model
+    assert f"{PAYMENTS}.link_payments" in composer.last_replayed
+    assert emit_dsl(model) == _full() != baseline
+
+    monkeypatch.undo()
+    composer.update([PAYMENTS], reload=False)
+    assert emit_dsl(model) == baseline
+
+
+def test_edit_to_a_widely_linked_system(monkeypatch):
+    composer = IncrementalComposer()
+    model = composer.compose([build], name="banking")
+    original = core_c4.define_core
+
+    def define_core(m):
+        core = original(m)
+        core.description = "Core v2"
+        return core
+
+    monkeypatch.setattr(core_c4, "define_core", define_core)
+    composer.update(["projects.banking.models.core_c4"], reload=False)
+    assert emit_dsl(model) == _full()
+
+
+def test_unrecorded_changes_require_full_compose():
+    composer = IncrementalComposer()
+    composer.compose([build], name="banking")
+    assert composer.update(["projects.banking.models.system_landscape"], reload=False) is None
+
+    def destructive(m: SystemLandscape) -> SystemLandscape:
+        auto_register(m, "core", phase="define", project="banking")
+        m.remove_software_system(m["Core Banking"])
+        return m
+
+    composer.compose([destructive], name="banking")
+    assert composer.update(["projects.banking.models.core_c4"], reload=False) is None
+
+
+def test_units_are_diffed_without_rescanning_the_model(monkeypatch):
+    from architecture_diagrams.orchestrator import incremental
+
+    scans: list[int] = []
+    real = incremental._tracked_elements
+
+    def counting(model):
+        scans.append(1)
+        return real(model)
+
+    monkeypatch.setattr(incremental, "_tracked_elements", counting)
+    composer = IncrementalComposer()
+    composer.compose([build], name="banking")
+    assert len(composer.units) > 10 and len(scans) == 1  # the final check only
+    assert composer.update([PAYMENTS], reload=False) is not None
+
+
+def test_changes_through_kept_references_fall_back_to_full_compose(monkeypatch):
+    from architecture_diagrams.c4.auto_two_phase import phase_runner
+
+    kept: list = []
+    mod_a, mod_b = types.ModuleType("inc_mod_a"), types.ModuleType("inc_mod_b")
+    mod_a.define = lambda m: kept.append(m.add_software_system("A", ""))  # type: ignore[attr-defined]
+    for mod in (mod_a, mod_b):
+        monkeypatch.setitem(sys.modules, mod.__name__, mod)
+
+    def builder(m: SystemLandscape) -> SystemLandscape:
+        run = phase_runner.get()
+        assert run is not None
+        for mod in (mod_a, mod_b):
+            run(mod.__name__, "define", partial(mod.define, m))
+        return m
+
+    # Edits to elements the unit looked up are tied to their creator and replayed
+    mod_b.define = lambda m: setattr(m["A"], "description", "edited by B")  # type: ignore[attr-defined]
+    composer = IncrementalComposer()
+    composer.compose([builder], name="kept")
+    assert composer.update(["inc_mod_a"], reload=False) is not None
+    assert composer.last_replayed == ["inc_mod_a.define", "inc_mod_b.define"]
+
+    # The same edit through a reference kept from an earlier unit is not attributed
+    mod_b.define = lambda m: setattr(kept[-1], "description", "edited by B")  # type: ignore[attr-defined]
+    composer.compose([builder], name="kept")
+    assert composer.update(["inc_mod_a"], reload=False) is None
@@ -0,0 +1,116 @@
+import pickle
+
+import pytest
+from click.testing import CliRunner
+
+from architecture_diagrams.archdiags import cli
+from architecture_diagrams.c4 import SystemLandscape, binary_snapshot
+from architecture_diagrams.c4.lazy_landscape import LazySystemLandscape
+from architecture_diagrams.orchestrator.build import (
+    BuildTarget,
+    _prune_model_to_views,
+    build_workspace,
+    build_workspaces,
+)
+from architecture_diagrams.orchestrator.compose import compose
+from architecture_diagrams.orchestrator.specs import ViewSpec
+from architecture_diagrams.plugins import get_exporter
+from projects.banking.models.system_landscape import build
+
+
+def _model() -> SystemLandscape:
+    m = SystemLandscape("Lazy")
+    user = m.add_person("User")
+    prev = None
+    for i in range(10):
+        s = m.add_software_system(f"S{i}", f"System {i}", tags=["odd"] if i % 2 else None)
+        api = s.add_container("API", "", "Python")
+        api.add_component("Handler", "")
+        s.add_container("DB", "", "Postgres")
+        m.add_relationship(api, s["DB"], "reads")
+        m.add_relationship(user, s, "uses")
+        if prev is not None:
+            m.add_relationship(prev, s, "calls")
+        prev = s
+    return m
+
+
+def _lazy(model: SystemLandscape) -> LazySystemLandscape:
+    return LazySystemLandscape(binary_snapshot.ModelSnapshot(binary_snapshot.dumps(model)))
+
+
+def test_lookups_build_only_what_they_return():
+    eager = _model()
+    lazy = _lazy(eager)
+    assert len(lazy.relationships) == len(eager.relationships)
+    assert list(lazy) == list(eager)
+    assert lazy.materialized_count == 0
+
+    assert lazy.get("S3/API").parent is lazy.get_system("S3")
+    assert lazy.materialized_count == 4  # S3, its two containers and the component
+    assert "S5/DB" in lazy and ("S5", "Cache") not in lazy and "S11" not in lazy
+    assert lazy.find_person("User") is lazy.people[lazy.get_person("User").id]
+    assert lazy.materialized_count == 9
+
+    lazy.add_software_system("S3", tags=["touched"])
+    new = lazy.add_software_system("S10")
+    assert lazy.get_system("S3").tags == {"odd", "touched"} and new.id == "s10"
+
+
+def test_pruned_export_matches_the_eager_model():
+    eager = _model()
+    lazy = _lazy(eager)
+    for m in (eager, lazy):
+        ViewSpec(key="c", name="C", view_type="Container", subject="S2/API").build(m)
+        _prune_model_to_views(m)
+    assert lazy.materialized_count == 4
+    export = get_exporter("structurizr")
+    assert export(lazy) == export(eager)  # type: ignore[misc]
+
+    # Pickled (and so copied) lazy models come back fully built and equivalent
+    plain = pickle.loads(pickle.dumps(_lazy(_model())))
+    assert type(plain) is SystemLandscape
+    assert export(plain) == export(_model())  # type: ignore[misc]
+
+
+def test_builds_from_a_model_snapshot_match_composed_builds(tmp_path):
+    path = tmp_path / "banking.adms"
+    binary_snapshot.dump(compose([build], name="Banking"), path)
+    kwargs = dict(project="banking", select_modules=["payments"], prune_to_views=True)
+    expected_dsl = build_workspace(**kwargs)
+    assert build_workspace(model_snapshot=path, **kwargs) == expected_dsl
+    args = ["generate", "--modules", "payments", "--prune-to-views", "--output", "-"]
+    res = CliRunner().invoke(cli, [*args, "--model-snapshot", str(path)])
+    assert res.exit_code == 0 and res.output == expected_dsl
+
+    targets = [BuildTarget(select_tags=["td"]), BuildTarget(exporter="json")]
+    expected = build_workspaces(targets, project="banking")
+    for _ in range(2):  # cache miss, then cache hit
+        assert (
+            build_workspaces(
+                targets,
+                project="banking",
+                model_snapshot=path,
+                enable_cache=True,
+                cache_dir=tmp_path / "cache",
+            )
+            == expected
+        )
+
+
+def test_snapshot_builds_release_the_mapping_and_reject_tagging(tmp_path, monkeypatch):
+    path = tmp_path / "banking.adms"
+    binary_snapshot.dump(compose([build], name="Banking"), path)
+    closed = []
+    close = LazySystemLandscape.close
+    monkeypatch.setattr(LazySystemLandscape, "close", lambda self: closed.append(close(self)))
+    targets = [BuildTarget(select_tags=["td"]), BuildTarget(exporter="json")]
+    build_workspaces(targets[:1], project="banking", model_snapshot=path)
+    assert len(closed) == 1
+    build_workspaces(targets, project="banking", model_snapshot=path)
+    assert len(closed) == 4  # the shared model and each target's copy
+
+    with pytest.raises(ValueError, match="tagging"):
+        build_workspaces(targets, project="banking", model_snapshot=path, tagging=["auto_external"])
+    args = ["generate", "--model-snapshot", str(path), "--tagging", "auto_external"]
+    assert CliRunner().invoke(cli, [*args, "--output", "-"]).exit_code == 2
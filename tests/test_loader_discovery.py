@@ -0,0 +1,98 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from architecture_diagrams.orchestrator import loader, manifest
+from architecture_diagrams.orchestrator.loader import discover_project
+
+BUILDER = """
+def build(model=None):
+    from architecture_diagrams.c4 import SystemLandscape
+    model = model or SystemLandscape("Ext")
+    model.add_software_system("{name}", "")
+    return model
+"""
+
+VIEW = """
+import threading
+
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+IMPORT_THREAD = threading.current_thread().name
+
+
+def get_views():
+    return [
+        ViewSpec(key="{key}", name="{key}", view_type="SystemLandscape", description=IMPORT_THREAD)
+    ]
+"""
+
+OVERLAY = """
+def apply(model):
+    model.add_person("Auditor", "")
+"""
+
+
+def _project(tmp_path: Path, name: str) -> Path:
+    # Distinct names per test: fallback imports register under projects.<name>.*
+    proj = tmp_path / "projects" / name
+    (proj / "models" / "overlays").mkdir(parents=True)
+    (proj / "views" / "team").mkdir(parents=True)
+    (proj / "models" / "system_landscape.py").write_text(BUILDER.format(name="Core"))
+    (proj / "models" / "overlays" / "audit.py").write_text(OVERLAY)
+    (proj / "models" / "overlays" / "_helpers.py").write_text("")
+    for i in range(12):
+        sub = proj / "views" / ("team" if i % 2 else "")
+        (sub / f"v{i:02d}.py").write_text(VIEW.format(key=f"V{i:02d}"))
+    (proj / "views" / "_shared.py").write_text("raise RuntimeError('not a view module')")
+    return proj
+
+
+def test_single_walk_classifies_all_hooks(tmp_path, monkeypatch):
+    proj = _project(tmp_path, "ext_walk")
+    walks: list[Path] = []
+    real_walk = manifest.walk_python_files
+
+    def counting_walk(base_dir):
+        walks.append(base_dir)
+        return real_walk(base_dir)
+
+    monkeypatch.setattr(manifest, "walk_python_files", counting_walk)
+    found = discover_project(
+        tmp_path,
+        extra_model_dirs=[proj / "models"],
+        extra_view_dirs=[proj / "views"],
+        use_manifest=False,
+    )
+    assert walks == [proj / "models", proj / "views"]
+    assert len(found.builders) == 1 and len(found.overlays) == 1
+    assert {v.project for v in found.view_specs} == {"ext_walk"}
+    # Views follow file discovery order regardless of which import finished first
+    expected = [p.stem.upper() for p in (proj / "views").rglob("v*.py")]
+    assert [v.key for v in found.view_specs] == expected
+
+
+def test_view_modules_import_on_thread_pool(tmp_path):
+    proj = _project(tmp_path, "ext_pool")
+    found = discover_project(
+        tmp_path, extra_view_dirs=[proj / "views"], kinds={loader.VIEWS}, use_manifest=False
+    )
+    assert len(found.view_specs) == 12 and not found.builders
+    threads = {v.description for v in found.view_specs}
+    assert all(t.startswith("arch-diags-import") for t in threads)
+    assert threading.current_thread().name not in threads
+
+
+def test_failing_view_module_runs_once(tmp_path):
+    proj = _project(tmp_path, "ext_fail")
+    runs = tmp_path / "runs.txt"
+    (proj / "views" / "broken.py").write_text(
+        f"open({str(runs)!r}, 'a').write('x')\nraise ValueError('bad view module')\n"
+    )
+    with pytest.raises(ValueError, match="bad view module"):
+        discover_project(
+            tmp_path, extra_view_dirs=[proj / "views"], kinds={loader.VIEWS}, use_manifest=False
+        )
+    # The error is not retried through a second, file-location import
+    assert runs.read_text() == "x"
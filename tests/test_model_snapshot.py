@@ -0,0 +1,98 @@
+import pickle
+import sys
+from pathlib import Path
+
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.orchestrator.snapshot import SNAPSHOT_SUFFIX
+
+BUILDER = """
+def build(model=None):
+    from architecture_diagrams.c4 import SystemLandscape
+    model = model or SystemLandscape("Snap")
+    a = model.add_software_system("{name}", "")
+    b = model.add_software_system("Ledger", "")
+    model.add_relationship(a, b, "posts")
+    return model
+"""
+
+VIEWS = """
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+
+def get_views():
+    return [
+        ViewSpec(key="all", name="All", view_type="SystemLandscape", tags={"all"}),
+        ViewSpec(key="ledger", name="Ledger", view_type="SystemContext", subject="Ledger",
+                 tags={"ledger"}),
+    ]
+"""
+
+
+def test_selection_changes_reuse_the_composed_model(tmp_path, compose_calls):
+    cache = tmp_path / "cache"
+    runs = [
+        dict(select_tags=["default"]),
+        dict(select_tags=["td"]),
+        dict(select_modules=["payments"], exporter="json"),
+    ]
+    outputs = [
+        build_workspace(project="banking", enable_cache=True, cache_dir=cache, **kw) for kw in runs
+    ]
+    assert len(compose_calls) == 1
+    assert len(list(cache.glob(f"*{SNAPSHOT_SUFFIX}"))) == 1
+    assert outputs == [build_workspace(project="banking", **kw) for kw in runs]
+
+
+def test_model_file_changes_invalidate_the_snapshot(tmp_path, monkeypatch, compose_calls):
+    proj = tmp_path / "projects" / "snap_edit"
+    (proj / "models").mkdir(parents=True)
+    (proj / "views").mkdir()
+    (proj / "models" / "system_landscape.py").write_text(BUILDER.format(name="Payments"))
+    (proj / "views" / "views.py").write_text(VIEWS)
+
+    def run(tag: str) -> str:
+        return build_workspace(
+            project_path=proj, select_tags=[tag], enable_cache=True, cache_dir=tmp_path / "c"
+        )
+
+    assert '"Payments"' in run("all")
+    run("ledger")
+    assert len(compose_calls) == 1
+    builder = proj / "models" / "system_landscape.py"
+    builder.write_text(BUILDER.format(name="Billing"))
+    # A new CLI process would import the edited builder afresh
+    for name, mod in list(sys.modules.items()):
+        if getattr(mod, "__file__", None) == str(builder):
+            monkeypatch.delitem(sys.modules, name)
+    out = run("all")
+    assert len(compose_calls) == 2
+    assert '"Billing"' in out and '"Payments"' not in out
+
+
+def test_unrepresentable_models_are_not_cached(tmp_path, compose_calls):
+    cache = tmp_path / "cache"
+    compose_calls.mutate = lambda model: setattr(model, "hook", lambda: None)
+    out = build_workspace(
+        project="banking", select_tags=["default"], enable_cache=True, cache_dir=cache
+    )
+    assert out.startswith("workspace")
+    assert not list(Path(cache).glob(f"*{SNAPSHOT_SUFFIX}"))
+    assert not list(Path(cache).glob(".snapshot-*"))
+
+
+class _Payload:
+    def __reduce__(self):
+        return (print, ("unpickled a cache entry",))
+
+
+def test_snapshots_are_loaded_without_unpickling(tmp_path, compose_calls, capsys):
+    cache = tmp_path / "cache"
+    run = dict(project="banking", select_tags=["default"], enable_cache=True, cache_dir=cache)
+    expected = build_workspace(**run)
+    (snapshot,) = cache.glob(f"*{SNAPSHOT_SUFFIX}")
+    snapshot.write_bytes(pickle.dumps(_Payload()))
+    for out in cache.glob("*.out"):
+        out.unlink()
+    assert build_workspace(**run) == expected
+    assert len(compose_calls) == 2
+    assert "unpickled" not in capsys.readouterr().out
@@ -0,0 +1,78 @@
+import multiprocessing
+
+import pytest
+
+from architecture_diagrams.adapter.dsl_emitter import emit_dsl
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.orchestrator import build as build_mod
+from architecture_diagrams.orchestrator.build import BuildTarget, build_workspace, build_workspaces
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+
+
+def _model() -> SystemLandscape:
+    m = SystemLandscape("Acme")
+    customer = m.add_person("Customer", "")
+    shop = m.add_software_system("Shop", "")
+    m.add_software_system("Bank", "")
+    shop.add_container("Web", "", "Python")
+    m.add_relationship(customer, shop, "Buys", "HTTPS")
+    return m
+
+
+SPECS = [
+    ViewSpec(key="All", name="All", view_type="SystemLandscape", smart=True),
+    ViewSpec(key="Shop", name="Shop", view_type="SystemContext", subject="Shop"),
+    ViewSpec(key="Bank", name="Bank", view_type="SystemContext", subject="Bank"),
+    # Mentions the workspace name, which drops the header comment
+    ViewSpec(key="Web", name="Web", view_type="Container", subject="Shop/Web", description="Acme"),
+    ViewSpec(key="Landscape", name="Landscape", view_type="SystemLandscape"),
+]
+
+
+def _serial(specs: list[ViewSpec], model: SystemLandscape) -> str:
+    for spec in specs:
+        spec.build(model)
+    return emit_dsl(model)
+
+
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_forked_views_merge_to_the_serial_output(workers):
+    expected = _serial(SPECS[:3], _model())
+    assert "// Acme" in expected
+    assert build_mod._export_views_forked(_model(), SPECS[:3], workers) == expected
+
+    # Views present before the build are rendered by the parent, ahead of the spec views
+    pre = _model()
+    pre.add_system_context_view("Pre", "Pre", pre.get_system("Bank"))
+    expected = _serial(SPECS, pre)
+    assert "// Acme" not in expected
+    parallel = _model()
+    parallel.add_system_context_view("Pre", "Pre", parallel.get_system("Bank"))
+    assert build_mod._export_views_forked(parallel, SPECS, workers) == expected
+
+
+@pytest.mark.parametrize(
+    "target",
+    [dict(), dict(select_tags=["td"]), dict(exporter="json"), dict(prune_to_views=True)],
+)
+def test_view_workers_leave_project_output_unchanged(target):
+    expected = build_workspace(project="banking", **target)
+    assert build_workspace(project="banking", view_workers=3, **target) == expected
+
+
+def test_view_workers_only_fork_for_structurizr_targets(monkeypatch):
+    forked: list[int] = []
+    real = build_mod._export_views_forked
+
+    def counting(model, specs, workers):
+        forked.append(len(specs))
+        return real(model, specs, workers)
+
+    monkeypatch.setattr(build_mod, "_export_views_forked", counting)
+    targets = [BuildTarget(), BuildTarget(exporter="json"), BuildTarget(prune_to_views=True)]
+    build_workspaces(targets, project="banking", view_workers=2)
+    assert len(forked) == 1 and forked[0] > 1
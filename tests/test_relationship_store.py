@@ -0,0 +1,115 @@
+import copy
+import pickle
+
+import pytest
+
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.c4.relationship_store import RelationshipStore
+
+
+def _landscape():
+    m = SystemLandscape("Rels")
+    user = m.add_person("User", "")
+    a = m.add_software_system("A", "")
+    b = m.add_software_system("B", "")
+    api = a.add_container("API", "")
+    db = a.add_container("DB", "")
+    worker = b.add_container("Worker", "")
+    m.relate(user, api, "uses")
+    m.relate(api, db, "reads")
+    m.relate(api, worker, "enqueues")
+    m.relate(a, b, "depends on")
+    return m, user, a, b, api, db, worker
+
+
+def test_neighbour_queries():
+    m, user, a, b, api, db, worker = _landscape()
+    rels = m.relationships
+    assert [r.description for r in rels.outgoing(api)] == ["reads", "enqueues"]
+    assert [r.description for r in rels.incoming(api)] == ["uses"]
+    # Systems include edges between nested elements
+    assert [r.description for r in rels.between(a, b)] == ["enqueues", "depends on"]
+    assert rels.between(b, a) == []
+    assert [r.description for r in rels.between(api, db)] == ["reads"]
+
+
+def test_list_view_compatibility():
+    m, *_ = _landscape()
+    rels = m.relationships
+    assert len(rels) == 4 and rels[0].description == "uses"
+    assert [r.description for r in rels[-2:]] == ["enqueues", "depends on"]
+    assert rels == list(rels)
+    # Assigning a plain list rebuilds the indexes
+    m.relationships = [r for r in rels if r.description != "reads"]
+    assert isinstance(m.relationships, RelationshipStore)
+    assert [r.description for r in m.relationships.outgoing(rels[1].source)] == ["enqueues"]
+    with pytest.raises(ValueError):
+        m.relationships.append(m.relationships[0])
+
+
+def test_rewire_and_prune_only_visit_touched_edges(monkeypatch):
+    m = SystemLandscape("Big")
+    hub = m.add_software_system("Hub", "")
+    old = hub.add_container("Kafka", "", "Kafka")
+    spokes = [hub.add_container(f"Svc {i}", "") for i in range(5_000)]
+    for left, right in zip(spokes, spokes[1:], strict=False):
+        m.relate(left, right, "calls")
+    m.relate(spokes[0], old, "publishes")
+    m.relate(old, spokes[1], "delivers")
+
+    def _no_scan(self):
+        raise AssertionError("relationship store was scanned in full")
+
+    monkeypatch.setattr(RelationshipStore, "__iter__", _no_scan)
+    res = m.replace_container_report("Hub", "Kafka", "Redis", technology="Redis")
+    assert res.rewired_count == 2
+    assert [r.destination for r in m.relationships.outgoing(spokes[0])][-1] is res.new_container
+    assert m.relationships.incoming(old) == []
+    assert m.remove_relationships_touching([spokes[2]]) == 2
+    assert m.relationships.incoming(spokes[3]) == []
+    monkeypatch.undo()
+    assert len(m.relationships) == 4_999 + 2 - 2
+
+
+def test_copies_and_pickles_rebuild_indexes():
+    m, *_ = _landscape()
+    for clone in (copy.deepcopy(m), pickle.loads(pickle.dumps(m))):
+        api = clone["A"]["API"]
+        assert [r.description for r in clone.relationships.outgoing(api)] == ["reads", "enqueues"]
+        assert len(clone.relationships.between(clone["A"], clone["B"])) == 2
+
+
+def test_in_place_edits_update_only_the_touched_edges(monkeypatch):
+    m, user, a, b, api, db, worker = _landscape()
+    rels = m.relationships
+    uses, reads, enqueues, depends = list(rels)
+    monkeypatch.setattr(RelationshipStore, "_reset", None)  # edits must not rebuild
+    assert rels.pop(1) is reads and rels.outgoing(api) == [enqueues]
+    rels.remove(uses)
+    del rels[-1]
+    assert (
+        list(rels) == [enqueues] and rels.incoming(api) == [] and rels.between(a, b) == [enqueues]
+    )
+    rels.insert(0, reads)
+    rels[1] = depends
+    assert list(rels) == [reads, depends] and rels.outgoing(api) == [reads]
+    with pytest.raises(ValueError):
+        rels[0] = depends
+    twin = copy.copy(reads)  # equal, but not the stored object
+    assert twin == reads and twin not in rels
+    with pytest.raises(ValueError):
+        rels.remove(twin)
+    assert list(rels) == [reads, depends] and rels.between(a, b) == [depends]
+
+
+def test_stored_since_follows_insertion_sequence():
+    m, user, a, b, api, db, worker = _landscape()
+    rels = m.relationships
+    mark = rels.next_seq
+    assert rels.stored_since(mark) == []
+    late = m.relate(worker, db, "syncs")
+    early = m.relate(user, worker, "watches")
+    assert rels.stored_since(mark) == [late, early]
+    rels.remove(late)
+    rels.insert(0, late)
+    assert [r.description for r in rels.stored_since(mark)] == ["watches", "syncs"]
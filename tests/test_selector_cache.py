@@ -0,0 +1,60 @@
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.orchestrator.specs import SelectorCache, ViewSpec
+
+
+def _model() -> SystemLandscape:
+    m = SystemLandscape("Cache")
+    shop = m.add_software_system("Shop", "")
+    m.add_software_system("Bank", "", tags={"external"})
+    shop.add_container("Web", "")
+    return m
+
+
+def test_shared_includes_resolve_once_per_build():
+    calls: list[int] = []
+
+    def externals(model):
+        calls.append(1)
+        return [s for s in model.software_systems.values() if "external" in s.tags]
+
+    specs = [
+        ViewSpec(
+            key=f"V{i}",
+            name=f"V{i}",
+            view_type="SystemLandscape",
+            includes=["Shop", "Shop/Web", externals],
+        )
+        for i in range(3)
+    ]
+    m = _model()
+    selectors = SelectorCache()
+    for spec in specs:
+        spec.build(m, selectors)
+    assert calls == [1]
+    assert selectors.info() == (6, 3, 3)
+    # Same includes as an uncached build
+    plain = _model()
+    for spec in specs:
+        spec.build(plain)
+    assert [sorted(v.include) for v in m.views] == [sorted(v.include) for v in plain.views]
+
+
+def test_model_changes_invalidate_cached_resolutions():
+    m = _model()
+    selectors = SelectorCache()
+    spec = ViewSpec(key="V", name="V", view_type="SystemLandscape", includes=["Shop", "Bank"])
+    spec.build(m, selectors)
+    spec.build(m, selectors)  # adding views keeps the cache
+    assert selectors.info().hits == 2
+
+    m.remove_software_system(m.get_system("Bank"))
+    m.add_software_system("Bank", "")
+    spec.build(m, selectors)
+    assert selectors.info().misses == 4
+    assert m.get_system("Bank").id in m.views[-1].include
+
+    # Direct edits to the element dicts are caught by the store sizes
+    del m.software_systems[m.get_system("Bank").id]
+    shop_only = ViewSpec(key="S", name="S", view_type="SystemLandscape", includes=["Shop"])
+    shop_only.build(m, selectors)
+    assert selectors.info().misses == 5
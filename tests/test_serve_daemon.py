@@ -0,0 +1,130 @@
+import os
+import socket
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from architecture_diagrams.archdiags import cli
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.orchestrator.daemon import BuildDaemon, DaemonError, request
+
+BUILDER = """
+from architecture_diagrams.c4 import SystemLandscape
+
+
+def build(model=None):
+    model = model or SystemLandscape("ext")
+    model.add_software_system("{name}", "")
+    return model
+"""
+
+VIEWS = """
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+
+def get_views():
+    return [ViewSpec(key="all", name="All", view_type="SystemLandscape", tags={"all"})]
+"""
+
+
+@pytest.fixture()
+def daemon(tmp_path, monkeypatch):
+    path = tmp_path / "s.sock"
+    monkeypatch.setenv("ARCH_DIAGS_SOCKET", str(path))
+    monkeypatch.delenv("ARCH_DIAGS_NO_DAEMON", raising=False)
+    from architecture_diagrams.cli.list_views import warm_list_views
+
+    d = BuildDaemon(path)
+    d.handlers["list-views"] = warm_list_views(d.builds)
+    thread = threading.Thread(target=d.serve_forever)
+    thread.start()
+    assert d.ready.wait(5)
+    yield d
+    request("shutdown", socket_path=path)
+    thread.join(5)
+    assert not thread.is_alive() and not path.exists()
+
+
+def test_cli_uses_the_running_daemon(daemon, tmp_path):
+    runner = CliRunner()
+    out = tmp_path / "w.dsl"
+    res = runner.invoke(cli, ["generate", "--tags", "td", "--output", str(out)])
+    assert res.exit_code == 0, res.output
+    assert list(daemon.builds.projects) == [("banking", None)]
+    assert out.read_text() == build_workspace(project="banking", select_tags=["td"])
+
+    res = runner.invoke(cli, ["list-views"])
+    assert res.exit_code == 0 and "BankingSystemsOverview" in res.output
+    res_local = runner.invoke(cli, ["list-views"], env={"ARCH_DIAGS_NO_DAEMON": "1"})
+    assert res.output == res_local.output
+
+
+def test_list_views_reuses_the_warm_view_specs(daemon, tmp_path, monkeypatch):
+    from architecture_diagrams.cli import list_views
+
+    proj = tmp_path / "ext"
+    (proj / "views").mkdir(parents=True)
+    views = proj / "views" / "views.py"
+    views.write_text(VIEWS)
+    discoveries: list[int] = []
+    real = list_views.discover_view_specs
+
+    def counting(*args, **kwargs):
+        discoveries.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(list_views, "discover_view_specs", counting)
+    params = {"project": "ext", "project_path": str(proj), "project_explicit": False}
+    for tag in (None, "all", "other"):
+        lines = request("list-views", {**params, "filter_tag": tag})["lines"]
+        assert len(lines) == (0 if tag == "other" else 1)
+    assert len(discoveries) == 1
+
+    views.write_text(VIEWS.replace('name="All"', 'name="Everything"'))
+    st = views.stat()
+    os.utime(views, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (line,) = request("list-views", {**params, "filter_tag": None})["lines"]
+    assert "Everything" in line and len(discoveries) == 2
+
+
+def test_daemon_answers_reflect_edits_on_disk(daemon, tmp_path):
+    proj = tmp_path / "ext"
+    (proj / "models").mkdir(parents=True)
+    (proj / "views").mkdir()
+    builder = proj / "models" / "system_landscape.py"
+    builder.write_text(BUILDER.format(name="Alpha"))
+    (proj / "views" / "views.py").write_text(VIEWS)
+    params = {"project_path": str(proj), "workspace_name": "ext", "select_tags": ["all"]}
+    assert '"Alpha"' in request("generate", params)["text"]
+
+    builder.write_text(BUILDER.format(name="Beta Gamma"))
+    text = request("generate", params)["text"]
+    assert '"Beta Gamma"' in text and '"Alpha"' not in text
+
+
+def test_failures_and_missing_daemons(daemon, tmp_path):
+    with pytest.raises(DaemonError) as err:
+        request("generate", {"project": "banking", "select_colors": ["red"]})
+    assert err.value.error_type == "TypeError"
+    with pytest.raises(DaemonError, match="Unknown op"):
+        request("compile")
+    assert request("ping")["projects"] == 1
+
+    # Absent or dead sockets mean "no daemon": callers build in-process
+    assert request("ping", socket_path=tmp_path / "absent.sock") is None
+    stale = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(stale))
+    sock.close()
+    assert request("ping", socket_path=stale) is None
+    with pytest.raises(RuntimeError, match="already listening"):
+        BuildDaemon(daemon.socket_path).serve_forever()
+
+
+def test_default_socket_lives_in_the_cache_dir(monkeypatch):
+    from architecture_diagrams.orchestrator.cache import default_cache_dir
+    from architecture_diagrams.orchestrator.daemon import default_socket_path
+
+    monkeypatch.delenv("ARCH_DIAGS_SOCKET", raising=False)
+    assert default_socket_path().parent == default_cache_dir()
@@ -0,0 +1,29 @@
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.c4.slugs import (
+    SLUG_CACHE_SIZE,
+    clear_slug_cache,
+    element_id,
+    slug_cache_info,
+    sort_slug,
+)
+
+
+def test_repeated_names_hit_the_cache():
+    clear_slug_cache()
+    m = SystemLandscape("Slugs")
+    for i in range(3):
+        m.add_software_system(f"Sys {i}").add_container("Payments API")
+    info = slug_cache_info()
+    assert info.misses == 4 and info.hits == 2
+    assert m["Sys 2"]["Payments API"].id == "payments-api"
+
+
+def test_slug_styles_and_bound():
+    assert element_id("Über Service") == "uber-service"
+    assert element_id("") == element_id("!!!") == "item"
+    clear_slug_cache()
+    assert sort_slug("Core Banking") == "core_banking"
+    assert slug_cache_info() == (0, 0, SLUG_CACHE_SIZE, 0)  # sort keys stay out of the LRU
+    for i in range(SLUG_CACHE_SIZE + 10):
+        element_id(f"name {i}")
+    assert slug_cache_info().currsize == SLUG_CACHE_SIZE
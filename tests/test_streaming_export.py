@@ -0,0 +1,74 @@
+import io
+
+import pytest
+from click.testing import CliRunner
+
+from architecture_diagrams.archdiags import cli
+from architecture_diagrams.orchestrator.build import BuildTarget, build_workspace, build_workspaces
+from architecture_diagrams.plugins import export_to, get_exporter
+
+
+class _Chunks(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.sizes: list[int] = []
+
+    def write(self, s: str) -> int:
+        self.sizes.append(len(s))
+        return super().write(s)
+
+
+def _model():
+    from architecture_diagrams.c4 import SystemLandscape
+
+    m = SystemLandscape("Stream")
+    a = m.add_software_system("A", "First")
+    b = m.add_software_system("B", "Second")
+    a.add_container("API", "", "Python")
+    m.add_relationship(a, b, "calls")
+    m.add_system_landscape_view("All", "All").add(a)
+    return m
+
+
+@pytest.mark.parametrize("exporter", ["structurizr", "json", "unknown"])
+def test_export_to_matches_the_string_exporters(exporter):
+    model = _model()
+    expected = (get_exporter(exporter) or get_exporter("structurizr"))(model)  # type: ignore[misc]
+    buf = _Chunks()
+    export_to(model, buf, exporter)
+    assert buf.getvalue() == expected
+    # Written incrementally, never as one string
+    assert len(buf.sizes) > 1 and max(buf.sizes) < len(expected) / 4
+
+
+def test_build_streams_fresh_cached_and_forked_targets(tmp_path):
+    expected = build_workspace(project="banking", select_tags=["td"])
+    for _ in range(2):  # cache miss, then cache hit
+        buf = io.StringIO()
+        assert (
+            build_workspace(
+                project="banking",
+                select_tags=["td"],
+                enable_cache=True,
+                cache_dir=tmp_path,
+                stream=buf,
+            )
+            == ""
+        )
+        assert buf.getvalue() == expected
+
+    targets = [BuildTarget(select_tags=["td"]), BuildTarget(exporter="json")]
+    bufs = [io.StringIO(), None]
+    out = build_workspaces(targets, project="banking", workers=2, streams=bufs)
+    assert out[0] == "" and bufs[0].getvalue() == expected  # type: ignore[union-attr]
+    assert out[1] == build_workspace(project="banking", exporter="json")
+
+
+def test_generate_writes_to_stdout(tmp_path):
+    runner = CliRunner()
+    env = {"ARCH_DIAGS_NO_DAEMON": "1"}
+    res = runner.invoke(cli, ["generate", "--tags", "td", "--output", "-"], env=env)
+    assert res.exit_code == 0, res.output
+    assert res.output == build_workspace(project="banking", select_tags=["td"])
+    res = runner.invoke(cli, ["generate", "--output", "-", "--watch"], env=env)
+    assert res.exit_code == 2
@@ -0,0 +1,96 @@
+import io
+import json
+
+from architecture_diagrams.adapter.structurizr_json import dump_workspace_json
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.c4.styles import ElementStyle
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.orchestrator.specs import ExcludeRelByName, IncludeRelByName, ViewSpec
+from architecture_diagrams.plugins import export_to
+
+
+def _model() -> SystemLandscape:
+    m = SystemLandscape("Acme")
+    customer = m.add_person("Customer", "")
+    shop = m.add_software_system("Shop", "Sells things")
+    bank = m.add_software_system("Bank", "", tags={"external"})
+    web = shop.add_container("Web", "", "Python")
+    api = shop.add_container("API", "", "Go")
+    bank.add_container("API", "", "Java")  # same model id as Shop/API
+    ledger = bank.add_container("Ledger", "", "Java")
+    m.add_relationship(customer, web, "Buys", "HTTPS")
+    m.add_relationship(web, ledger, "Pays")
+    m.add_system_context_view("Shop", "Shop context", shop)
+    m.add_container_view("ShopContainers", "Shop containers", shop)
+    node = m.add_deployment_node("Cluster", "", technology="Kubernetes")
+    node.add_container_instance(api)
+    m.add_deployment_view("Live", "Live", environment="Live")
+    m.styles.add_element_style(ElementStyle("external", background="#999999", opacity=50))
+    return m
+
+
+def _walk(elements):
+    for el in elements:
+        yield el
+        yield from _walk(el.get("containers", []) + el.get("components", []))
+
+
+def test_workspace_json_references_resolve():
+    doc = json.loads(dump_workspace_json(_model()))
+    elements = {e["id"]: e for e in _walk(doc["model"]["people"] + doc["model"]["softwareSystems"])}
+    rels = {r["id"]: r for e in elements.values() for r in e.get("relationships", [])}
+    assert sorted(e["id"] for e in elements.values() if e["name"] == "API") == ["api", "api-2"]
+    assert elements["bank"]["tags"] == "Element,Software System,external"
+    assert {(r["sourceId"], r["destinationId"]) for r in rels.values()} >= {
+        ("web", "ledger"),
+        ("shop", "bank"),  # aggregated system-level edge
+    }
+
+    context = doc["views"]["systemContextViews"][0]
+    assert context["softwareSystemId"] == "shop"
+    assert {e["id"] for e in context["elements"]} == {"shop", "customer", "bank"}
+    containers = doc["views"]["containerViews"][0]
+    assert {e["id"] for e in containers["elements"]} == {"web", "api", "customer", "bank"}
+    for view in context, containers:
+        for ref in view["relationships"]:
+            r = rels[ref["id"]]
+            assert {r["sourceId"], r["destinationId"]} <= {e["id"] for e in view["elements"]}
+
+    (cluster,) = doc["model"]["deploymentNodes"]
+    assert cluster["containerInstances"][0]["containerId"] == "api"
+    assert doc["views"]["deploymentViews"][0]["environment"] == "Live"
+    styles = doc["views"]["configuration"]["styles"]["elements"]
+    assert {"tag": "external", "background": "#999999", "opacity": 50} in styles
+
+
+def test_stream_is_incremental_and_matches_json_dumps():
+    model = _model()
+    text = dump_workspace_json(model)
+    assert text == json.dumps(json.loads(text), indent=2)
+
+    class Chunks(io.StringIO):
+        largest = 0
+
+        def write(self, s: str) -> int:
+            self.largest = max(self.largest, len(s))
+            return super().write(s)
+
+    buf = Chunks()
+    export_to(model, buf, "structurizr-json")
+    assert buf.getvalue() == text and buf.largest < 100
+
+
+def test_project_build_exports_workspace_json():
+    doc = json.loads(build_workspace(project="banking", exporter="structurizr-json"))
+    ids = {e["id"] for e in _walk(doc["model"]["people"] + doc["model"]["softwareSystems"])}
+    views = [v for key, vs in doc["views"].items() if key != "configuration" for v in vs]
+    assert views and all({e["id"] for e in v["elements"]} <= ids for v in views)
+
+
+def test_name_filters_apply_in_order():
+    model = _model()
+    filters = [ExcludeRelByName(from_name="Shop"), IncludeRelByName(to_name="Bank")]
+    ViewSpec(key="f", name="F", view_type="SystemLandscape", filters=filters).build(model)
+    (view,) = json.loads(dump_workspace_json(model))["views"]["systemLandscapeViews"]
+    assert [e["id"] for e in view["elements"]] == ["customer", "shop", "bank"]
+    assert view["relationships"] == [{"id": "shop->bank"}]
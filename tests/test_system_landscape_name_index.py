@@ -0,0 +1,76 @@
+from architecture_diagrams.c4 import Person, SoftwareSystem, SystemLandscape
+
+
+class _NoScanDict(dict):
+    """Element store that fails the test if a lookup falls back to a linear scan."""
+
+    def values(self):  # type: ignore[override]
+        raise AssertionError("name lookup scanned the element store")
+
+    items = values  # type: ignore[assignment]
+    __iter__ = values  # type: ignore[assignment]
+
+
+def _build(n: int) -> SystemLandscape:
+    m = SystemLandscape("Bench")
+    for i in range(n):
+        m.add_software_system(f"System {i}", "")
+    return m
+
+
+def test_lookups_do_not_scan_element_stores():
+    m = _build(10_000)
+    m.add_person("User", "")
+    m.software_systems = _NoScanDict(m.software_systems)
+    m.people = _NoScanDict(m.people)
+    # relate() via name lookups across the whole landscape
+    for i in range(0, 10_000, 7):
+        m.relate(m.get_system(f"System {i}"), m.get_person("User"), "notifies")
+    assert m.add_software_system("System 42") is m["System 42"]
+    assert "System 9999" in m and "System 10000" not in m
+    assert m.find_system("system_9999", normalized=True) is m["System 9999"]
+    m + Person("User")
+    assert len(m.people) == 1
+
+
+class _CountingDict(_NoScanDict):
+    """Element store that counts keyed reads."""
+
+    gets = 0
+
+    def get(self, key, default=None):  # type: ignore[override]
+        self.gets += 1
+        return super().get(key, default)
+
+
+def test_lookup_cost_independent_of_landscape_size():
+    for n in (100, 10_000):
+        m = _build(n)
+        assert len(m._systems_by_name) == len(m._systems_by_norm_name) == n
+        assert all(len(bucket) == 1 for bucket in m._systems_by_name.values())
+        store = m.software_systems = _CountingDict(m.software_systems)
+        for i in range(0, n, 3):
+            assert m.get_system(f"System {i}").name == f"System {i}"
+        assert m.find_system("system_1", normalized=True) is m.get_system("System 1")
+        # One keyed read per hit, whatever the landscape size
+        assert store.gets == len(range(0, n, 3)) + 2
+
+
+def test_indexes_follow_removal_and_direct_store_edits():
+    m = SystemLandscape("Prune")
+    a = m.add_software_system("Alpha", "")
+    a.add_container("API", "")
+    first = m.add_person("User", "first")
+    second = m.add_person("User", "second")
+    m.remove_software_system(a)
+    assert "Alpha" not in m and ("Alpha", "API") not in m
+    m.remove_person(first)
+    assert m.get_person("User") is second
+    # Direct pops are tolerated; stale index entries are skipped
+    m.people.pop(second.id)
+    assert m.find_person("user", normalized=True) is None
+    # Direct inserts need an explicit reindex
+    b = SoftwareSystem("Beta")
+    m.software_systems[b.id] = b
+    m.reindex_names()
+    assert m.get_system("Beta") is b
@@ -0,0 +1,114 @@
+import pickle
+
+from architecture_diagrams.c4 import SystemLandscape, binary_snapshot
+from architecture_diagrams.c4.lazy_landscape import LazySystemLandscape
+from architecture_diagrams.orchestrator.specs import SelectorCache, ViewSpec, tagged
+from architecture_diagrams.plugins.tagging import get_strategy
+
+
+def _model() -> SystemLandscape:
+    m = SystemLandscape("Tags")
+    m.add_person("Customer", tags=["external"])
+    bank = m.add_software_system("Bank", "")
+    bank.add_container("API", "", "Python", tags=["api"])
+    bank.add_container("Queue", "", "Kafka", tags=["api", "queue"])
+    m.add_software_system("Card Provider", "", tags=["external", "vendor"])
+    m.add_software_system("Ledger", "")
+    return m
+
+
+def _names(elements) -> list[str]:
+    return [e.name for e in elements]
+
+
+def test_queries_follow_every_add_and_update_path():
+    m = _model()
+    assert _names(m.elements_with_tag("external")) == ["Customer", "Card Provider"]
+    assert _names(m.elements_with_all(["api", "queue"])) == ["Queue"]
+    assert _names(m.elements_with_any(["vendor", "queue"])) == ["Queue", "Card Provider"]
+    assert m.elements_with_all([]) == [] and m.elements_with_tag("missing") == []
+
+    # Landscape and element paths both update the built index in place, in tagging order
+    m.add_software_system("Ledger", tags="external")
+    m.add_container("Bank", "Cache", "", "Redis", tags=["queue"])
+    m.get_system("Bank")["API"].add_component("Auth", tags=["external"])
+    m.add_deployment_node("Server", tags=["external"]).add_infrastructure_node("LB", tags="lb")
+    assert _names(m.elements_with_tag("external")) == [
+        "Customer",
+        "Card Provider",
+        "Ledger",
+        "Auth",
+        "Server",
+    ]
+    assert _names(m.elements_with_tag("lb")) == ["LB"]
+    get_strategy("auto_broker_queue")(m)  # type: ignore[misc]
+    assert _names(m.elements_with_tag("message-broker")) == ["Queue"]
+
+    # Removed elements drop out; directly assigned tags need reindex_tags
+    m.remove_software_system(m.get_system("Card Provider"))
+    del m.get_system("Bank")._containers["Queue"]
+    assert _names(m.elements_with_any(["vendor", "queue"])) == ["Cache"]
+    m.get_system("Bank")["Cache"].tags = {"cache"}
+    m.reindex_tags()
+    assert _names(m.elements_with_tag("cache")) == ["Cache"]
+
+    copy = pickle.loads(pickle.dumps(m))
+    assert _names(copy.elements_with_tag("external")) == _names(m.elements_with_tag("external"))
+    assert copy.elements_with_tag("external")[0] is copy.get_person("Customer")
+    copy.get_system("Bank")["Cache"].add_tags("external")  # copies track their own elements
+    assert "Cache" in _names(copy.elements_with_tag("external"))
+    assert "Cache" not in _names(m.elements_with_tag("external"))
+
+
+def test_tagging_elsewhere_leaves_the_index_alone(monkeypatch):
+    m, other = _model(), _model()
+    assert _names(m.elements_with_tag("external")) == ["Customer", "Card Provider"]
+    revision = m.revision
+
+    def no_rebuild(self):
+        raise AssertionError("tag index rebuilt")
+
+    monkeypatch.setattr(SystemLandscape, "iter_elements", no_rebuild)
+    other.get_system("Bank").add_tags("external")
+    other.get_system("Bank")["API"].add_component("Auth", tags=["external"])
+    assert _names(m.elements_with_tag("external")) == ["Customer", "Card Provider"]
+    assert m.revision == revision
+    m.get_system("Ledger").add_tags("external")
+    assert _names(m.elements_with_tag("external")) == ["Customer", "Card Provider", "Ledger"]
+    assert m.revision == revision + 1
+
+
+def test_tagged_selector_includes_views_once_per_build():
+    m = _model()
+    selectors = SelectorCache()
+    assert tagged("external") is tagged("external")
+    for key in ("a", "b"):
+        ViewSpec(
+            key=key, name=key, view_type="SystemLandscape", includes=[tagged("external")]
+        ).build(m, selectors)
+    ViewSpec(
+        key="c", name="c", view_type="SystemLandscape", includes=[tagged("api", match_all=True)]
+    ).build(m, selectors)
+    assert [v.include for v in m.views] == [
+        {"customer", "card-provider"},
+        {"customer", "card-provider"},
+        {"bank"},  # tagged containers lift to their system in landscape views
+    ]
+    assert (selectors.hits, selectors.misses) == (1, 2)
+
+
+def test_lazy_models_answer_from_the_tag_column():
+    lazy = LazySystemLandscape(binary_snapshot.ModelSnapshot(binary_snapshot.dumps(_model())))
+    assert _names(lazy.elements_with_tag("external")) == ["Customer", "Card Provider"]
+    assert lazy.materialized_count == 2  # nothing else was built
+
+    lazy.prune_to_ids({"bank", "api"})
+    assert _names(lazy.elements_with_tag("api")) == ["API"]
+    lazy.add_person("Auditor", tags=["external"])
+    assert _names(lazy.elements_with_tag("external")) == ["Auditor"]
+    assert lazy.materialized_count == 5  # plus Bank and its two containers
+
+    lazy.get_system("Bank").add_tags("core")  # tracked; the tag column stays in use
+    lazy.get_system("Bank")["API"].add_component("Auth", tags=["core"])
+    assert _names(lazy.elements_with_any(["core", "external"])) == ["Bank", "Auth", "Auditor"]
+    assert lazy.materialized_count == 5
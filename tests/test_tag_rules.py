@@ -0,0 +1,107 @@
+import pytest
+
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.orchestrator.build import build_workspace
+from architecture_diagrams.plugins.tag_rules import TagRule, TagRuleEngine, parse_rules
+from architecture_diagrams.plugins.tagging import get_strategy
+
+BUILDER = """
+from architecture_diagrams.c4 import SystemLandscape
+
+
+def build(model=None):
+    model = model or SystemLandscape("ext")
+    s = model.add_software_system("Shop", "")
+    s.add_container("Events", "", "Apache Kafka")
+    s.add_container("Web", "", "Python")
+    return model
+"""
+
+VIEWS = """
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+
+def get_views():
+    return [ViewSpec(key="c", name="C", view_type="Container", subject="Shop/Web", includes=["Shop/Events"])]
+"""
+
+
+def _model() -> SystemLandscape:
+    m = SystemLandscape("Rules")
+    m.add_software_system("Card Provider", "")
+    s = m.add_software_system("Shop", "Sells things")
+    s.add_container("Jobs", "", "Redis Streams")
+    s.add_container("Cache", "", "Redis")
+    s.add_container("Orders Queue", "", "RabbitMQ")
+    return m
+
+
+def test_rules_match_overlapping_terms_in_one_pass():
+    engine = TagRuleEngine(
+        [
+            TagRule(contains=("redis",), tags=("redis",), fields=("technology",), name="redis"),
+            TagRule(
+                contains=("redis stream",),
+                tags=("stream",),
+                fields=("technology",),
+                kinds=frozenset({"Container"}),
+                name="streams",
+            ),
+            TagRule(contains=("QUEUE", "provider"), tags=("async",), name="names"),
+        ]
+    )
+    m = _model()
+    engine(m)
+    shop = m.get_system("Shop")
+    assert shop["Jobs"].tags == {"redis", "stream"}
+    assert shop["Cache"].tags == {"redis"}
+    assert shop["Orders Queue"].tags == {"async"}
+    assert m.get_system("Card Provider").tags == {"async"}
+    assert engine.hits == {"redis": 2, "streams": 1, "names": 2}
+
+
+def test_builtin_strategies_are_rule_engines():
+    m = _model()
+    for name in ("auto_external", "auto_broker_queue"):
+        strategy = get_strategy(name)
+        assert isinstance(strategy, TagRuleEngine)
+        strategy(m)
+    assert m.get_system("Card Provider").tags == {"external"}
+    assert m.get_system("Shop")["Jobs"].tags == {"message-broker", "queue"}
+    assert m.get_system("Shop")["Orders Queue"].tags == {"message-broker", "queue"}
+    assert m.get_system("Shop")["Cache"].tags == set()
+
+
+def test_manifest_rules_tag_the_composed_model(tmp_path):
+    proj = tmp_path / "ext"
+    (proj / "models").mkdir(parents=True)
+    (proj / "views").mkdir()
+    (proj / "models" / "system_landscape.py").write_text(BUILDER)
+    (proj / "views" / "views.py").write_text(VIEWS)
+    manifest = proj / "project.toml"
+    manifest.write_text(
+        'workspace_name = "ext"\n\n'
+        "[[tag_rules]]\n"
+        'kinds = ["Container"]\nfields = ["technology"]\ncontains = ["kafka"]\n'
+        'tags = ["message-broker"]\n'
+    )
+    kwargs = dict(project_path=proj, enable_cache=True, cache_dir=tmp_path / "cache")
+    assert 'tags "message-broker"' in build_workspace(**kwargs)
+
+    # Rule edits change the cache keys even though no code changed
+    manifest.write_text(manifest.read_text().replace("message-broker", "broker"))
+    out = build_workspace(**kwargs)
+    assert 'tags "broker"' in out and "message-broker" not in out
+
+    manifest.write_text(manifest.read_text().replace("contains", "matches"))
+    with pytest.raises(ValueError, match="unknown keys"):
+        build_workspace(**kwargs)
+
+
+def test_malformed_rules_are_rejected():
+    with pytest.raises(ValueError, match="array"):
+        parse_rules({"tags": ["x"]})
+    with pytest.raises(ValueError, match="unknown fields"):
+        parse_rules([{"fields": ["owner"], "contains": ["x"], "tags": ["y"]}])
+    with pytest.raises(ValueError, match="contains"):
+        parse_rules([{"contains": [], "tags": ["y"]}])
@@ -0,0 +1,234 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from architecture_diagrams.orchestrator.build import BuildTarget, build_workspace
+from architecture_diagrams.orchestrator.watch import PollingWatcher, WatchSession, write_atomic
+
+LANDSCAPE = """
+from architecture_diagrams.c4 import SystemLandscape
+from architecture_diagrams.c4.auto_two_phase import auto_register
+
+NAMES = ("alpha", "beta")
+
+
+def build(model=None):
+    model = model or SystemLandscape("wdemo")
+    for n in NAMES:
+        auto_register(model, n, phase="define", project="{project}")
+    for n in NAMES:
+        auto_register(model, n, phase="link", project="{project}")
+    return model
+"""
+
+ALPHA = """
+SYSTEM_KEY = "Alpha"
+
+
+def define_alpha(model):
+    return model.add_software_system("Alpha", "{desc}")
+
+
+def link_alpha(model):
+    model.relate(model["Alpha"], model["Beta"], "calls")
+"""
+
+BETA = """
+SYSTEM_KEY = "Beta"
+
+
+def define_beta(model):
+    return model.add_software_system("Beta", "second")
+
+
+def link_beta(model):
+    pass
+"""
+
+VIEWS = """
+from architecture_diagrams.orchestrator.specs import ViewSpec
+
+
+def get_views():
+    return [ViewSpec(key="all", name="{name}", view_type="SystemLandscape", tags={{"all"}})]
+"""
+
+
+def _touch(path, text):
+    # Distinct mtime/size even on coarse-grained filesystems
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture()
+def project(tmp_path, request):
+    name = f"wdemo_{request.node.name[-20:].strip('_')}".replace("-", "_")
+    proj = tmp_path / "projects" / name
+    (proj / "models").mkdir(parents=True)
+    (proj / "views").mkdir()
+    (proj / "__init__.py").write_text("")
+    (proj / "models" / "__init__.py").write_text("")
+    (proj / "models" / "system_landscape.py").write_text(LANDSCAPE.format(project=name))
+    (proj / "models" / "alpha_c4.py").write_text(ALPHA.format(desc="first"))
+    (proj / "models" / "beta_c4.py").write_text(BETA)
+    (proj / "views" / "views.py").write_text(VIEWS.format(name="All"))
+    return proj
+
+
+def _session(project, out):
+    return WatchSession(
+        out,
+        BuildTarget(select_tags=["all"]),
+        project=project.name,
+        project_path=project.parent,
+        workspace_name="wdemo",
+    )
+
+
+def _rebuild(session, watcher, *paths):
+    changed = watcher.poll()
+    assert {p.resolve() for p in paths} <= {p.resolve() for p in changed}
+    session.apply_changes(changed)
+    session.build()
+    return session.output.read_text()
+
+
+def test_edits_reload_only_changed_modules_and_match_a_fresh_build(project, tmp_path):
+    session = _session(project, tmp_path / "out.dsl")
+    session.build()
+    watcher = PollingWatcher(session.watch_paths())
+    assert '"first"' in session.output.read_text()
+
+    alpha = project / "models" / "alpha_c4.py"
+    _touch(alpha, ALPHA.format(desc="first v2"))
+    out = _rebuild(session, watcher, alpha)
+    assert session.incremental_updates == 1
+    assert all("alpha_c4" in u for u in session.composer.last_replayed)
+    assert '"first v2"' in out
+
+    views = project / "views" / "views.py"
+    _touch(views, VIEWS.format(name="Everything"))
+    out = _rebuild(session, watcher, views)
+    assert "Everything" in out and session.incremental_updates == 1
+
+    # A builder edit (not a recorded unit module) recomposes from scratch
+    (project / "models" / "gamma_c4.py").write_text(
+        BETA.replace("Beta", "Gamma").replace("beta", "gamma")
+    )
+    landscape = project / "models" / "system_landscape.py"
+    _touch(landscape, LANDSCAPE.format(project=project.name).replace('"beta")', '"beta", "gamma")'))
+    out = _rebuild(session, watcher, landscape)
+    assert '"Gamma"' in out
+    fresh = build_workspace(
+        project=project.name,
+        project_path=project.parent,
+        workspace_name="wdemo",
+        select_tags=["all"],
+    )
+    assert out == fresh
+
+
+def test_syntax_errors_keep_the_previous_output_until_fixed(project, tmp_path):
+    session = _session(project, tmp_path / "out.dsl")
+    stop = threading.Event()
+    builds: list[str] = []
+
+    def on_build(elapsed, changed):
+        builds.append(session.output.read_text())
+
+    thread = threading.Thread(
+        target=session.run,
+        kwargs=dict(interval=0.01, debounce=0.05, stop=stop, on_build=on_build),
+    )
+    thread.start()
+
+    def wait_for(n):
+        deadline = time.monotonic() + 10
+        while len(builds) < n and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(builds)
+
+    try:
+        assert wait_for(1) == 1
+        alpha = project / "models" / "alpha_c4.py"
+        _touch(alpha, "def define_alpha(:\n")
+        time.sleep(0.3)
+        assert len(builds) == 1 and '"first"' in session.output.read_text()
+        _touch(alpha, ALPHA.format(desc="fixed"))
+        assert wait_for(2) == 2
+        assert '"fixed"' in builds[-1]
+    finally:
+        stop.set()
+        thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_watcher_debounces_bursts_of_changes(tmp_path):
+    for i in range(3):
+        (tmp_path / f"m{i}.py").write_text("x = 0\n")
+    watcher = PollingWatcher([tmp_path])
+    stop = threading.Event()
+    result: list[set] = []
+    thread = threading.Thread(
+        target=lambda: result.append(watcher.wait(interval=0.01, debounce=0.2, stop=stop))
+    )
+    thread.start()
+    for i in range(3):
+        _touch(tmp_path / f"m{i}.py", f"x = {i + 1}\n")
+        time.sleep(0.05)
+    (tmp_path / "m0.py").unlink()
+    thread.join(5)
+    assert [sorted(p.name for p in r) for r in result] == [["m0.py", "m1.py", "m2.py"]]
+
+    stop.set()
+    assert watcher.wait(interval=0.01, stop=stop) == set()
+
+
+def test_write_atomic_replaces_in_one_step(tmp_path, monkeypatch):
+    out = tmp_path / "nested" / "workspace.dsl"
+    write_atomic(out, "one")
+    assert out.read_text() == "one"
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_atomic(out, "two")
+    assert out.read_text() == "one"
+    assert [p.name for p in out.parent.iterdir()] == ["workspace.dsl"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_write_atomic_keeps_the_usual_file_mode(tmp_path):
+    out = tmp_path / "workspace.dsl"
+    old = os.umask(0o022)
+    try:
+        write_atomic(out, "one")
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE(out.stat().st_mode) == 0o644
+    out.chmod(0o640)
+    write_atomic(out, "two")
+    assert stat.S_IMODE(out.stat().st_mode) == 0o640
+
+
+def test_view_modules_in_a_models_subfolder_are_view_changes(project, tmp_path, monkeypatch):
+    nested = project / "views" / "models"
+    nested.mkdir()
+    extra = nested / "extra.py"
+    extra.write_text(VIEWS.format(name="Extra").replace('key="all"', 'key="extra"'))
+    session = _session(project, tmp_path / "out.dsl")
+    session.build()
+    watcher = PollingWatcher(session.watch_paths())
+
+    def recompose(*args, **kwargs):
+        raise AssertionError("a view edit recomposed the model")
+
+    monkeypatch.setattr(session.composer, "compose", recompose)
+    _touch(extra, VIEWS.format(name="Extra v2").replace('key="all"', 'key="extra"'))
+    assert "Extra v2" in _rebuild(session, watcher, extra)